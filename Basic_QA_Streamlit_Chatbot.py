@@ -1,30 +1,30 @@
 # Import Libraries
-from galileo import GalileoLogger
-from galileo.handlers.openai_agents import GalileoTracingProcessor
-from agents import set_trace_processors
+import time
+turn_started = time.perf_counter()
 import streamlit as st
-import asyncio
-from agents import Runner, SQLiteSession
-import os
-import toml
+import uuid
 import warnings
 warnings.filterwarnings("ignore")
 
-# Setup environment
-secrets = toml.load(".streamlit/secrets.toml")
-for key, value in secrets.items():
-    os.environ[key] = str(value)
-
-# Import Agents
-set_trace_processors([GalileoTracingProcessor()])
-from src.Agents.Basic_QA_Agent import Basic_QA_Agent
-from src.Agents.GenAI_Use_Case_Agent import GenAI_Use_Case_Agent
-
-session = SQLiteSession("user_123")
-
 st.set_page_config(page_title="Basic Q&A Chatbot", page_icon="❓", layout="centered")
 st.title("Basic Q&A Chatbot")
 
+# Shared runtime: secrets, tracing, OpenAI client and event loop are set up once per process.
+# These imports stay light; `agents`, `openai` and `galileo` load in the background and on
+# the first turn, after the page has rendered.
+from src.Runtime.Agent_Runtime import get_runtime
+from src.Runtime.Conversation_Store import Conversation_Store
+from src.Runtime.Stream_Renderer import stream_agent_reply
+runtime = get_runtime()
+store = runtime.resource("conversation_store", Conversation_Store)
+
+# One conversation per browser session. The id stays server-side in session_state (never in the
+# URL), so a shared link cannot open someone else's history; a reload starts a new conversation.
+if "user_id" not in st.session_state:
+    st.session_state.user_id = uuid.uuid4().hex
+    st.query_params.pop("uid", None)
+session = store.session(st.session_state.user_id)
+
 # Sidebar controls
 with st.sidebar:
     st.markdown("Simple Chatbot Connected to OpenAI Assistants")
@@ -32,6 +32,13 @@ with st.sidebar:
     agent_choice = st.selectbox("Select agent", ["Basic_QA_Agent", "GenAI_Use_Case_Agent"], index=0)
     if st.button("Clear conversation", use_container_width=True):
         st.session_state["messages"] = []
+        runtime.run(session.clear_session())
+    with st.expander("Runtime overhead"):
+        st.json(runtime.metrics().model_dump())
+    with st.expander("Prompt tokens per turn"):
+        turns = store.turn_metrics(st.session_state.user_id)
+        if not turns.empty:
+            st.line_chart(turns.set_index("turn")[["prompt_tokens"]])
 
 # Initialize chat history
 if "messages" not in st.session_state:
@@ -54,12 +61,16 @@ if prompt:
     with st.chat_message("assistant"):
         with st.spinner("Thinking..."):
             try:
-                selected_agent = Basic_QA_Agent if agent_choice == "Basic_QA_Agent" else GenAI_Use_Case_Agent
-                result = asyncio.run(Runner.run(selected_agent, prompt, session=session))
-                output_text = getattr(result, "final_output", str(result))
+                from src.Pipelines.Assessment_Store import Assessment_Store
+                selected_agent = runtime.agent(agent_choice)
+                output_text = stream_agent_reply(
+                    runtime, selected_agent, prompt, st.container(),
+                    session=session, turn_started=turn_started, agent_name=agent_choice,
+                    results_store=runtime.resource("assessment_store", Assessment_Store),
+                )
             except Exception as e:
                 output_text = f"Error: {e}"
-            st.markdown(output_text)
+                st.markdown(output_text)
 
     # Save assistant response
     st.session_state.messages.append({"role": "assistant", "content": output_text})
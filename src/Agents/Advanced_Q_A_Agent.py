@@ -1,17 +1,15 @@
 import os
-from agents import Runner, agent, trace, set_trace_processors, Agent, ModelSettings
-import asyncio
-from typing import Literal, List, Annotated, Tuple
-from dotenv import load_dotenv
-from pydantic import BaseModel, Field, conlist
+from agents import Agent, ModelSettings
 
 # Import Necessary Libraries
-from src.Tools.Agentic_Calculator_Tool import Agentic_Calculator_Tool
+from src.Runtime.Prompt_Cache import cached_model_settings, static_prompt
+from src.Tools.Agentic_Calculator_Cache import Cached_Agentic_Calculator_Tool
 from src.Tools.PerplexitySECSonarPro_Tool import PerplexitySECSonarPro_Tool
 from src.Tools.Search_Tool import Search_Tool
 from src.Tools.OpenAIDeepResearch_Tool import Deep_Research_Agent, OpenAIDeepResearch_Tool
 from src.Tools.FileSearch_Tool import Knowledge_Base_Search_Tool
 from src.Tools.Critic_Tool import Critic_Tool
+from src.Tools.Workforce_Scenario_Tool import Workforce_Scenario_Tool
 
 QA_PROMPT = '''
 System = You are a Generative-AI analyst who quantifies how GenAI REDUCES labor demand in G&A (General & Administrative) functions (e.g., Finance, HR, Legal, Procurement, Facilities, IT, Compliance, Internal Audit).
@@ -53,6 +51,7 @@ You are provided a natural-language QUESTION describing a G&A team/function (act
 6. Build Low/Medium/High scenario forecasts showing how GenAI impacts activities, composition, locations, and costs.
    - Follow all items in #Scenario Instructions strictly.
    - Where numeric inputs are missing, apply conservative benchmark assumptions; show them transparently in <assumptions>.
+   - Do NOT compute FTE trajectories, % change vectors, run-rate costs or savings yourself. Pass each team/work cluster (roles with FTE, annual cost per FTE and on/near/offshore location, plus its <Agentic_Calculator_Tool> score) to the <Workforce_Scenario_Tool> in a single call and report its figures verbatim; your job is to explain them.
 7. Translate scenario impacts to roles: headcount by role family, skill-mix shifts, scope changes, and operating model changes (e.g., CoE, shared services, managed service).
 8. Peer/Competitor scan:
    - Use <SEC_Tool> for peer disclosures on SG&A transformation, shared services, and automation programs.
@@ -115,6 +114,7 @@ Produce a single, polished report using the following sections and headings:
 4. <Agentic_Calculator_Tool>: Evaluates appropriateness of GenAI for a given work cluster and returns a 0–4 score with rationale.
 5. <Search_Tool>: General web search for any outstanding factual gaps.
 6. <Critic_Tool>: Assesses the quality of the draft; all feedback MUST be incorporated before finalizing.
+7. <Workforce_Scenario_Tool>: Deterministically computes FTE at 6/12/18/24 months, the four ≤ 0 cumulative % change vectors, 24-month run-rate cost and cumulative savings for Low/Medium/High.
 
 # Additional Rules
 • Every answer MUST be organized around the Low/Medium/High scenarios.  
@@ -127,15 +127,11 @@ Produce a single, polished report using the following sections and headings:
 
 Q_A_AGENT = Agent(
     name="Q&A_Agent",
-    instructions=QA_PROMPT,
+    instructions=static_prompt(QA_PROMPT),
     model=os.getenv("LLM_MODEL"),
-    model_settings=ModelSettings(reasoning={"effort": "high"}),
+    model_settings=cached_model_settings("Advanced_Q_A_Agent", ModelSettings(reasoning={"effort": "high"})),
     tools=[
-        Agentic_Calculator_Tool.as_tool(
-            tool_name="Agentic_Calculator_Tool",
-            tool_description="Tool for evaluating the appropriateness of Generative AI for a specific business activity",
-
-        ),
+        Cached_Agentic_Calculator_Tool,
         Knowledge_Base_Search_Tool.as_tool(
             tool_name="Knowledge_Base_Search_Tool",
             tool_description="Tool for searching the knowledge base on workforce optimization with AI and forecasting frameworks",
@@ -155,6 +151,7 @@ Q_A_AGENT = Agent(
         Critic_Tool.as_tool(
             tool_name="Critic_Tool",
             tool_description="Critic_Tool provides a tool for assessing the quality of the final answer.",
-        )
+        ),
+        Workforce_Scenario_Tool,
     ]
 )
@@ -0,0 +1,265 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Literal, Optional
+
+from agents import Agent, Runner, trace
+from pydantic import BaseModel
+
+EVIDENCE_ADDENDUM = '''
+
+# Pre-Gathered Evidence
+The user message contains an <evidence_bundle> gathered concurrently from the research tools before you started.
+- Treat it as the output of steps 3a–3d and of the research parts of steps 5 and 8; do NOT call those tools again for the same information.
+- Sources marked status="timeout" or status="error" returned nothing; call that tool yourself only if the gap is material.
+- Continue with the remaining steps (Agentic_Calculator_Tool, Workforce_Scenario_Tool, Critic_Tool) as instructed.
+'''
+
+
+class Evidence_Source(BaseModel):
+    name: str
+    "Tool name as referenced in QA_PROMPT, e.g. 'SEC_Tool'"
+    run: Callable[[str], Awaitable[str]]
+    "Coroutine answering one research query"
+    prompt_template: str = "{question}"
+    "Query sent to the source; `{question}` is replaced by the user question"
+    deadline_s: float = 120.0
+    "Per-source deadline; the call is cancelled once it elapses"
+
+
+class Evidence_Item(BaseModel):
+    source: str
+    status: Literal["ok", "timeout", "error"]
+    content: str = ""
+    error: Optional[str] = None
+    started_s: float
+    "Offset from the start of the fan-out"
+    elapsed_s: float
+
+
+class Orchestration_Report(BaseModel):
+    evidence: List[Evidence_Item]
+    evidence_wall_s: float
+    "Wall-clock time of the concurrent fan-out (the slowest source, bounded by its deadline)"
+    sequential_estimate_s: float
+    "Sum of source latencies, i.e. the fan-out cost if the sources had run one after another"
+    synthesis_s: float
+    total_s: float
+    latency_share: Dict[str, float]
+    "Share of end-to-end latency attributable to each source and to synthesis"
+    final_output: Optional[str] = None
+
+
+def format_evidence_bundle(evidence: List[Evidence_Item]) -> str:
+    """Render evidence as tagged blocks the synthesis agent can cite from."""
+    blocks = []
+    for item in evidence:
+        body = item.content if item.status == "ok" else f"(no result: {item.error or item.status})"
+        blocks.append(f'<source name="{item.source}" status="{item.status}">\n{body}\n</source>')
+    return "<evidence_bundle>\n" + "\n".join(blocks) + "\n</evidence_bundle>"
+
+
+async def gather_evidence(
+    question: str,
+    sources: List[Evidence_Source],
+    overall_deadline_s: Optional[float] = None,
+) -> tuple[List[Evidence_Item], float]:
+    """
+    Query every evidence source concurrently.
+
+    Each source is cancelled at its own deadline (and all are cancelled at
+    `overall_deadline_s`); failures and timeouts are recorded instead of raised so the
+    report can still be written from partial evidence. If the caller is cancelled, every
+    source still running is cancelled (and awaited) before the cancellation propagates.
+
+    Returns:
+        (evidence, wall_s): one item per source in the given order, and the fan-out wall time.
+    """
+    started = time.perf_counter()
+    overall_deadline_hit = False
+
+    async def run_source(source: Evidence_Source) -> Evidence_Item:
+        source_started = time.perf_counter()
+        query = source.prompt_template.format(question=question)
+        try:
+            content = await asyncio.wait_for(source.run(query), timeout=source.deadline_s)
+            status, error = "ok", None
+        except asyncio.TimeoutError:
+            content, status, error = "", "timeout", f"exceeded {source.deadline_s:g}s deadline"
+        except asyncio.CancelledError:
+            if not overall_deadline_hit:
+                raise
+            content, status, error = "", "timeout", "cancelled at overall deadline"
+        except Exception as e:
+            content, status, error = "", "error", f"{type(e).__name__}: {e}"
+        return Evidence_Item(
+            source=source.name,
+            status=status,
+            content=content,
+            error=error,
+            started_s=source_started - started,
+            elapsed_s=time.perf_counter() - source_started,
+        )
+
+    tasks = [asyncio.create_task(run_source(source)) for source in sources]
+    try:
+        _, pending = await asyncio.wait(tasks, timeout=overall_deadline_s)
+        overall_deadline_hit = bool(pending)
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    evidence = [task.result() for task in tasks]
+    return evidence, time.perf_counter() - started
+
+
+async def run_orchestrated(
+    question: str,
+    sources: List[Evidence_Source],
+    synthesis_agent: Agent,
+    overall_deadline_s: Optional[float] = None,
+    **runner_kwargs,
+) -> Orchestration_Report:
+    """
+    Gather evidence concurrently, then hand the merged bundle to the synthesis agent.
+
+    Args:
+        question: The user question.
+        sources: Independent evidence sources to fan out to.
+        synthesis_agent: Agent that writes the final report (see `EVIDENCE_ADDENDUM`).
+        overall_deadline_s: Hard cap on the whole fan-out.
+        **runner_kwargs: Forwarded to `Runner.run` for the synthesis step (e.g. `session`).
+
+    Returns:
+        An `Orchestration_Report` with the evidence, per-stage timings and the final output.
+    """
+    started = time.perf_counter()
+    with trace("Advanced_Q_A_Orchestrator"):
+        evidence, evidence_wall = await gather_evidence(question, sources, overall_deadline_s)
+        synthesis_started = time.perf_counter()
+        result = await Runner.run(
+            synthesis_agent,
+            f"{question}\n\n{format_evidence_bundle(evidence)}",
+            **runner_kwargs,
+        )
+        synthesis = time.perf_counter() - synthesis_started
+    total = time.perf_counter() - started
+
+    # A source only adds end-to-end latency while it is the slowest one still running,
+    # so attribute the fan-out wall time to sources by their exclusive critical-path time.
+    ordered = sorted(evidence, key=lambda item: item.started_s + item.elapsed_s)
+    share: Dict[str, float] = {}
+    previous_end = 0.0
+    for item in ordered:
+        end = item.started_s + item.elapsed_s
+        share[item.source] = max(0.0, end - previous_end) / total if total > 0 else 0.0
+        previous_end = max(previous_end, end)
+    share["synthesis"] = synthesis / total if total > 0 else 0.0
+
+    return Orchestration_Report(
+        evidence=evidence,
+        evidence_wall_s=evidence_wall,
+        sequential_estimate_s=sum(item.elapsed_s for item in evidence),
+        synthesis_s=synthesis,
+        total_s=total,
+        latency_share=share,
+        final_output=str(result.final_output),
+    )
+
+
+def agent_source(agent: Agent, name: str, prompt_template: str, deadline_s: float) -> Evidence_Source:
+    """Wrap a research agent as an evidence source (one `Runner.run`, final output as text)."""
+
+    async def run(query: str) -> str:
+        result = await Runner.run(agent, query)
+        return str(result.final_output)
+
+    return Evidence_Source(name=name, run=run, prompt_template=prompt_template, deadline_s=deadline_s)
+
+
+# Evidence-gathering steps 3a–3d of QA_PROMPT: (name, candidate (module, attribute) pairs, query, deep research?).
+# The first candidate present in this checkout serves the step.
+EVIDENCE_STEPS = [
+    (
+        "SEC_Tool",
+        [("src.Tools.PerplexitySECSonarPro_Tool", "PerplexitySECSonarPro_Tool")],
+        "Find current SEC disclosures (MD&A, headcount, opex, SG&A, shared-services notes) for the company "
+        "or its sector comparables, and peer disclosures on SG&A transformation and automation, relevant to:\n{question}",
+        False,
+    ),
+    (
+        "OpenAIDeepResearch_Tool",
+        [("src.Tools.OpenAIDeepResearch_Tool", "OpenAIDeepResearch_Tool")],
+        "Research recent, credible evidence on GenAI use cases and impact in the G&A roles, processes and "
+        "activities described here, including peer examples:\n{question}",
+        True,
+    ),
+    (
+        "Knowledge_Base_Search_Tool",
+        [
+            ("src.Tools.FileSearch_Tool", "Knowledge_Base_Search_Tool"),
+            ("src.Tools.GenAI_Process_Knowledge_Base_Tool", "GenAI_Process_Knowledge_Base_Tool"),
+        ],
+        "Find workforce optimization frameworks and forecasting methods suited to the activities in:\n{question}",
+        False,
+    ),
+    (
+        "Search_Tool",
+        [("src.Tools.Search_Tool", "Search_Tool")],
+        "Find benchmark facts (team sizes, cost per FTE, on/near/offshore mix, automation rates) for:\n{question}",
+        False,
+    ),
+]
+
+
+def default_evidence_sources(deadline_s: float = 180.0, deep_research_deadline_s: float = 600.0) -> List[Evidence_Source]:
+    """
+    Evidence-gathering steps 3a–3d of QA_PROMPT as independent, concurrently runnable sources.
+
+    Steps whose research agent is missing from this checkout are left out, so the result
+    may be partial (only the knowledge base step when none of the external research tools
+    are present).
+    """
+    import importlib
+
+    from src.Agents.Agent_Registry import missing_modules
+
+    sources = []
+    for name, candidates, prompt_template, deep_research in EVIDENCE_STEPS:
+        for module_name, attribute in candidates:
+            if not missing_modules(module_name):
+                agent = getattr(importlib.import_module(module_name), attribute)
+                sources.append(agent_source(agent, name, prompt_template, deep_research_deadline_s if deep_research else deadline_s))
+                break
+    return sources
+
+
+async def run_advanced_qa(question: str, overall_deadline_s: Optional[float] = 900.0, **runner_kwargs) -> Orchestration_Report:
+    """
+    `Advanced_Q_A_Agent` with concurrent evidence gathering ahead of synthesis.
+
+    Raises:
+        Registry_Unavailable: `Advanced_Q_A_Agent` (or one of its research tools) is missing
+            from this checkout. Call `run_orchestrated` with your own sources and synthesis
+            agent instead.
+    """
+    from src.Agents import Agent_Registry
+
+    if not Agent_Registry.is_available("Advanced_Q_A_Agent"):
+        missing = Agent_Registry.missing_modules(Agent_Registry.AGENTS["Advanced_Q_A_Agent"][0])
+        raise Agent_Registry.Registry_Unavailable(
+            f"run_advanced_qa needs Advanced_Q_A_Agent, whose modules are missing from this checkout: {', '.join(missing)}; "
+            "use run_orchestrated with default_evidence_sources() and another synthesis agent"
+        )
+    from src.Agents.Advanced_Q_A_Agent import QA_PROMPT, Q_A_AGENT
+    from src.Agents.Prompt_Assembly import prompt_run_config
+    from src.Runtime.Prompt_Cache import cached_model_settings, static_prompt
+
+    # Its own cache key: the addendum makes this a different static prefix from Q_A_AGENT's.
+    synthesis_agent = Q_A_AGENT.clone(
+        instructions=static_prompt(QA_PROMPT + EVIDENCE_ADDENDUM),
+        model_settings=cached_model_settings("Advanced_Q_A_Synthesis", Q_A_AGENT.model_settings),
+    )
+    runner_kwargs.setdefault("run_config", prompt_run_config())
+    return await run_orchestrated(question, default_evidence_sources(), synthesis_agent, overall_deadline_s, **runner_kwargs)
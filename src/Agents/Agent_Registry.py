@@ -0,0 +1,83 @@
+import ast
+import importlib
+import importlib.util
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+# Every agent and agent-backed tool: name -> (module, attribute). Nothing is imported until
+# `get` is called, so importing this registry costs nothing and one broken module does not
+# stop the others from loading.
+AGENTS: Dict[str, Tuple[str, str]] = {
+    "Basic_QA_Agent": ("src.Agents.Basic_QA_Agent", "Basic_QA_Agent"),
+    "GenAI_Use_Case_Agent": ("src.Agents.GenAI_Use_Case_Agent", "GenAI_Use_Case_Agent"),
+    "Advanced_Q_A_Agent": ("src.Agents.Advanced_Q_A_Agent", "Q_A_AGENT"),
+}
+
+TOOLS: Dict[str, Tuple[str, str]] = {
+    "Agentic_Calculator_Tool": ("src.Tools.Agentic_Calculator_Tool", "Agentic_Calculator_Tool"),
+    "Cached_Agentic_Calculator_Tool": ("src.Tools.Agentic_Calculator_Cache", "Cached_Agentic_Calculator_Tool"),
+    "GenAI_Process_Knowledge_Base_Tool": ("src.Tools.GenAI_Process_Knowledge_Base_Tool", "GenAI_Process_Knowledge_Base_Tool"),
+    "Workforce_Scenario_Tool": ("src.Tools.Workforce_Scenario_Tool", "Workforce_Scenario_Tool"),
+}
+
+REGISTRY: Dict[str, Tuple[str, str]] = {**AGENTS, **TOOLS}
+
+_lock = threading.Lock()
+_loaded: Dict[str, Any] = {}
+
+
+class Registry_Unavailable(ImportError):
+    """A registered agent or tool whose module (or one of its `src` imports) is missing from this checkout."""
+
+
+@lru_cache(maxsize=None)
+def missing_modules(module_name: str) -> Tuple[str, ...]:
+    """
+    `src.*` modules that `module_name` imports at top level but that do not exist.
+
+    Parsed from the source without executing it, so checking availability does not pay
+    for (or fail on) the module's own imports.
+    """
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or spec.origin is None:
+        return (module_name,)
+    with open(spec.origin, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=spec.origin)
+    missing = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module and node.module.startswith("src."):
+            if importlib.util.find_spec(node.module) is None:
+                missing.append(node.module)
+    return tuple(missing)
+
+
+def is_available(name: str) -> bool:
+    module_name, _ = REGISTRY[name]
+    return not missing_modules(module_name)
+
+
+def available(kind: Optional[Literal["agent", "tool"]] = None) -> List[str]:
+    """Registered names whose modules are all present, optionally only agents or only tools."""
+    names = AGENTS if kind == "agent" else TOOLS if kind == "tool" else REGISTRY
+    return [name for name in names if is_available(name)]
+
+
+def get(name: str) -> Any:
+    """
+    Import and return a registered agent or tool, constructing it on first use.
+
+    Raises:
+        KeyError: `name` is not registered.
+        Registry_Unavailable: Its module or one of its `src` imports is missing.
+    """
+    if name in _loaded:
+        return _loaded[name]
+    module_name, attribute = REGISTRY[name]
+    with _lock:
+        if name not in _loaded:
+            missing = missing_modules(module_name)
+            if missing:
+                raise Registry_Unavailable(f"{name} needs modules missing from this checkout: {', '.join(missing)}")
+            _loaded[name] = getattr(importlib.import_module(module_name), attribute)
+        return _loaded[name]
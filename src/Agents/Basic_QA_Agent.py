@@ -1,23 +1,29 @@
-import asyncio
 import os
-from openai import OpenAI
-from agents import Agent, FileSearchTool, Runner, trace
-from IPython.display import display, Markdown
+from agents import Agent, FileSearchTool
 from agents.model_settings import ModelSettings
-from dotenv import load_dotenv
-load_dotenv()
+
+# Import Necessary Libraries
+from src.Runtime.Prompt_Cache import cached_model_settings
+from src.Tools.Local_Knowledge_Base_Index import make_local_search_tool
+
+if os.getenv("KNOWLEDGE_BASE_BACKEND", "hosted") == "local":
+    Knowledge_Base_Search = make_local_search_tool(
+        index_dir=os.getenv("ASSISTANT_LOCAL_INDEX", "Data/Intermediate/Knowledge_Base_Index"),
+        tool_name="Knowledge_Base_Search",
+        tool_description="Searches the knowledge base and returns the best matching excerpts with their source file and page",
+    )
+else:
+    Knowledge_Base_Search = FileSearchTool(
+        max_num_results=20,
+        vector_store_ids=[os.getenv("ASSISTANT_VECTOR_KEY")],
+        include_search_results=True,
+    )
 
 
 Basic_QA_Agent = Agent(
         name="Basic_QA_Agent",
         instructions="You are a helpful agent. You answer only based on the information in the vector store. Provide all citations with footnotes at the end of the answer.",
         model=os.getenv("LLM_MODEL"),
-        model_settings=ModelSettings(reasoning={"effort": "high"}),
-        tools=[
-            FileSearchTool(
-                max_num_results=20,
-                vector_store_ids=[os.getenv("ASSISTANT_VECTOR_KEY")],
-                include_search_results=True,
-            )
-        ],
+        model_settings=cached_model_settings("Basic_QA_Agent", ModelSettings(reasoning={"effort": "high"})),
+        tools=[Knowledge_Base_Search],
     )
\ No newline at end of file
@@ -1,12 +1,10 @@
-import asyncio
 import os
-from openai import OpenAI
-from agents import Agent, FileSearchTool, Runner, trace
-from IPython.display import display, Markdown
+from agents import Agent
 from agents.model_settings import ModelSettings
 
 # Import Necessary Libraries
-from src.Tools.Agentic_Calculator_Tool import Agentic_Calculator_Tool
+from src.Runtime.Prompt_Cache import cached_model_settings, static_prompt
+from src.Tools.Agentic_Calculator_Cache import Cached_Agentic_Calculator_Tool
 from src.Tools.GenAI_Process_Knowledge_Base_Tool import GenAI_Process_Knowledge_Base_Tool
 
 GenAI_Use_Case_Agent_Prompt = '''
@@ -55,14 +53,11 @@ Your response must include:
 
 GenAI_Use_Case_Agent = Agent(
         name="GenAI_Use_Case_Agent",
-        instructions=GenAI_Use_Case_Agent_Prompt,
+        instructions=static_prompt(GenAI_Use_Case_Agent_Prompt),
         model=os.getenv("LLM_MODEL"),
-        model_settings=ModelSettings(reasoning={"effort": "high"}),
+        model_settings=cached_model_settings("GenAI_Use_Case_Agent", ModelSettings(reasoning={"effort": "high"})),
         tools=[
-            Agentic_Calculator_Tool.as_tool(
-                tool_name="Agentic_Calculator_Tool",
-                tool_description="Tool for evaluating the appropriateness of Generative AI for a specific business activity",
-            ),
+            Cached_Agentic_Calculator_Tool,
             GenAI_Process_Knowledge_Base_Tool.as_tool(
                 tool_name="GenAI_Process_Knowledge_Base_Tool",
                 tool_description="Tool for searching the knowledge base on workforce optimization with AI and forecasting frameworks",
@@ -0,0 +1,223 @@
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+from agents.run import CallModelData, ModelInputData, RunConfig
+from agents.tracing import Span, Trace, TracingProcessor
+from pydantic import BaseModel
+
+
+class Trim_Config(BaseModel):
+    max_excerpts: int = 3
+    "Search results kept per call when none of them were cited"
+    max_excerpts_per_file: int = 1
+    "Best-scoring results kept per cited file"
+    max_excerpt_chars: int = 800
+    "Excerpt text beyond this is cut (on a word boundary)"
+    trim_current_turn: bool = False
+    "Also trim results from the turn in progress, which the model may still be answering from"
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0]
+    return cut + " …"
+
+
+def _cited_file_ids(items: List[Any]) -> set:
+    """File ids referenced by `file_citation` annotations on assistant messages."""
+    cited = set()
+    for item in items:
+        if not isinstance(item, dict) or item.get("type") != "message":
+            continue
+        for part in item.get("content") or []:
+            if isinstance(part, dict):
+                for annotation in part.get("annotations") or []:
+                    if isinstance(annotation, dict) and annotation.get("file_id"):
+                        cited.add(annotation["file_id"])
+    return cited
+
+
+def trim_search_results(results: List[Dict[str, Any]], cited: set, config: Trim_Config) -> List[Dict[str, Any]]:
+    """
+    Collapse search results to the excerpts that were cited.
+
+    Keeps the best `max_excerpts_per_file` results of each cited file, or the top
+    `max_excerpts` by score when nothing was cited, and truncates their text.
+    """
+    ranked = sorted(results, key=lambda r: r.get("score") or 0.0, reverse=True)
+    kept: List[Dict[str, Any]] = []
+    if cited:
+        per_file: Dict[str, int] = {}
+        for result in ranked:
+            file_id = result.get("file_id")
+            if file_id in cited and per_file.get(file_id, 0) < config.max_excerpts_per_file:
+                per_file[file_id] = per_file.get(file_id, 0) + 1
+                kept.append(result)
+    if not kept:
+        kept = ranked[: config.max_excerpts]
+    return [{**result, "text": _truncate(result.get("text") or "", config.max_excerpt_chars)} for result in kept]
+
+
+def _trim_function_output(output: Any, config: Trim_Config) -> Any:
+    """Trim a local search tool output (a JSON list of results with file ids and text); leave anything else."""
+    if not isinstance(output, str) or not output.startswith("["):
+        return output
+    try:
+        results = json.loads(output)
+    except ValueError:
+        return output
+    if not results or not all(isinstance(r, dict) and "file_id" in r and "text" in r for r in results):
+        return output
+    return json.dumps(trim_search_results(results, set(), config), ensure_ascii=False)
+
+
+def trim_tool_results(items: List[Any], config: Optional[Trim_Config] = None) -> List[Any]:
+    """
+    Input items with the search results of earlier turns trimmed to cited excerpts.
+
+    Hosted `file_search_call` results are cut to the files cited by the assistant messages
+    that follow them; local search tool outputs keep their top `max_excerpts`. Items are
+    copied, never modified, so session history keeps the full results.
+    """
+    config = config or Trim_Config()
+    end = len(items)
+    if not config.trim_current_turn:
+        end = max((i for i, item in enumerate(items) if isinstance(item, dict) and item.get("role") == "user"), default=0)
+
+    # A turn's citations are looked up only within that turn, so an item trims the same way
+    # on every later call and the history prefix stays byte-identical (and cacheable).
+    turn_ends, next_user = [0] * end, end
+    for i in range(end - 1, -1, -1):
+        turn_ends[i] = next_user
+        if isinstance(items[i], dict) and items[i].get("role") == "user":
+            next_user = i
+
+    trimmed = list(items)
+    for i in range(end):
+        item = items[i]
+        if not isinstance(item, dict):
+            continue
+        if item.get("type") == "file_search_call" and item.get("results"):
+            cited = _cited_file_ids(items[i + 1:turn_ends[i]])
+            trimmed[i] = {**item, "results": trim_search_results(item["results"], cited, config)}
+        elif item.get("type") == "function_call_output":
+            output = _trim_function_output(item.get("output"), config)
+            if output is not item.get("output"):
+                trimmed[i] = {**item, "output": output}
+    return trimmed
+
+
+def trim_model_input(data: CallModelData[Any], config: Optional[Trim_Config] = None) -> ModelInputData:
+    """`RunConfig.call_model_input_filter` applying `trim_tool_results` before every model call."""
+    return ModelInputData(input=trim_tool_results(data.model_data.input, config), instructions=data.model_data.instructions)
+
+
+def prompt_run_config(config: Optional[Trim_Config] = None, **kwargs) -> RunConfig:
+    """`RunConfig` that trims replayed tool results; `kwargs` are passed to `RunConfig`."""
+    return RunConfig(call_model_input_filter=lambda data: trim_model_input(data, config), **kwargs)
+
+
+class Prompt_Call_Usage(BaseModel):
+    agent: str
+    input_tokens: int
+    cached_input_tokens: int
+    output_tokens: int
+
+    @property
+    def uncached_input_tokens(self) -> int:
+        return self.input_tokens - self.cached_input_tokens
+
+
+class Prompt_Cache_Summary(BaseModel):
+    calls: int = 0
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    uncached_input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def cached_share(self) -> float:
+        return self.cached_input_tokens / self.input_tokens if self.input_tokens else 0.0
+
+
+def _usage_row(agent: str, usage: Any) -> Prompt_Call_Usage:
+    cached = getattr(getattr(usage, "input_tokens_details", None), "cached_tokens", 0) or 0
+    return Prompt_Call_Usage(agent=agent, input_tokens=usage.input_tokens, cached_input_tokens=cached, output_tokens=usage.output_tokens)
+
+
+def run_call_usage(result) -> List[Prompt_Call_Usage]:
+    """
+    Per-call token usage of the model calls of a `RunResult`, each credited to the agent
+    whose items that response produced (so handoffs are attributed correctly).
+
+    Calls made inside agent-backed tools (`as_tool`) are separate runs and are not in the
+    result; use `Prompt_Usage_Recorder` to see those.
+    """
+    produced_by = {getattr(item.raw_item, "id", None): item.agent.name for item in result.new_items}
+    produced_by.pop(None, None)
+    rows = []
+    for response in result.raw_responses:
+        ids = (getattr(output, "id", None) for output in response.output)
+        agent = next((produced_by[i] for i in ids if i in produced_by), "unknown")
+        rows.append(_usage_row(agent, response.usage))
+    return rows
+
+
+def summarize_usage(calls: List[Prompt_Call_Usage]) -> Prompt_Cache_Summary:
+    summary = Prompt_Cache_Summary(calls=len(calls))
+    for call in calls:
+        summary.input_tokens += call.input_tokens
+        summary.cached_input_tokens += call.cached_input_tokens
+        summary.uncached_input_tokens += call.uncached_input_tokens
+        summary.output_tokens += call.output_tokens
+    return summary
+
+
+class Prompt_Usage_Recorder(TracingProcessor):
+    """
+    Trace processor collecting cached vs uncached input tokens of every model call.
+
+    Unlike `run_call_usage`, this also sees the calls of nested `as_tool` agents, which
+    run in the same trace. Register with `add_trace_processor(recorder)`, read with
+    `take()`.
+    """
+
+    def __init__(self):
+        self._calls: List[Prompt_Call_Usage] = []
+        self._span_agent: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def on_trace_start(self, trace: Trace) -> None:
+        pass
+
+    def on_trace_end(self, trace: Trace) -> None:
+        pass
+
+    def on_span_start(self, span: Span[Any]) -> None:
+        if span.span_data.type == "agent":
+            self._span_agent[span.span_id] = span.span_data.name
+
+    def on_span_end(self, span: Span[Any]) -> None:
+        data = span.span_data
+        if data.type == "agent":
+            self._span_agent.pop(span.span_id, None)
+        elif data.type == "response":
+            usage = getattr(data.response, "usage", None) if data.response is not None else None
+            if usage is not None:
+                row = _usage_row(self._span_agent.get(span.parent_id or "", "unknown"), usage)
+                with self._lock:
+                    self._calls.append(row)
+
+    def take(self) -> List[Prompt_Call_Usage]:
+        """Calls recorded since the last `take`."""
+        with self._lock:
+            calls, self._calls = self._calls, []
+        return calls
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self) -> None:
+        pass
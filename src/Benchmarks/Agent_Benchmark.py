@@ -0,0 +1,272 @@
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+# Import Necessary Libraries
+from src.Agents import Agent_Registry
+from src.Agents.Prompt_Assembly import Prompt_Usage_Recorder, prompt_run_config, summarize_usage
+from src.Benchmarks.Mock_Responses_Server import Mock_Responses_Server, Mock_Server_Config
+
+DEFAULT_BASELINE_PATH = "Data/Results/Benchmarks/agent_benchmark_baseline.json"
+
+# Benchmarked `Agent_Registry` names. Agents whose modules are missing from this checkout
+# (or fail to import) are reported as skipped.
+BENCHMARK_AGENTS = [
+    "Basic_QA_Agent",
+    "GenAI_Use_Case_Agent",
+    "Advanced_Q_A_Agent",
+    "Agentic_Calculator_Tool",
+    "GenAI_Process_Knowledge_Base_Tool",
+]
+
+DEFAULT_PROMPT = "Evaluate Generative AI for: monthly accounts-payable invoice reconciliation across three ERPs."
+
+DEFAULT_FOLLOW_UP = "Which steps of that process would you automate first, and why?"
+
+# Per-row metrics compared against the baseline; True when higher is better.
+COMPARED_METRICS = {
+    "latency_p50_s": False,
+    "latency_p95_s": False,
+    "ttft_p50_s": False,
+    "throughput_rps": True,
+    "uncached_input_tokens_per_run": False,
+}
+
+
+class Benchmark_Config(BaseModel):
+    agents: List[str] = list(BENCHMARK_AGENTS)
+    modes: List[str] = ["run", "run_streamed"]
+    concurrency: List[int] = [1, 4, 16]
+    runs_per_level: int = 16
+    "Agent runs per (agent, mode, concurrency) cell"
+    prompt: str = DEFAULT_PROMPT
+    turns: int = 1
+    "Turns per run in one session; turns after the first send `follow_up`, replaying the earlier turns' tool results"
+    follow_up: str = DEFAULT_FOLLOW_UP
+    trim_tool_results: bool = True
+    "Run with `Prompt_Assembly.prompt_run_config` (earlier turns' search results trimmed to cited excerpts)"
+    server: Mock_Server_Config = Mock_Server_Config()
+
+
+class Run_Sample(BaseModel):
+    latency_s: float
+    ttft_s: Optional[float] = None
+    "Time to the first streamed text delta (streamed runs only)"
+    tool_calls: int = 0
+    error: Optional[str] = None
+
+
+def _percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else float("nan")
+
+
+async def _run_once(agent, prompts: List[str], mode: str, run_config=None) -> Run_Sample:
+    """One run: every prompt in turn, in one session when there is more than one. TTFT is the first turn's."""
+    from agents import Runner, SQLiteSession
+    from agents.items import ToolCallItem
+    from openai.types.responses import ResponseTextDeltaEvent
+
+    started = time.perf_counter()
+    ttft = None
+    tool_calls = 0
+    session = SQLiteSession(uuid.uuid4().hex) if len(prompts) > 1 else None
+    try:
+        for prompt in prompts:
+            if mode == "run_streamed":
+                result = Runner.run_streamed(agent, input=prompt, session=session, run_config=run_config)
+                async for event in result.stream_events():
+                    if ttft is None and event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                        ttft = time.perf_counter() - started
+            else:
+                result = await Runner.run(agent, prompt, session=session, run_config=run_config)
+            tool_calls += sum(isinstance(item, ToolCallItem) for item in result.new_items)
+        return Run_Sample(latency_s=time.perf_counter() - started, ttft_s=ttft, tool_calls=tool_calls)
+    except Exception as e:
+        return Run_Sample(latency_s=time.perf_counter() - started, ttft_s=ttft, error=f"{type(e).__name__}: {e}")
+    finally:
+        if session is not None:
+            session.close()
+
+
+async def benchmark_cell(agent, prompts: List[str], mode: str, concurrency: int, runs: int, run_config=None) -> Dict[str, float]:
+    """Run `agent` `runs` times with at most `concurrency` in flight and summarize the samples."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded() -> Run_Sample:
+        async with semaphore:
+            return await _run_once(agent, prompts, mode, run_config)
+
+    started = time.perf_counter()
+    samples = await asyncio.gather(*(bounded() for _ in range(runs)))
+    wall = time.perf_counter() - started
+    ok = [s for s in samples if s.error is None]
+    latencies = [s.latency_s for s in ok]
+    ttfts = [s.ttft_s for s in ok if s.ttft_s is not None]
+    return {
+        "runs": runs,
+        "errors": runs - len(ok),
+        "latency_p50_s": _percentile(latencies, 50),
+        "latency_p95_s": _percentile(latencies, 95),
+        "latency_p99_s": _percentile(latencies, 99),
+        "ttft_p50_s": _percentile(ttfts, 50),
+        "ttft_p95_s": _percentile(ttfts, 95),
+        "tool_calls_mean": float(np.mean([s.tool_calls for s in ok])) if ok else float("nan"),
+        "throughput_rps": len(ok) / wall if wall > 0 else 0.0,
+        "first_error": next((s.error for s in samples if s.error), None),
+    }
+
+
+def use_mock_server(server: Mock_Responses_Server) -> Prompt_Usage_Recorder:
+    """
+    Point every client at the mock server before the agent modules are imported.
+
+    Returns:
+        A `Prompt_Usage_Recorder`, the only trace processor left registered, so every model
+        call (nested `as_tool` runs included) reports its cached and uncached input tokens.
+    """
+    from agents import set_default_openai_client, set_trace_processors, set_tracing_disabled
+    from openai import AsyncOpenAI
+
+    os.environ["OPENAI_API_BASE"] = server.base_url
+    os.environ.setdefault("OPENAI_API_KEY", "sk-mock")
+    os.environ.setdefault("LLM_MODEL", "mock-model")
+    os.environ.setdefault("ASSISTANT_VECTOR_KEY", "vs_mock")
+    os.environ.setdefault("GENAI_PROCESS_KNOWLEDGE_BASE_ASSISTANT_KEY", "vs_mock")
+    # Keep the calculator cache out of the real one; it still warms up within a benchmark run.
+    os.environ.setdefault("AGENTIC_CALCULATOR_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "calculator_cache.sqlite"))
+    recorder = Prompt_Usage_Recorder()
+    set_trace_processors([recorder])
+    set_tracing_disabled(False)
+    set_default_openai_client(AsyncOpenAI(api_key=os.environ["OPENAI_API_KEY"], base_url=server.base_url))
+    return recorder
+
+
+async def run_benchmark(config: Optional[Benchmark_Config] = None) -> pd.DataFrame:
+    """
+    Drive each agent through `Runner.run` / `Runner.run_streamed` against the mock server.
+
+    Returns:
+        One row per (agent, mode, concurrency) with latency percentiles, TTFT, tool calls,
+        throughput, the number of model requests per run and input tokens per run split
+        into cached and uncached. Agents that cannot be imported get a single row with
+        `skipped` set.
+    """
+    config = config or Benchmark_Config()
+    prompts = [config.prompt] + [config.follow_up] * (config.turns - 1)
+    run_config = prompt_run_config() if config.trim_tool_results else None
+    rows = []
+    with Mock_Responses_Server(config.server) as server:
+        recorder = use_mock_server(server)
+        for name in config.agents:
+            try:
+                agent = Agent_Registry.get(name)
+            except Exception as e:
+                rows.append({"agent": name, "skipped": f"{type(e).__name__}: {e}"})
+                continue
+            for mode in config.modes:
+                for concurrency in config.concurrency:
+                    requests_before = server.requests
+                    recorder.take()
+                    cell = await benchmark_cell(agent, prompts, mode, concurrency, config.runs_per_level, run_config)
+                    cell["model_requests_per_run"] = (server.requests - requests_before) / config.runs_per_level
+                    usage = summarize_usage(recorder.take())
+                    cell["input_tokens_per_run"] = usage.input_tokens / config.runs_per_level
+                    cell["uncached_input_tokens_per_run"] = usage.uncached_input_tokens / config.runs_per_level
+                    cell["cached_input_share"] = usage.cached_share
+                    rows.append({"agent": name, "mode": mode, "concurrency": concurrency, **cell, "skipped": None})
+    frame = pd.DataFrame(rows)
+    for column in ("concurrency", "runs", "errors"):
+        if column in frame:
+            frame[column] = frame[column].astype("Int64")
+    return frame
+
+
+def save_baseline(results: pd.DataFrame, path: str = DEFAULT_BASELINE_PATH) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    payload = {"created_at": time.time(), "rows": json.loads(results.to_json(orient="records"))}
+    Path(path).write_text(json.dumps(payload, indent=2))
+
+
+def compare_to_baseline(results: pd.DataFrame, path: str = DEFAULT_BASELINE_PATH, tolerance: float = 0.2) -> pd.DataFrame:
+    """
+    Join results with a stored baseline and flag regressions.
+
+    A metric regresses when it is worse than the baseline by more than `tolerance`
+    (relative). Returns the current rows with `<metric>_baseline`, `<metric>_ratio` and
+    a `regression` column.
+    """
+    baseline = pd.DataFrame(json.loads(Path(path).read_text())["rows"])
+    keys = ["agent", "mode", "concurrency"]
+    current = results[results["skipped"].isna()] if "skipped" in results else results
+    baseline = baseline[baseline["skipped"].isna()] if "skipped" in baseline else baseline
+    # Baselines saved before a metric was added are compared on the metrics they have.
+    metrics = {m: higher for m, higher in COMPARED_METRICS.items() if m in baseline and m in current}
+    merged = current.merge(baseline[keys + list(metrics)], on=keys, how="left", suffixes=("", "_baseline"))
+    regression = pd.Series(False, index=merged.index)
+    for metric, higher_is_better in metrics.items():
+        ratio = merged[metric] / merged[f"{metric}_baseline"]
+        merged[f"{metric}_ratio"] = ratio
+        worse = ratio < 1 - tolerance if higher_is_better else ratio > 1 + tolerance
+        regression |= worse.fillna(False)
+    merged["regression"] = regression
+    return merged
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Offline agent latency/throughput benchmark against a mock Responses API.")
+    parser.add_argument("--agents", nargs="*", default=BENCHMARK_AGENTS, choices=BENCHMARK_AGENTS)
+    parser.add_argument("--modes", nargs="*", default=["run", "run_streamed"], choices=["run", "run_streamed"])
+    parser.add_argument("--concurrency", type=int, nargs="*", default=[1, 4, 16])
+    parser.add_argument("--runs", type=int, default=16, help="Runs per (agent, mode, concurrency)")
+    parser.add_argument("--first-token-s", type=float, default=0.25, help="Mock server latency to first byte")
+    parser.add_argument("--delta-interval-s", type=float, default=0.01, help="Mock server delay between streamed deltas")
+    parser.add_argument("--prefill-s-per-1k", type=float, default=0.0, help="Mock server delay per 1,000 uncached input tokens")
+    parser.add_argument("--turns", type=int, default=1, help="Turns per run in one session (follow-ups replay earlier tool results)")
+    parser.add_argument("--no-trim", action="store_true", help="Replay earlier turns' tool results in full")
+    parser.add_argument("--no-prompt-cache", action="store_true", help="Mock server caches nothing")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the baseline; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    config = Benchmark_Config(
+        agents=args.agents,
+        modes=args.modes,
+        concurrency=args.concurrency,
+        runs_per_level=args.runs,
+        turns=args.turns,
+        trim_tool_results=not args.no_trim,
+        server=Mock_Server_Config(
+            first_token_s=args.first_token_s,
+            delta_interval_s=args.delta_interval_s,
+            prefill_s_per_1k_tokens=args.prefill_s_per_1k,
+            prefix_cache=not args.no_prompt_cache,
+        ),
+    )
+    results = asyncio.run(run_benchmark(config))
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(results.drop(columns=["first_error"], errors="ignore").round(4).to_string(index=False))
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+    if args.compare:
+        comparison = compare_to_baseline(results, args.baseline, args.tolerance)
+        ratios = ["agent", "mode", "concurrency"] + [f"{m}_ratio" for m in COMPARED_METRICS if f"{m}_ratio" in comparison] + ["regression"]
+        print(comparison[ratios].round(3).to_string(index=False))
+        if comparison["regression"].any():
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+# Heavy or notebook-only packages, matched as a module or any of its submodules.
+HEAVY = ["agents", "openai", "galileo", "IPython", "pandas"]
+
+# Import targets checked on every run: what is imported, how long it may take (best of
+# `repeats` cold interpreters) and which packages it must not pull in.
+BUDGETS = {
+    "streamlit_app_startup": {
+        "imports": ["src.Runtime.Agent_Runtime", "src.Runtime.Conversation_Store", "src.Runtime.Stream_Renderer"],
+        "budget_ms": 500,
+        "forbidden": HEAVY,
+    },
+    "agent_registry": {"imports": ["src.Agents.Agent_Registry"], "budget_ms": 100, "forbidden": HEAVY},
+    "Basic_QA_Agent": {"imports": ["src.Agents.Basic_QA_Agent"], "budget_ms": 4000, "forbidden": ["IPython", "galileo"]},
+    "GenAI_Use_Case_Agent": {"imports": ["src.Agents.GenAI_Use_Case_Agent"], "budget_ms": 4000, "forbidden": ["IPython", "galileo"]},
+    "GenAI_Process_Knowledge_Base_Tool": {
+        "imports": ["src.Tools.GenAI_Process_Knowledge_Base_Tool"],
+        "budget_ms": 4000,
+        "forbidden": ["IPython", "galileo"],
+    },
+}
+
+# Runs in a fresh interpreter: import the targets and report which modules that loaded.
+_PROBE = """
+import json, sys
+before = set(sys.modules)
+{imports}
+print(json.dumps(sorted(set(sys.modules) - before)))
+"""
+
+
+class Import_Measurement(BaseModel):
+    name: str
+    import_ms: float
+    "Summed `-X importtime` cumulative time of the top-level imports the targets triggered"
+    budget_ms: float
+    forbidden_loaded: List[str]
+    heaviest: List[Tuple[str, float]]
+    "Largest cumulative imports (module, ms), to point at what regressed"
+
+    @property
+    def ok(self) -> bool:
+        return self.import_ms <= self.budget_ms and not self.forbidden_loaded
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, int, float]]:
+    """(module, nesting depth, cumulative ms) for each `import time:` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((name.strip(), depth, int(cumulative) / 1000))
+    return rows
+
+
+def _measure_once(imports: List[str]) -> Tuple[float, List[str], List[Tuple[str, float]]]:
+    probe = _PROBE.format(imports="\n".join(f"import {module}" for module in imports))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [os.getcwd(), os.getenv("PYTHONPATH")]))},
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {imports} failed:\n{completed.stderr[-2000:]}")
+    loaded = set(json.loads(completed.stdout.strip().splitlines()[-1]))
+    rows = [row for row in _parse_importtime(completed.stderr) if row[0] in loaded]
+    total = sum(ms for _, depth, ms in rows if depth == 0)
+    heaviest = sorted(((name, ms) for name, _, ms in rows), key=lambda r: r[1], reverse=True)[:8]
+    return total, sorted(loaded), heaviest
+
+
+def measure(name: str, imports: List[str], budget_ms: float, forbidden: List[str], repeats: int = 3) -> Import_Measurement:
+    """Import `imports` in `repeats` fresh interpreters and keep the fastest run."""
+    best: Optional[Tuple[float, List[str], List[Tuple[str, float]]]] = None
+    for _ in range(repeats):
+        run = _measure_once(imports)
+        if best is None or run[0] < best[0]:
+            best = run
+    total, loaded, heaviest = best
+    forbidden_loaded = sorted({f for f in forbidden for m in loaded if m == f or m.startswith(f + ".")})
+    return Import_Measurement(
+        name=name,
+        import_ms=total,
+        budget_ms=budget_ms,
+        forbidden_loaded=forbidden_loaded,
+        heaviest=[(module, round(ms, 1)) for module, ms in heaviest],
+    )
+
+
+def check_budgets(budgets: Optional[Dict[str, dict]] = None, scale: float = 1.0, repeats: int = 3) -> List[Import_Measurement]:
+    """Measure every budget; `scale` loosens or tightens all time budgets (e.g. 2.0 on slow CI)."""
+    budgets = budgets or BUDGETS
+    return [
+        measure(name, spec["imports"], spec["budget_ms"] * scale, spec["forbidden"], repeats)
+        for name, spec in budgets.items()
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Check import time and heavy-dependency budgets; exit 1 on regression.")
+    parser.add_argument("--only", nargs="*", choices=list(BUDGETS), help="Check only these budgets")
+    parser.add_argument("--scale", type=float, default=float(os.getenv("IMPORT_BUDGET_SCALE", "1.0")), help="Multiply every time budget")
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh interpreters per budget; the fastest counts")
+    args = parser.parse_args(argv)
+
+    budgets = {name: BUDGETS[name] for name in args.only} if args.only else BUDGETS
+    results = check_budgets(budgets, args.scale, args.repeats)
+    for result in results:
+        status = "ok" if result.ok else "REGRESSION"
+        print(f"{status:<10} {result.name:<36} {result.import_ms:8.1f} ms / {result.budget_ms:.0f} ms")
+        if result.forbidden_loaded:
+            print(f"{'':<10} imports forbidden packages: {', '.join(result.forbidden_loaded)}")
+        if not result.ok:
+            for module, ms in result.heaviest:
+                print(f"{'':<10}   {ms:8.1f} ms  {module}")
+    if not all(result.ok for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
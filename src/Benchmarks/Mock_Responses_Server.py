@@ -0,0 +1,350 @@
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+class Mock_Server_Config(BaseModel):
+    first_token_s: float = 0.25
+    "Delay before the first byte (non-streamed: before the body; streamed: before the first event)"
+    jitter_s: float = 0.05
+    "Uniform jitter added to `first_token_s`"
+    delta_interval_s: float = 0.01
+    "Delay between streamed text deltas; non-streamed responses wait for the same total"
+    words_per_delta: int = 3
+    reply_text: str = (
+        "Based on the knowledge base, this activity is a strong candidate for Generative AI support. "
+        "Drafting, summarizing and reconciling steps can be automated, while approvals stay with the team. "
+        "Estimated appropriateness score: 3.5 out of 5 [1]."
+    )
+    "Scripted assistant message returned once tool calls (if any) have been answered"
+    call_function_tools: bool = True
+    "Answer the first model call of a turn with one call to every function tool in the request"
+    file_search_results: int = 20
+    "Results attached to `file_search_call` items when the request includes them (`include_search_results`)"
+    file_search_citations: int = 2
+    "Results cited (as `file_citation` annotations) by the reply that follows a file search"
+    prefill_s_per_1k_tokens: float = 0.0
+    "Extra delay before the first token per 1,000 input tokens that miss the prompt cache"
+    prefix_cache: bool = True
+    "Simulate provider prompt caching: input tokens covered by a previously seen prefix are reported as cached"
+    cache_min_tokens: int = 1024
+    "Prompts shorter than this are never cached"
+    cache_block_tokens: int = 128
+    "Cached prefixes grow in blocks of this many tokens"
+    cache_shards: int = 4
+    "Independent caches; requests with a `prompt_cache_key` always reach the same one, others a random one"
+    cache_capacity: int = 50_000
+    "Prefix blocks remembered per shard (least recently used are evicted)"
+    seed: int = 0
+
+
+def _sample_schema(schema: Dict[str, Any], root: Dict[str, Any], depth: int = 0) -> Any:
+    """Minimal instance of a JSON schema: first enum value, one array element, all object properties."""
+    if "$ref" in schema:
+        name = schema["$ref"].split("/")[-1]
+        return _sample_schema(root.get("$defs", root.get("definitions", {})).get(name, {}), root, depth)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"] or schema[key]
+            return _sample_schema(options[0], root, depth)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object" or "properties" in schema:
+        return {name: _sample_schema(prop, root, depth + 1) for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [] if depth > 6 else [_sample_schema(schema.get("items", {}), root, depth + 1)]
+    if kind == "integer":
+        return int(schema.get("minimum", 1))
+    if kind == "number":
+        return float(schema.get("minimum", 1.0))
+    if kind == "boolean":
+        return True
+    if kind == "null":
+        return None
+    return "benchmark"
+
+
+class Mock_Responses_Server:
+    """
+    Local stand-in for the OpenAI Responses API (`POST /v1/responses`), for offline benchmarks.
+
+    Responses are scripted from the request itself: the first call of a turn answers with a
+    call to every function tool (arguments sampled from their schemas), follow-up calls answer
+    with `reply_text` (or a JSON instance of the requested output schema), and hosted
+    `file_search` tools are reported as completed server-side calls (with results and
+    citations when requested). Streamed requests get server-sent events with text deltas at
+    `delta_interval_s`.
+
+    Prompt caching is simulated the way the provider reports it: the request is serialized
+    as tools, instructions, then input; the longest previously seen prefix (in
+    `cache_block_tokens` blocks, at least `cache_min_tokens`) counts as cached, and only the
+    uncached rest pays `prefill_s_per_1k_tokens`. Tokens are estimated as 4 characters each.
+
+    Example:
+        with Mock_Responses_Server() as server:
+            os.environ["OPENAI_API_BASE"] = server.base_url
+    """
+
+    def __init__(self, config: Optional[Mock_Server_Config] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or Mock_Server_Config()
+        self.requests = 0
+        self.streamed_requests = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._prefix_cache: List["OrderedDict[str, None]"] = [OrderedDict() for _ in range(max(1, self.config.cache_shards))]
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                if not self.path.rstrip("/").endswith("/responses"):
+                    self._send_json(404, {"error": {"message": f"mock server has no route {self.path}"}})
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                server._count(body.get("stream", False))
+                output = server.script(body)
+                input_tokens, cached_tokens = server._prompt_cache(body)
+                response = server._response(body, output, input_tokens, cached_tokens)
+                time.sleep(server._first_token_delay(input_tokens - cached_tokens))
+                if body.get("stream"):
+                    self._send_stream(server._events(response))
+                else:
+                    time.sleep(server.config.delta_interval_s * server._n_deltas(output))
+                    self._send_json(200, response)
+
+            def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, events) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for event, delay in events:
+                    if delay:
+                        time.sleep(delay)
+                    data = f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "Mock_Responses_Server":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-responses-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "Mock_Responses_Server":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _count(self, streamed: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.streamed_requests += int(bool(streamed))
+
+    def _first_token_delay(self, uncached_tokens: int = 0) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(0, self.config.jitter_s)
+        return self.config.first_token_s + jitter + self.config.prefill_s_per_1k_tokens * uncached_tokens / 1000
+
+    def _prompt_cache(self, body: Dict[str, Any]) -> Tuple[int, int]:
+        """(input tokens, cached input tokens) for a request, remembering its prefix blocks."""
+        prompt = json.dumps(body.get("tools") or [], sort_keys=True) + (body.get("instructions") or "") + json.dumps(body.get("input", ""))
+        input_tokens = len(prompt) // 4
+        if not self.config.prefix_cache or input_tokens < self.config.cache_min_tokens:
+            return input_tokens, 0
+        block_chars = self.config.cache_block_tokens * 4
+        key = body.get("prompt_cache_key")
+        with self._lock:
+            shard = self._prefix_cache[
+                int(hashlib.sha1(key.encode()).hexdigest(), 16) % len(self._prefix_cache) if key else self._rng.randrange(len(self._prefix_cache))
+            ]
+            # Each block is keyed by a hash of the whole prefix up to its end, so a hit implies
+            # every earlier block matched too.
+            digest, cached_chars = hashlib.sha1(), 0
+            for end in range(block_chars, len(prompt) + 1, block_chars):
+                digest.update(prompt[end - block_chars:end].encode())
+                block = digest.hexdigest()
+                if block in shard:
+                    shard.move_to_end(block)
+                    cached_chars = end
+                else:
+                    shard[block] = None
+            while len(shard) > self.config.cache_capacity:
+                shard.popitem(last=False)
+        cached_tokens = cached_chars // 4
+        return input_tokens, cached_tokens if cached_tokens >= self.config.cache_min_tokens else 0
+
+    def _n_deltas(self, output: List[Dict[str, Any]]) -> int:
+        words = sum(len(part["text"].split()) for item in output if item["type"] == "message" for part in item["content"])
+        return -(-words // max(1, self.config.words_per_delta))
+
+    def script(self, body: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Output items for one request."""
+        items = body.get("input") if isinstance(body.get("input"), list) else []
+        tools = body.get("tools") or []
+        # Only look at the current turn: items after the last user message.
+        last_user = max((i for i, item in enumerate(items) if isinstance(item, dict) and item.get("role") == "user"), default=-1)
+        answered = any(item.get("type") == "function_call_output" for item in items[last_user + 1:] if isinstance(item, dict))
+
+        function_tools = [tool for tool in tools if tool.get("type") == "function"]
+        if self.config.call_function_tools and function_tools and not answered:
+            return [
+                {
+                    "type": "function_call",
+                    "id": f"fc_{uuid.uuid4().hex}",
+                    "call_id": f"call_{uuid.uuid4().hex}",
+                    "name": tool["name"],
+                    "arguments": json.dumps(_sample_schema(tool.get("parameters") or {}, tool.get("parameters") or {})),
+                    "status": "completed",
+                }
+                for tool in function_tools
+            ]
+
+        output: List[Dict[str, Any]] = []
+        annotations: List[Dict[str, Any]] = []
+        if any(tool.get("type") == "file_search" for tool in tools):
+            results = None
+            if "file_search_call.results" in (body.get("include") or []):
+                results = [self._search_result(rank) for rank in range(self.config.file_search_results)]
+                annotations = [
+                    {"type": "file_citation", "file_id": r["file_id"], "filename": r["filename"], "index": 0}
+                    for r in results[: self.config.file_search_citations]
+                ]
+            output.append({"type": "file_search_call", "id": f"fs_{uuid.uuid4().hex}", "queries": ["benchmark"], "status": "completed", "results": results})
+        text_format = ((body.get("text") or {}).get("format") or {})
+        if text_format.get("type") == "json_schema":
+            schema = text_format.get("schema") or {}
+            text = json.dumps(_sample_schema(schema, schema))
+        else:
+            text = self.config.reply_text
+        output.append(
+            {
+                "type": "message",
+                "id": f"msg_{uuid.uuid4().hex}",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": annotations}],
+            }
+        )
+        return output
+
+    def _search_result(self, rank: int) -> Dict[str, Any]:
+        """One file search hit: a ~1,000-character chunk, scores falling with rank."""
+        sentence = f"Section {rank + 1} describes how shared-services teams stage, review and approve recurring work. "
+        return {
+            "file_id": f"file_mock_{rank:02d}",
+            "filename": f"knowledge_base_{rank:02d}.pdf",
+            "score": round(1.0 - rank / max(1, self.config.file_search_results), 4),
+            "text": sentence * max(1, 1000 // len(sentence)),
+            "attributes": {},
+        }
+
+    def _response(self, body: Dict[str, Any], output: List[Dict[str, Any]], input_tokens: int, cached_tokens: int = 0) -> Dict[str, Any]:
+        output_tokens = sum(len(json.dumps(item)) // 4 for item in output)
+        return {
+            "id": f"resp_{uuid.uuid4().hex}",
+            "object": "response",
+            "created_at": time.time(),
+            "model": body.get("model") or "mock-model",
+            "status": "completed",
+            "output": output,
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "usage": {
+                "input_tokens": input_tokens,
+                "input_tokens_details": {"cached_tokens": cached_tokens},
+                "output_tokens": output_tokens,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": input_tokens + output_tokens,
+            },
+        }
+
+    def _events(self, response: Dict[str, Any]):
+        """(event, delay before sending) pairs for one streamed response."""
+        sequence = iter(range(1_000_000))
+        yield {"type": "response.created", "sequence_number": next(sequence), "response": {**response, "status": "in_progress", "output": []}}, 0.0
+        for index, item in enumerate(response["output"]):
+            if item["type"] != "message":
+                yield {"type": "response.output_item.added", "sequence_number": next(sequence), "output_index": index, "item": item}, 0.0
+                yield {"type": "response.output_item.done", "sequence_number": next(sequence), "output_index": index, "item": item}, 0.0
+                continue
+            yield {"type": "response.output_item.added", "sequence_number": next(sequence), "output_index": index, "item": {**item, "status": "in_progress", "content": []}}, 0.0
+            words = item["content"][0]["text"].split(" ")
+            step = max(1, self.config.words_per_delta)
+            for start in range(0, len(words), step):
+                delta = " ".join(words[start:start + step]) + (" " if start + step < len(words) else "")
+                yield {
+                    "type": "response.output_text.delta",
+                    "sequence_number": next(sequence),
+                    "item_id": item["id"],
+                    "output_index": index,
+                    "content_index": 0,
+                    "delta": delta,
+                    "logprobs": [],
+                }, (self.config.delta_interval_s if start else 0.0)
+            yield {"type": "response.output_item.done", "sequence_number": next(sequence), "output_index": index, "item": item}, 0.0
+        yield {"type": "response.completed", "sequence_number": next(sequence), "response": response}, 0.0
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the mock OpenAI Responses API server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--first-token-s", type=float, default=0.25)
+    parser.add_argument("--delta-interval-s", type=float, default=0.01)
+    parser.add_argument("--prefill-s-per-1k", type=float, default=0.0, help="Delay per 1,000 uncached input tokens")
+    args = parser.parse_args(argv)
+    config = Mock_Server_Config(
+        first_token_s=args.first_token_s,
+        delta_interval_s=args.delta_interval_s,
+        prefill_s_per_1k_tokens=args.prefill_s_per_1k,
+    )
+    server = Mock_Responses_Server(config, port=args.port).start()
+    print(f"Mock Responses API at {server.base_url} (set OPENAI_API_BASE to this)")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+import argparse
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+# Import Necessary Libraries
+from src.Pipelines.Agentic_Calculator_Batch import (
+    OUTPUT_COLUMNS,
+    Batch_Scoring_Config,
+    Batch_Throughput_Report,
+    Scorer,
+    load_activities,
+    save_results,
+    score_activities,
+)
+from src.Tools.Local_Knowledge_Base_Index import get_encoder, tokenize
+
+LINEAGE_COLUMNS = [
+    "activity_id",
+    "activity",
+    "cluster_id",
+    "representative_id",
+    "representative_activity",
+    "similarity",
+    "match",
+]
+
+
+class Dedup_Config(BaseModel):
+    threshold: float = 0.9
+    "Minimum cosine similarity between a member and its cluster's representative"
+    encoder: str = "hashing-512"
+    "Encoder name as understood by `Local_Knowledge_Base_Index.get_encoder` (e.g. `st-<model>`)"
+    lsh_tables: int = 32
+    "Independent random-hyperplane hash tables; more tables find more true pairs"
+    lsh_bits: int = 20
+    "Hyperplanes per table; more bits give smaller buckets and fewer false candidates"
+    max_bucket_size: int = 64
+    "Buckets larger than this only pair each member with its `max_bucket_size` sorted neighbours"
+    encode_batch: int = 8_192
+    "Texts encoded (and hashed) per batch"
+    seed: int = 0
+
+
+class Dedup_Report(BaseModel):
+    activities: int
+    unique_texts: int
+    "Distinct activities after normalizing case, punctuation and whitespace"
+    clusters: int
+    exact_duplicates: int
+    near_duplicates: int
+    split_members: int
+    "Component members below `threshold` to the representative, kept as their own cluster"
+    candidate_pairs: int
+    "Pairs proposed by the LSH index (instead of all n^2/2)"
+    verified_pairs: int
+    "Candidate pairs at or above `threshold`"
+    llm_calls_avoided: int
+    encode_s: float
+    index_s: float
+    cluster_s: float
+
+
+class Random_Hyperplane_LSH:
+    """
+    Approximate nearest neighbours for cosine similarity.
+
+    Each table hashes a vector to the sign pattern of `bits` random projections; two
+    vectors at angle θ share a table's bucket with probability (1 - θ/π)^bits, so
+    near-duplicates collide in some table while unrelated texts almost never do.
+    """
+
+    def __init__(self, dim: int, tables: int = 32, bits: int = 20, seed: int = 0):
+        if bits > 62:
+            raise ValueError("bits must fit in an int64 bucket key")
+        self.tables = tables
+        self.bits = bits
+        self.planes = np.random.default_rng(seed).standard_normal((dim, tables * bits)).astype(np.float32)
+        self._weights = (1 << np.arange(bits, dtype=np.int64))
+
+    def keys(self, vectors: np.ndarray) -> np.ndarray:
+        """(N, tables) int64 bucket keys."""
+        signs = (vectors @ self.planes > 0).reshape(len(vectors), self.tables, self.bits)
+        return signs @ self._weights
+
+    def candidate_pairs(self, keys: np.ndarray, max_bucket_size: int = 64) -> np.ndarray:
+        """
+        Unique (i, j) pairs with i < j that share a bucket in at least one table.
+
+        Pairs are generated per table by sorting on the key and pairing each row with the
+        next rows of the same bucket, fully vectorized; buckets beyond `max_bucket_size`
+        only pair neighbours within that window.
+        """
+        n = len(keys)
+        found: List[np.ndarray] = []
+        for table in range(keys.shape[1]):
+            order = np.argsort(keys[:, table], kind="stable")
+            sorted_keys = keys[order, table]
+            for offset in range(1, max_bucket_size):
+                same = sorted_keys[offset:] == sorted_keys[:-offset]
+                if not same.any():
+                    break
+                left, right = order[:-offset][same], order[offset:][same]
+                found.append(np.minimum(left, right).astype(np.int64) * n + np.maximum(left, right))
+        if not found:
+            return np.empty((0, 2), dtype=np.int64)
+        encoded = np.unique(np.concatenate(found))
+        return np.stack([encoded // n, encoded % n], axis=1)
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(tokenize(text))
+
+
+def _encode(texts: List[str], config: Dedup_Config) -> np.ndarray:
+    encoder = get_encoder(config.encoder)
+    parts = [encoder(texts[i:i + config.encode_batch]) for i in range(0, len(texts), config.encode_batch)]
+    return np.vstack(parts).astype(np.float32) if parts else np.zeros((0, encoder.dim), dtype=np.float32)
+
+
+def _pair_similarity(vectors: np.ndarray, pairs: np.ndarray, chunk: int = 16_384) -> np.ndarray:
+    sims = np.empty(len(pairs), dtype=np.float32)
+    for start in range(0, len(pairs), chunk):
+        i, j = pairs[start:start + chunk, 0], pairs[start:start + chunk, 1]
+        sims[start:start + chunk] = np.einsum("ij,ij->i", vectors[i], vectors[j])
+    return sims
+
+
+def connected_components(n: int, edges: np.ndarray) -> np.ndarray:
+    """Component label (smallest member index) per node, by vectorized min-label propagation."""
+    labels = np.arange(n)
+    if len(edges) == 0:
+        return labels
+    i, j = edges[:, 0], edges[:, 1]
+    while True:
+        lowest = np.minimum(labels[i], labels[j])
+        updated = labels.copy()
+        np.minimum.at(updated, i, lowest)
+        np.minimum.at(updated, j, lowest)
+        updated = updated[updated]  # pointer jumping
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def cluster_activities(activities: pd.DataFrame, config: Optional[Dedup_Config] = None) -> Tuple[pd.DataFrame, Dedup_Report]:
+    """
+    Group near-duplicate activities and pick one representative per group.
+
+    Identical texts (after normalization) collapse first. The distinct texts are embedded,
+    candidate pairs come from `Random_Hyperplane_LSH`, and pairs at or above `threshold`
+    cosine similarity are joined into connected components. The member closest to each
+    component's centroid becomes the representative; members less similar to it than
+    `threshold` are split into their own clusters, so every member that inherits a
+    score is within `threshold` of the activity that was actually scored.
+
+    Args:
+        activities: Output of `load_activities` (`activity_id`, `activity`).
+
+    Returns:
+        (lineage, report): one row per activity with `LINEAGE_COLUMNS`, where `match` is
+        `representative`, `exact` or `near`.
+    """
+    config = config or Dedup_Config()
+    normalized = activities["activity"].map(normalize_text)
+    text_codes, unique_texts = pd.factorize(normalized)
+    first_row = pd.Series(np.arange(len(activities))).groupby(text_codes).first().to_numpy()
+
+    started = time.perf_counter()
+    vectors = _encode(activities["activity"].iloc[first_row].tolist(), config)
+    encode_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    lsh = Random_Hyperplane_LSH(vectors.shape[1], config.lsh_tables, config.lsh_bits, config.seed)
+    keys = np.vstack([lsh.keys(vectors[i:i + config.encode_batch]) for i in range(0, len(vectors), config.encode_batch)]) if len(vectors) else np.zeros((0, config.lsh_tables), dtype=np.int64)
+    pairs = lsh.candidate_pairs(keys, config.max_bucket_size)
+    similar = pairs[_pair_similarity(vectors, pairs) >= config.threshold] if len(pairs) else pairs
+    index_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    n = len(unique_texts)
+    component = connected_components(n, similar)
+    # Representative = member closest to its component's centroid (sum of member vectors).
+    _, group, sizes = np.unique(component, return_inverse=True, return_counts=True)
+    centroids = np.zeros((len(sizes), vectors.shape[1]), dtype=np.float32)
+    np.add.at(centroids, group, vectors)
+    closeness = np.einsum("ij,ij->i", vectors, centroids[group])
+    by_closeness = np.lexsort((-closeness, group))
+    first_in_group = by_closeness[np.r_[0, np.cumsum(sizes)[:-1]]] if n else by_closeness
+    representative = first_in_group[group]
+    similarity = np.einsum("ij,ij->i", vectors, vectors[representative])
+    split = (similarity < config.threshold) & (representative != np.arange(n))
+    representative[split] = np.flatnonzero(split)
+    similarity[split] = 1.0
+    cluster_s = time.perf_counter() - started
+
+    rep_text = representative[text_codes]
+    rep_row = first_row[rep_text]
+    is_rep_row = rep_row == np.arange(len(activities))
+    match = np.where(is_rep_row, "representative", np.where(rep_text == text_codes, "exact", "near"))
+    lineage = pd.DataFrame(
+        {
+            "activity_id": activities["activity_id"].to_numpy(),
+            "activity": activities["activity"].to_numpy(),
+            "cluster_id": pd.factorize(rep_row)[0],
+            "representative_id": activities["activity_id"].to_numpy()[rep_row],
+            "representative_activity": activities["activity"].to_numpy()[rep_row],
+            "similarity": np.where(rep_text == text_codes, 1.0, similarity[text_codes]).round(4),
+            "match": match,
+        },
+        columns=LINEAGE_COLUMNS,
+    )
+    clusters = int(is_rep_row.sum())
+    report = Dedup_Report(
+        activities=len(activities),
+        unique_texts=n,
+        clusters=clusters,
+        exact_duplicates=int((match == "exact").sum()),
+        near_duplicates=int((match == "near").sum()),
+        split_members=int(split.sum()),
+        candidate_pairs=len(pairs),
+        verified_pairs=len(similar),
+        llm_calls_avoided=len(activities) - clusters,
+        encode_s=encode_s,
+        index_s=index_s,
+        cluster_s=cluster_s,
+    )
+    return lineage, report
+
+
+async def score_deduplicated(
+    activities: pd.DataFrame,
+    dedup_config: Optional[Dedup_Config] = None,
+    config: Optional[Batch_Scoring_Config] = None,
+    scorer: Optional[Scorer] = None,
+) -> Tuple[pd.DataFrame, Batch_Throughput_Report, Dedup_Report]:
+    """
+    Score one representative per near-duplicate cluster and copy its result to the members.
+
+    Returns:
+        (results, throughput, dedup): one row per input activity with the calculator columns
+        plus `cluster_id`, `scored_from` (the representative's `activity_id`), `similarity`
+        and `match`; the throughput report covers the representatives only.
+    """
+    lineage, dedup_report = cluster_activities(activities, dedup_config)
+    representatives = lineage.loc[lineage["match"] == "representative", ["activity_id", "activity"]].reset_index(drop=True)
+    scored, throughput = await score_activities(representatives, config=config, scorer=scorer)
+
+    inherited = [c for c in OUTPUT_COLUMNS if c not in ("activity_id", "activity")]
+    results = lineage.merge(
+        scored[["activity_id"] + inherited].rename(columns={"activity_id": "representative_id"}),
+        on="representative_id",
+        how="left",
+    ).rename(columns={"representative_id": "scored_from"})
+    members = results["match"] != "representative"
+    results.loc[members, ["latency_s", "attempts", "tokens"]] = [0.0, 0, 0]
+    return results[OUTPUT_COLUMNS + ["cluster_id", "scored_from", "similarity", "match"]], throughput, dedup_report
+
+
+# Synthetic inventory for `benchmark_deduplication`: distinct base activities reworded per team.
+_VERBS = ["Reconcile", "Review", "Prepare", "Approve", "Code", "Validate", "Draft", "Triage", "Summarize", "Audit", "Schedule", "Report on"]
+_OBJECTS = [
+    "vendor invoices", "expense reports", "journal entries", "payroll changes", "employee queries", "contract amendments",
+    "purchase orders", "bank statements", "policy exceptions", "access requests", "audit findings", "travel bookings",
+    "benefit enrollments", "tax filings", "supplier onboarding forms", "board materials", "lease agreements", "headcount plans",
+]
+_QUALIFIERS = ["monthly", "weekly", "daily", "quarterly", "ad hoc", "year-end"]
+_CHANNELS = ["in SAP", "in Workday", "in Coupa", "from the shared inbox", "in Excel", "in ServiceNow"]
+_REWORDINGS = [
+    lambda s: s,
+    lambda s: s.lower(),
+    lambda s: s + " for the team",
+    lambda s: s.replace(" and ", " & "),
+    lambda s: "Perform: " + s,
+    lambda s: s + ".",
+    lambda s: s.replace("Review", "Reviewing").replace("Prepare", "Preparing").replace("Reconcile", "Reconciling"),
+]
+
+
+def synthetic_inventory(rows: int, seed: int = 0) -> Tuple[pd.DataFrame, np.ndarray]:
+    """`rows` activities drawn from base tasks with per-team rewording; returns (activities, base id per row)."""
+    rng = np.random.default_rng(seed)
+    bases = [f"{q.capitalize()} {v.lower()} {o} {c}" for v in _VERBS for o in _OBJECTS for q in _QUALIFIERS for c in _CHANNELS]
+    base_ids = rng.integers(0, len(bases), rows)
+    variants = rng.integers(0, len(_REWORDINGS), rows)
+    texts = [_REWORDINGS[v](bases[b]) for b, v in zip(base_ids, variants)]
+    teams = rng.integers(0, 400, rows)
+    texts = [f"{t} (team {team})" if k % 3 == 0 else t for k, (t, team) in enumerate(zip(texts, teams))]
+    frame = pd.DataFrame({"activity_id": [f"A{i}" for i in range(rows)], "activity": texts})
+    return frame, base_ids
+
+
+def benchmark_deduplication(rows: int = 100_000, config: Optional[Dedup_Config] = None, sample: int = 3_000, seed: int = 0) -> dict:
+    """
+    Cluster a synthetic inventory and compare the LSH candidates with exact all-pairs search
+    on a sample of distinct texts.
+
+    Returns:
+        The `Dedup_Report` fields plus `purity` (members whose representative rewords the same
+        base task) and `pair_recall_sample` (share of exact above-threshold pairs the index found).
+    """
+    config = config or Dedup_Config()
+    activities, base_ids = synthetic_inventory(rows, seed)
+    lineage, report = cluster_activities(activities, config)
+    rep_index = lineage["representative_id"].str[1:].astype(int).to_numpy()
+    purity = float((base_ids[rep_index] == base_ids).mean())
+
+    texts = activities["activity"].map(normalize_text).drop_duplicates().tolist()
+    rng = np.random.default_rng(seed)
+    picked = [texts[i] for i in rng.choice(len(texts), min(sample, len(texts)), replace=False)]
+    vectors = _encode(picked, config)
+    exact = np.argwhere(np.triu(vectors @ vectors.T, k=1) >= config.threshold)
+    lsh = Random_Hyperplane_LSH(vectors.shape[1], config.lsh_tables, config.lsh_bits, config.seed)
+    found = {tuple(p) for p in lsh.candidate_pairs(lsh.keys(vectors), config.max_bucket_size).tolist()}
+    recall = float(np.mean([tuple(p) in found for p in exact.tolist()])) if len(exact) else 1.0
+    return {**report.model_dump(), "purity": purity, "pair_recall_sample": recall}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Near-duplicate clustering of activity inventories ahead of scoring.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cluster = commands.add_parser("cluster", help="Write each activity's cluster and representative")
+    cluster.add_argument("input", help="CSV, Excel or Parquet file with one activity per row")
+    cluster.add_argument("output", help="Destination .parquet, .csv or .xlsx lineage file")
+    cluster.add_argument("--text-column", default="activity")
+    cluster.add_argument("--id-column", default=None)
+    cluster.add_argument("--threshold", type=float, default=0.9)
+    cluster.add_argument("--encoder", default="hashing-512")
+
+    benchmark = commands.add_parser("benchmark", help="Cluster a synthetic inventory and check recall/purity")
+    benchmark.add_argument("--rows", type=int, default=100_000)
+    benchmark.add_argument("--threshold", type=float, default=0.9)
+    benchmark.add_argument("--encoder", default="hashing-512")
+
+    args = parser.parse_args(argv)
+    config = Dedup_Config(threshold=args.threshold, encoder=args.encoder)
+    if args.command == "cluster":
+        activities = load_activities(args.input, args.text_column, args.id_column)
+        lineage, report = cluster_activities(activities, config)
+        save_results(lineage, args.output)
+        print(report.model_dump_json(indent=2))
+    elif args.command == "benchmark":
+        for key, value in benchmark_deduplication(args.rows, config).items():
+            print(f"{key}: {value:.4f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
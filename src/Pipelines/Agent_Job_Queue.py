@@ -0,0 +1,523 @@
+import argparse
+import asyncio
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Literal, Optional
+
+import pandas as pd
+from pydantic import BaseModel
+
+# Import Necessary Libraries
+from src.Agents import Agent_Registry
+
+DEFAULT_QUEUE_PATH = os.getenv("AGENT_JOB_QUEUE_PATH", "Data/Intermediate/agent_jobs.sqlite")
+
+# Agents that can be queued (`Agent_Registry` names).
+JOB_AGENTS = list(Agent_Registry.AGENTS)
+
+Job_Status = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class Job(BaseModel):
+    id: int
+    batch: str
+    agent: str
+    model: str
+    prompt: str
+    priority: int
+    "Higher runs first; ties run in submission order"
+    status: Job_Status
+    attempts: int
+    max_attempts: int
+    not_before: float
+    "Earliest time the job may be claimed (retry backoff)"
+    cancel_requested: bool
+    output: Optional[str] = None
+    error: Optional[str] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+class Worker_Config(BaseModel):
+    concurrency: int = 8
+    "Jobs running at the same time in this worker process"
+    model_limits: Dict[str, int] = {}
+    "Per-model cap on running jobs (e.g. {'gpt-5': 4}); models not listed are only bounded by `concurrency`"
+    lease_s: float = 1800.0
+    "A running job whose worker stops heartbeating for this long is requeued"
+    job_timeout_s: float = 1800.0
+    poll_interval_s: float = 1.0
+    retry_base_s: float = 30.0
+    "Delay before the first retry; doubles per attempt"
+    retry_max_s: float = 1800.0
+    drain: bool = False
+    "Exit once no queued or running jobs are left"
+
+
+class Job_Queue:
+    """
+    Durable priority queue of agent jobs in a SQLite file (WAL).
+
+    Claims are atomic (`BEGIN IMMEDIATE`), so several worker processes may share a queue.
+    A running job holds a lease that its worker renews; jobs whose lease lapses (e.g. the
+    worker crashed) go back to the queue until they run out of attempts. Results are only
+    recorded by the worker that holds the job, so a worker whose lease was taken over cannot
+    overwrite the new owner's result.
+    """
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                batch TEXT NOT NULL,
+                agent TEXT NOT NULL,
+                model TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 3,
+                not_before REAL NOT NULL DEFAULT 0,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_expires REAL,
+                output TEXT,
+                error TEXT,
+                input_tokens INTEGER NOT NULL DEFAULT 0,
+                output_tokens INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, priority DESC, id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_batch ON jobs (batch);
+            """
+        )
+
+    def _execute(self, sql: str, params=()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def submit(
+        self,
+        agent: str,
+        prompts: List[str],
+        model: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: int = 3,
+        batch: Optional[str] = None,
+    ) -> str:
+        """
+        Queue one job per prompt.
+
+        Args:
+            agent: Key of `JOB_AGENTS`.
+            prompts: Prompts to run.
+            model: Model the agent uses, for per-model limits. Defaults to `LLM_MODEL`.
+            priority: Higher runs first.
+            max_attempts: Attempts per job before it is marked failed.
+            batch: Batch name for monitoring and cancelling; generated when omitted.
+
+        Returns:
+            The batch name.
+        """
+        if agent not in JOB_AGENTS:
+            raise ValueError(f"Unknown agent {agent!r}; expected one of {sorted(JOB_AGENTS)}")
+        batch = batch or f"{agent}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        model = model or os.getenv("LLM_MODEL") or "default"
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO jobs (batch, agent, model, prompt, priority, max_attempts, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(batch, agent, model, prompt, priority, max_attempts, now) for prompt in prompts],
+            )
+            self._conn.execute("COMMIT")
+        return batch
+
+    def claim(
+        self,
+        worker: str,
+        limit: int,
+        lease_s: float,
+        models: Optional[List[str]] = None,
+        model_caps: Optional[Dict[str, int]] = None,
+    ) -> List[Job]:
+        """
+        Atomically move up to `limit` runnable jobs (optionally only for `models`) to running.
+
+        `model_caps` bounds how many jobs of each listed model this claim may take; models
+        not listed are bounded only by `limit`.
+        """
+        if limit <= 0 or models == []:
+            return []
+        now = time.time()
+        model_filter = f" AND model IN ({','.join('?' * len(models))})" if models else ""
+        caps = model_caps or {}
+        # Rank each model's runnable jobs in claim order, and keep only the first `cap` of a capped model.
+        cap_case = "CASE model " + "WHEN ? THEN ? " * len(caps) + "ELSE ? END" if caps else "?"
+        cap_params = [value for model, cap in caps.items() for value in (model, max(0, cap))] + [limit]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id FROM ("
+                    "SELECT id, model, priority, ROW_NUMBER() OVER (PARTITION BY model ORDER BY priority DESC, id) AS model_rank "
+                    "FROM jobs WHERE status = 'queued' AND not_before <= ?"
+                    + model_filter
+                    + f") WHERE model_rank <= {cap_case} ORDER BY priority DESC, id LIMIT ?",
+                    (now, *(models or []), *cap_params, limit),
+                ).fetchall()
+                ids = [row["id"] for row in rows]
+                if ids:
+                    self._conn.execute(
+                        f"UPDATE jobs SET status = 'running', worker = ?, lease_expires = ?, attempts = attempts + 1, "
+                        f"started_at = ? WHERE id IN ({','.join('?' * len(ids))})",
+                        (worker, now + lease_s, now, *ids),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            if not ids:
+                return []
+            claimed = self._conn.execute(
+                f"SELECT * FROM jobs WHERE id IN ({','.join('?' * len(ids))}) ORDER BY priority DESC, id", ids
+            ).fetchall()
+        return [_job(row) for row in claimed]
+
+    def heartbeat(self, worker: str, job_ids: List[int], lease_s: float) -> List[int]:
+        """Renew `worker`'s leases; returns the ids among them whose cancellation was requested."""
+        if not job_ids:
+            return []
+        marks = ",".join("?" * len(job_ids))
+        self._execute(
+            f"UPDATE jobs SET lease_expires = ? WHERE id IN ({marks}) AND status = 'running' AND worker = ?",
+            (time.time() + lease_s, *job_ids, worker),
+        )
+        rows = self._execute(f"SELECT id FROM jobs WHERE id IN ({marks}) AND cancel_requested = 1", job_ids)
+        return [row["id"] for row in rows]
+
+    def complete(self, job_id: int, worker: str, output: str, input_tokens: int = 0, output_tokens: int = 0) -> None:
+        self._execute(
+            "UPDATE jobs SET status = 'succeeded', output = ?, error = NULL, input_tokens = ?, output_tokens = ?, "
+            "finished_at = ?, lease_expires = NULL WHERE id = ? AND status = 'running' AND worker = ?",
+            (output, input_tokens, output_tokens, time.time(), job_id, worker),
+        )
+
+    def fail(self, job_id: int, worker: str, error: str, retry_delay_s: float) -> bool:
+        """Record a failed attempt; requeues with a delay if attempts remain. Returns True if requeued."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts, max_attempts, cancel_requested FROM jobs WHERE id = ? AND status = 'running' AND worker = ?",
+                (job_id, worker),
+            ).fetchone()
+            if row is None:
+                return False
+            retry = row["attempts"] < row["max_attempts"] and not row["cancel_requested"]
+            if retry:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', error = ?, not_before = ?, worker = NULL, lease_expires = NULL WHERE id = ?",
+                    (error, time.time() + retry_delay_s, job_id),
+                )
+            else:
+                status = "cancelled" if row["cancel_requested"] else "failed"
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_expires = NULL WHERE id = ?",
+                    (status, error, time.time(), job_id),
+                )
+        return retry
+
+    def cancel(self, job_ids: Optional[List[int]] = None, batch: Optional[str] = None) -> int:
+        """Cancel queued jobs now and ask workers to stop running ones. Returns the number of jobs affected."""
+        if job_ids:
+            where, params = f"id IN ({','.join('?' * len(job_ids))})", tuple(job_ids)
+        elif batch:
+            where, params = "batch = ?", (batch,)
+        else:
+            raise ValueError("Give job ids or a batch to cancel")
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            queued = self._conn.execute(
+                f"UPDATE jobs SET status = 'cancelled', cancel_requested = 1, finished_at = ? WHERE {where} AND status = 'queued'",
+                (time.time(), *params),
+            ).rowcount
+            running = self._conn.execute(
+                f"UPDATE jobs SET cancel_requested = 1 WHERE {where} AND status = 'running'", params
+            ).rowcount
+            self._conn.execute("COMMIT")
+        return queued + running
+
+    def release(self, job_id: int, worker: str) -> None:
+        """Put a running job back in the queue without counting the attempt (worker shutdown)."""
+        self._execute(
+            "UPDATE jobs SET status = 'queued', attempts = MAX(attempts - 1, 0), worker = NULL, lease_expires = NULL "
+            "WHERE id = ? AND status = 'running' AND worker = ?",
+            (job_id, worker),
+        )
+
+    def queued_models(self) -> List[str]:
+        return [row["model"] for row in self._execute("SELECT DISTINCT model FROM jobs WHERE status = 'queued'")]
+
+    def mark_cancelled(self, job_id: int, worker: str) -> None:
+        self._execute(
+            "UPDATE jobs SET status = 'cancelled', finished_at = ?, lease_expires = NULL WHERE id = ? AND status = 'running' AND worker = ?",
+            (time.time(), job_id, worker),
+        )
+
+    def requeue_expired(self) -> int:
+        """
+        Return running jobs with a lapsed lease to the queue (their attempt still counts).
+
+        Jobs that have used all their attempts (e.g. a prompt that keeps crashing or hanging
+        its worker) are marked failed instead, and cancelled ones are marked cancelled.
+        Returns the number of jobs requeued.
+        """
+        now = time.time()
+        expired = "status = 'running' AND lease_expires < ?"
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE jobs SET status = CASE WHEN cancel_requested THEN 'cancelled' ELSE 'failed' END, "
+                    "error = COALESCE(error || '; ', '') || 'Lease expired after ' || attempts || ' attempt(s)', "
+                    f"worker = NULL, lease_expires = NULL, finished_at = ? WHERE {expired} "
+                    "AND (cancel_requested OR attempts >= max_attempts)",
+                    (now, now),
+                )
+                requeued = self._conn.execute(
+                    f"UPDATE jobs SET status = 'queued', worker = NULL, lease_expires = NULL WHERE {expired}", (now,)
+                ).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return requeued
+
+    def status(self, batch: Optional[str] = None) -> pd.DataFrame:
+        """Job counts per batch and status, with token totals."""
+        where, params = ("WHERE batch = ?", (batch,)) if batch else ("", ())
+        rows = self._execute(
+            f"SELECT batch, status, COUNT(*) AS jobs, SUM(input_tokens) AS input_tokens, SUM(output_tokens) AS output_tokens "
+            f"FROM jobs {where} GROUP BY batch, status ORDER BY batch, status",
+            params,
+        )
+        return pd.DataFrame([dict(row) for row in rows], columns=["batch", "status", "jobs", "input_tokens", "output_tokens"])
+
+    def pending(self) -> int:
+        (row,) = self._execute("SELECT COUNT(*) AS n FROM jobs WHERE status IN ('queued', 'running')")
+        return row["n"]
+
+    def jobs(self, batch: Optional[str] = None, status: Optional[str] = None) -> List[Job]:
+        clauses, params = [], []
+        if batch:
+            clauses.append("batch = ?")
+            params.append(batch)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return [_job(row) for row in self._execute(f"SELECT * FROM jobs {where} ORDER BY id", params)]
+
+    def results(self, batch: Optional[str] = None) -> pd.DataFrame:
+        """Finished jobs as a DataFrame (one row per job)."""
+        frame = pd.DataFrame([job.model_dump() for job in self.jobs(batch) if job.status in ("succeeded", "failed", "cancelled")])
+        return frame
+
+
+def _job(row: sqlite3.Row) -> Job:
+    data = dict(row)
+    data["cancel_requested"] = bool(data["cancel_requested"])
+    return Job(**{key: value for key, value in data.items() if key in Job.model_fields})
+
+
+class Agent_Worker_Pool:
+    """
+    Async worker pool draining a `Job_Queue`.
+
+    A dispatcher claims jobs only when a slot is free (so queued work stays in SQLite
+    rather than in memory) and only for models below their `model_limits` cap. Each job
+    runs `Runner.run` with a timeout; failures are retried with exponential backoff.
+    Leases are renewed every poll, and cancellation requests stop running jobs. With a
+    `results_store`, calculator and scenario tool results of finished jobs are also
+    written to it (tagged with the job's batch).
+    """
+
+    def __init__(self, queue: Job_Queue, config: Optional[Worker_Config] = None, results_store=None):
+        self.queue = queue
+        self.config = config or Worker_Config()
+        self.results_store = results_store
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._running: Dict[int, asyncio.Task] = {}
+        self._running_models: Dict[int, str] = {}
+        self._cancelled: set = set()
+        self._agents: Dict[str, object] = {}
+        self._stop = asyncio.Event()
+
+    def _agent(self, name: str):
+        if name not in self._agents:
+            self._agents[name] = Agent_Registry.get(name)
+        return self._agents[name]
+
+    def _model_capacity(self) -> Dict[str, int]:
+        """Free slots per capped model (0 when it is at its limit); uncapped models are not listed."""
+        in_use: Dict[str, int] = {}
+        for model in self._running_models.values():
+            in_use[model] = in_use.get(model, 0) + 1
+        return {model: max(0, limit - in_use.get(model, 0)) for model, limit in self.config.model_limits.items()}
+
+    async def _run_job(self, job: Job) -> None:
+        from agents import Runner
+
+        from src.Agents.Prompt_Assembly import prompt_run_config
+
+        try:
+            run = Runner.run(self._agent(job.agent), job.prompt, run_config=prompt_run_config())
+            result = await asyncio.wait_for(run, timeout=self.config.job_timeout_s)
+            usage = result.context_wrapper.usage
+            if self.results_store is not None:
+                await asyncio.to_thread(self.results_store.record_run_items, result.new_items, "job", job.batch)
+            await asyncio.to_thread(
+                self.queue.complete, job.id, self.worker_id, str(result.final_output), usage.input_tokens, usage.output_tokens
+            )
+        except asyncio.CancelledError:
+            if job.id in self._cancelled:
+                await asyncio.to_thread(self.queue.mark_cancelled, job.id, self.worker_id)
+            else:
+                await asyncio.to_thread(self.queue.release, job.id, self.worker_id)
+        except Exception as e:
+            delay = min(self.config.retry_max_s, self.config.retry_base_s * 2 ** (job.attempts - 1))
+            await asyncio.to_thread(self.queue.fail, job.id, self.worker_id, f"{type(e).__name__}: {e}", delay)
+        finally:
+            self._running.pop(job.id, None)
+            self._running_models.pop(job.id, None)
+            self._cancelled.discard(job.id)
+
+    async def run(self) -> None:
+        """Process jobs until `stop()` is called (or, with `drain`, until the queue is empty)."""
+        while not self._stop.is_set():
+            await asyncio.to_thread(self.queue.requeue_expired)
+            cancelled = await asyncio.to_thread(self.queue.heartbeat, self.worker_id, list(self._running), self.config.lease_s)
+            for job_id in cancelled:
+                task = self._running.get(job_id)
+                if task is not None and job_id not in self._cancelled:
+                    self._cancelled.add(job_id)
+                    task.cancel()
+
+            free = self.config.concurrency - len(self._running)
+            jobs = await asyncio.to_thread(
+                self.queue.claim, self.worker_id, free, self.config.lease_s, None, self._model_capacity()
+            )
+            for job in jobs:
+                self._running_models[job.id] = job.model
+                self._running[job.id] = asyncio.create_task(self._run_job(job))
+
+            if self.config.drain and not self._running and await asyncio.to_thread(self.queue.pending) == 0:
+                break
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.config.poll_interval_s)
+            except asyncio.TimeoutError:
+                pass
+
+        for task in list(self._running.values()):
+            task.cancel()
+        if self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Durable job queue for running agents over portfolios.")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_PATH, help="SQLite queue file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    submit = commands.add_parser("submit", help="Queue prompts for an agent")
+    submit.add_argument("--agent", choices=JOB_AGENTS, default="GenAI_Use_Case_Agent")
+    submit.add_argument("--prompt", action="append", help="Prompt to queue (repeatable)")
+    submit.add_argument("--input", help="CSV, Excel or Parquet file with one prompt per row")
+    submit.add_argument("--text-column", default="activity")
+    submit.add_argument("--priority", type=int, default=0)
+    submit.add_argument("--max-attempts", type=int, default=3)
+    submit.add_argument("--batch", default=None)
+    submit.add_argument("--model", default=None, help="Model label for per-model limits (default: LLM_MODEL)")
+
+    work = commands.add_parser("work", help="Run a worker pool")
+    work.add_argument("--concurrency", type=int, default=8)
+    work.add_argument("--model-limit", action="append", default=[], metavar="MODEL=N")
+    work.add_argument("--job-timeout-s", type=float, default=1800.0)
+    work.add_argument("--drain", action="store_true", help="Exit when the queue is empty")
+    work.add_argument("--mock", action="store_true", help="Run against the local mock Responses API")
+    work.add_argument("--store", nargs="?", const="", default=None, metavar="PATH", help="Also write tool results to the assessment store (default path if no PATH)")
+
+    status = commands.add_parser("status", help="Job counts per batch and status")
+    status.add_argument("--batch", default=None)
+
+    cancel = commands.add_parser("cancel", help="Cancel jobs")
+    cancel.add_argument("ids", nargs="*", type=int)
+    cancel.add_argument("--batch", default=None)
+
+    results = commands.add_parser("results", help="Export finished jobs")
+    results.add_argument("output", help="Destination .parquet, .csv or .xlsx file")
+    results.add_argument("--batch", default=None)
+
+    args = parser.parse_args(argv)
+    from dotenv import load_dotenv
+    load_dotenv()
+    queue = Job_Queue(args.queue)
+
+    if args.command == "submit":
+        prompts = list(args.prompt or [])
+        if args.input:
+            from src.Pipelines.Agentic_Calculator_Batch import load_activities
+            prompts += load_activities(args.input, args.text_column)["activity"].tolist()
+        if not prompts:
+            parser.error("submit needs --prompt or --input")
+        batch = queue.submit(args.agent, prompts, args.model, args.priority, args.max_attempts, args.batch)
+        print(f"Queued {len(prompts)} job(s) in batch {batch}")
+    elif args.command == "work":
+        limits = {m: int(n) for m, n in (item.split("=", 1) for item in args.model_limit)}
+        config = Worker_Config(concurrency=args.concurrency, model_limits=limits, job_timeout_s=args.job_timeout_s, drain=args.drain)
+        results_store = None
+        if args.store is not None:
+            from src.Pipelines.Assessment_Store import DEFAULT_STORE_PATH, Assessment_Store
+            results_store = Assessment_Store(args.store or DEFAULT_STORE_PATH)
+        if args.mock:
+            from src.Benchmarks.Agent_Benchmark import use_mock_server
+            from src.Benchmarks.Mock_Responses_Server import Mock_Responses_Server
+            with Mock_Responses_Server() as server:
+                use_mock_server(server)
+                asyncio.run(Agent_Worker_Pool(queue, config, results_store).run())
+        else:
+            asyncio.run(Agent_Worker_Pool(queue, config, results_store).run())
+        print(queue.status().to_string(index=False))
+    elif args.command == "status":
+        print(queue.status(args.batch).to_string(index=False))
+    elif args.command == "cancel":
+        print(f"Cancelled {queue.cancel(args.ids, args.batch)} job(s)")
+    elif args.command == "results":
+        from src.Pipelines.Agentic_Calculator_Batch import save_results
+        frame = queue.results(args.batch)
+        save_results(frame, args.output)
+        print(f"Wrote {len(frame)} job(s) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
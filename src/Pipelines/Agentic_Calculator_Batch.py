@@ -0,0 +1,435 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+import pandas as pd
+from pydantic import BaseModel
+
+# Import Necessary Libraries
+from agents import Runner
+from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+from src.Tools.Agentic_Calculator_Cache import get_default_cache
+from src.Tools.Agentic_Calculator_Tool import (
+    AGENTIC_CALCULATOR_TOOL_PROMPT,
+    Agentic_Calculator_Tool,
+    Agentic_Calculator_Tool_Output,
+)
+
+# A scorer takes one activity description and returns the typed calculator output
+# together with the number of tokens the call consumed (0 if unknown).
+Scorer = Callable[[str], Awaitable["Scored_Activity"]]
+
+OUTPUT_COLUMNS = [
+    "activity_id",
+    "activity",
+    "score",
+    "reasoning",
+    "hallucination_score",
+    "latency_s",
+    "attempts",
+    "tokens",
+    "error",
+]
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    True for upstream failures worth retrying: rate limits, timeouts, dropped connections
+    and 5xx responses. Anything else (validation errors, 4xx, `ModelBehaviorError`) fails
+    the same way on every attempt.
+    """
+    if isinstance(error, (RateLimitError, APITimeoutError, APIConnectionError, TimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+class Batch_Scoring_Config(BaseModel):
+    concurrency: int = 8
+    "Maximum number of activities scored at the same time"
+    requests_per_minute: int = 500
+    "Upstream request-rate budget shared by all workers"
+    tokens_per_minute: int = 2_000_000
+    "Upstream token-rate budget shared by all workers"
+    expected_completion_tokens: int = 1_500
+    "Completion tokens reserved per call before the real usage is known"
+    max_retries: int = 5
+    "Retries of transient errors per activity before it is recorded as failed; other errors fail at once"
+    backoff_base_s: float = 1.0
+    "First retry delay; doubles on every attempt (with jitter)"
+    backoff_max_s: float = 60.0
+    "Upper bound for a single retry delay"
+    checkpoint_path: Optional[str] = None
+    "JSONL file that completed rows are appended to; existing rows are skipped on resume"
+
+
+class Scored_Activity(BaseModel):
+    output: Agentic_Calculator_Tool_Output
+    tokens: int = 0
+
+
+class Batch_Throughput_Report(BaseModel):
+    total: int
+    completed: int
+    failed: int
+    skipped_from_checkpoint: int
+    concurrency: int
+    elapsed_s: float
+    activities_per_s: float
+    tokens_per_s: float
+    latency_p50_s: float
+    latency_p95_s: float
+    retries: int
+
+
+class Rate_Limiter:
+    """
+    Async token bucket enforcing both a request-rate and a token-rate budget.
+
+    Both buckets refill continuously and start full, so short bursts up to the
+    per-minute budget are allowed while the long-run rate stays bounded.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.request_capacity = float(requests_per_minute)
+        self.token_capacity = float(tokens_per_minute)
+        self.requests = self.request_capacity
+        self.tokens = self.token_capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+        self.requests = min(self.request_capacity, self.requests + elapsed * self.request_capacity / 60.0)
+        self.tokens = min(self.token_capacity, self.tokens + elapsed * self.token_capacity / 60.0)
+
+    async def acquire(self, tokens: int) -> None:
+        # A single request larger than the bucket can never fit; clamp so it waits for a full bucket instead.
+        tokens = min(float(tokens), self.token_capacity)
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.requests >= 1 and self.tokens >= tokens:
+                    self.requests -= 1
+                    self.tokens -= tokens
+                    return
+                request_wait = max(0.0, (1 - self.requests) * 60.0 / self.request_capacity)
+                token_wait = max(0.0, (tokens - self.tokens) * 60.0 / self.token_capacity)
+                await asyncio.sleep(max(request_wait, token_wait, 0.01))
+
+    async def settle(self, reserved: int, actual: int) -> None:
+        """Charge (or refund) the difference between the reserved and the real token usage."""
+        if actual <= 0:
+            return
+        async with self.lock:
+            self._refill()
+            self.tokens = min(self.token_capacity, self.tokens - (actual - reserved))
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Uses tiktoken when it is installed and falls back to a 4-characters-per-token heuristic.
+    """
+    encoding = _encoding()
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text))
+
+
+def load_activities(
+    source: Union[pd.DataFrame, str, Path],
+    text_column: str = "activity",
+    id_column: Optional[str] = None,
+    sheet_name: Union[str, int] = 0,
+) -> pd.DataFrame:
+    """
+    Load an activity inventory into a two-column DataFrame (`activity_id`, `activity`).
+
+    Args:
+        source: A DataFrame, or a path to a .csv/.xlsx/.xls/.xlsm/.parquet file.
+        text_column: Column holding the activity description.
+        id_column: Column holding a stable activity identifier. Defaults to the row number.
+        sheet_name: Sheet to read for Excel workbooks.
+
+    Returns:
+        DataFrame with `activity_id` (str) and `activity` (str) columns, empty descriptions removed.
+
+    Raises:
+        FileNotFoundError: If the source path does not exist.
+        ValueError: If the file type is unsupported or a column is missing.
+    """
+    if isinstance(source, pd.DataFrame):
+        df = source
+    else:
+        path = Path(source)
+        if not path.exists():
+            raise FileNotFoundError(f"Activity file not found: {path}")
+        suffix = path.suffix.lower()
+        if suffix == ".csv":
+            df = pd.read_csv(path)
+        elif suffix in (".xlsx", ".xls", ".xlsm"):
+            df = pd.read_excel(path, sheet_name=sheet_name)
+        elif suffix == ".parquet":
+            df = pd.read_parquet(path)
+        else:
+            raise ValueError(f"Unsupported activity file type: {suffix}")
+
+    if text_column not in df.columns:
+        raise ValueError(f"Column '{text_column}' not found; available columns: {list(df.columns)}")
+    if id_column is not None and id_column not in df.columns:
+        raise ValueError(f"Column '{id_column}' not found; available columns: {list(df.columns)}")
+
+    ids = df[id_column] if id_column is not None else pd.Series(range(len(df)), index=df.index)
+    activities = pd.DataFrame({"activity_id": ids.astype(str), "activity": df[text_column].astype("string")})
+    activities = activities.dropna(subset=["activity"])
+    activities = activities[activities["activity"].str.strip() != ""]
+    return activities.reset_index(drop=True)
+
+
+async def run_agentic_calculator(activity: str) -> Scored_Activity:
+    """Default scorer: one `Runner.run` of `Agentic_Calculator_Tool`."""
+    result = await Runner.run(Agentic_Calculator_Tool, activity)
+    return Scored_Activity(
+        output=result.final_output_as(Agentic_Calculator_Tool_Output),
+        tokens=result.context_wrapper.usage.total_tokens,
+    )
+
+
+async def run_cached_agentic_calculator(activity: str) -> Scored_Activity:
+    """Scorer that goes through the shared `Agentic_Calculator_Cache` (token usage is not tracked)."""
+    return Scored_Activity(output=await get_default_cache().get_or_compute(activity))
+
+
+def _read_checkpoint(path: Optional[str]) -> Dict[str, dict]:
+    if not path or not os.path.exists(path):
+        return {}
+    done: Dict[str, dict] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn last line from an interrupted run; the activity is simply re-scored.
+                continue
+            if row.get("error") is None:
+                done[row["activity_id"]] = row
+    return done
+
+
+async def score_activities(
+    activities: pd.DataFrame,
+    config: Optional[Batch_Scoring_Config] = None,
+    scorer: Optional[Scorer] = None,
+) -> tuple[pd.DataFrame, Batch_Throughput_Report]:
+    """
+    Score an activity inventory concurrently with `Agentic_Calculator_Tool`.
+
+    Args:
+        activities: Output of `load_activities` (`activity_id`, `activity` columns).
+        config: Concurrency, rate-limit, retry and checkpoint settings.
+        scorer: Coroutine scoring one activity. Defaults to `run_agentic_calculator`.
+
+    Returns:
+        (results, report): one row per activity in input order with the typed calculator
+        fields as columns, and a throughput report for sizing concurrency.
+    """
+    config = config or Batch_Scoring_Config()
+    scorer = scorer or run_agentic_calculator
+    limiter = Rate_Limiter(config.requests_per_minute, config.tokens_per_minute)
+    prompt_tokens = count_tokens(AGENTIC_CALCULATOR_TOOL_PROMPT)
+
+    done = _read_checkpoint(config.checkpoint_path)
+    pending = [(r.activity_id, r.activity) for r in activities.itertuples(index=False) if r.activity_id not in done]
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in pending:
+        queue.put_nowait(item)
+
+    rows: Dict[str, dict] = dict(done)
+    latencies: List[float] = []
+    counters = {"retries": 0, "tokens": 0}
+    checkpoint = open(config.checkpoint_path, "a", encoding="utf-8") if config.checkpoint_path else None
+
+    async def score_one(activity_id: str, activity: str) -> dict:
+        reserved = prompt_tokens + count_tokens(activity) + config.expected_completion_tokens
+        started = time.perf_counter()
+        last_error: Optional[str] = None
+        for attempt in range(1, config.max_retries + 2):
+            await limiter.acquire(reserved)
+            try:
+                scored = await scorer(activity)
+            except Exception as e:
+                last_error = f"{type(e).__name__}: {e}"
+                if attempt > config.max_retries or not is_transient(e):
+                    break
+                counters["retries"] += 1
+                delay = min(config.backoff_max_s, config.backoff_base_s * 2 ** (attempt - 1))
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                continue
+            await limiter.settle(reserved, scored.tokens)
+            counters["tokens"] += scored.tokens
+            latency = time.perf_counter() - started
+            latencies.append(latency)
+            return {
+                "activity_id": activity_id,
+                "activity": activity,
+                **scored.output.model_dump(),
+                "latency_s": latency,
+                "attempts": attempt,
+                "tokens": scored.tokens,
+                "error": None,
+            }
+        return {
+            "activity_id": activity_id,
+            "activity": activity,
+            "score": None,
+            "reasoning": None,
+            "hallucination_score": None,
+            "latency_s": time.perf_counter() - started,
+            "attempts": attempt,
+            "tokens": 0,
+            "error": last_error,
+        }
+
+    async def worker() -> None:
+        while True:
+            try:
+                activity_id, activity = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            row = await score_one(activity_id, activity)
+            rows[activity_id] = row
+            if checkpoint is not None:
+                checkpoint.write(json.dumps(row, ensure_ascii=False) + "\n")
+                checkpoint.flush()
+
+    started = time.perf_counter()
+    try:
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, min(config.concurrency, len(pending))))]
+        await asyncio.gather(*workers)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    elapsed = time.perf_counter() - started
+
+    results = pd.DataFrame(
+        [rows[a] for a in activities["activity_id"] if a in rows], columns=OUTPUT_COLUMNS
+    )
+    failed = int(results["error"].notna().sum())
+    scored_now = len(pending) - failed
+    latency_series = pd.Series(latencies, dtype="float64")
+    report = Batch_Throughput_Report(
+        total=len(activities),
+        completed=len(results) - failed,
+        failed=failed,
+        skipped_from_checkpoint=len(activities) - len(pending),
+        concurrency=config.concurrency,
+        elapsed_s=elapsed,
+        activities_per_s=scored_now / elapsed if elapsed > 0 else 0.0,
+        tokens_per_s=counters["tokens"] / elapsed if elapsed > 0 else 0.0,
+        latency_p50_s=float(latency_series.quantile(0.5)) if latencies else 0.0,
+        latency_p95_s=float(latency_series.quantile(0.95)) if latencies else 0.0,
+        retries=counters["retries"],
+    )
+    return results, report
+
+
+def run_batch_scoring(
+    source: Union[pd.DataFrame, str, Path],
+    text_column: str = "activity",
+    id_column: Optional[str] = None,
+    config: Optional[Batch_Scoring_Config] = None,
+    scorer: Optional[Scorer] = None,
+) -> tuple[pd.DataFrame, Batch_Throughput_Report]:
+    """Synchronous convenience wrapper around `load_activities` + `score_activities`."""
+    activities = load_activities(source, text_column=text_column, id_column=id_column)
+    return asyncio.run(score_activities(activities, config=config, scorer=scorer))
+
+
+def save_results(results: pd.DataFrame, output_path: Union[str, Path]) -> Path:
+    """Write scored rows to .parquet, .csv or .xlsx based on the file extension."""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = output_path.suffix.lower()
+    if suffix == ".parquet":
+        results.to_parquet(output_path, index=False)
+    elif suffix == ".csv":
+        results.to_csv(output_path, index=False)
+    elif suffix == ".xlsx":
+        results.to_excel(output_path, index=False)
+    else:
+        raise ValueError(f"Unsupported output file type: {suffix}")
+    return output_path
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Score an activity inventory with Agentic_Calculator_Tool.")
+    parser.add_argument("input", help="CSV, Excel or Parquet file with one activity per row")
+    parser.add_argument("output", help="Destination .parquet, .csv or .xlsx file")
+    parser.add_argument("--text-column", default="activity")
+    parser.add_argument("--id-column", default=None)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rpm", type=int, default=500, help="Requests per minute")
+    parser.add_argument("--tpm", type=int, default=2_000_000, help="Tokens per minute")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--checkpoint", default=None, help="JSONL checkpoint (default: <output>.checkpoint.jsonl)")
+    parser.add_argument("--cache", action="store_true", help="Reuse results from the Agentic_Calculator_Tool cache")
+    parser.add_argument("--dedupe", nargs="?", type=float, const=0.9, default=None, metavar="THRESHOLD", help="Score one representative per near-duplicate cluster (cosine >= THRESHOLD, default 0.9)")
+    parser.add_argument("--store", nargs="?", const="", default=None, metavar="PATH", help="Also append results to the assessment store (default path if no PATH)")
+    parser.add_argument("--function", default=None, help="Function label for stored rows (e.g. Finance)")
+    parser.add_argument("--team", default=None, help="Team label for stored rows")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    config = Batch_Scoring_Config(
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        max_retries=args.max_retries,
+        checkpoint_path=args.checkpoint or f"{args.output}.checkpoint.jsonl",
+    )
+    scorer = run_cached_agentic_calculator if args.cache else run_agentic_calculator
+    if args.dedupe is not None:
+        from src.Pipelines.Activity_Deduplication import Dedup_Config, score_deduplicated
+        activities = load_activities(args.input, text_column=args.text_column, id_column=args.id_column)
+        results, report, dedup_report = asyncio.run(
+            score_deduplicated(activities, Dedup_Config(threshold=args.dedupe), config=config, scorer=scorer)
+        )
+        print(dedup_report.model_dump_json(indent=2))
+    else:
+        results, report = run_batch_scoring(args.input, args.text_column, args.id_column, config=config, scorer=scorer)
+    save_results(results, args.output)
+    if args.store is not None:
+        from src.Pipelines.Assessment_Store import DEFAULT_STORE_PATH, Assessment_Store
+        stored = Assessment_Store(args.store or DEFAULT_STORE_PATH).add_assessments(
+            results, source="batch", run_id=Path(args.output).stem, function=args.function, team=args.team
+        )
+        print(f"Stored {stored} assessment(s)")
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,553 @@
+import argparse
+import json
+import operator
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+from pydantic import BaseModel
+
+DEFAULT_STORE_PATH = os.getenv("ASSESSMENT_STORE_PATH", "Data/Results/Assessments")
+
+UNASSIGNED = "Unassigned"
+"Partition value for rows without a function"
+UNSCORED = "Unscored"
+"Score band of rows without a score (failed assessments)"
+
+# Columns shared by both tables. `source` is the producer (batch, chat, job, ...) and
+# `run_id` the batch, job batch or chat session the row came from.
+_META_FIELDS = [
+    ("recorded_at", pa.timestamp("ms", tz="UTC")),
+    ("source", pa.string()),
+    ("run_id", pa.string()),
+    ("function", pa.string()),
+    ("team", pa.string()),
+]
+
+SCHEMAS = {
+    "assessments": pa.schema(
+        [("assessment_id", pa.string())]
+        + _META_FIELDS
+        + [
+            ("activity_id", pa.string()),
+            ("activity", pa.string()),
+            ("score", pa.float64()),
+            ("score_band", pa.string()),
+            ("hallucination_score", pa.string()),
+            ("reasoning", pa.string()),
+        ]
+    ),
+    "scenarios": pa.schema(
+        [("scenario_id", pa.string())]
+        + _META_FIELDS
+        + [
+            ("scenario", pa.string()),
+            ("baseline_fte", pa.float64()),
+            ("fte_6m", pa.float64()),
+            ("fte_12m", pa.float64()),
+            ("fte_18m", pa.float64()),
+            ("fte_24m", pa.float64()),
+            ("pct_change_vector", pa.list_(pa.float64())),
+            ("baseline_annual_cost", pa.float64()),
+            ("run_rate_cost_24m", pa.float64()),
+            ("transition_cost", pa.float64()),
+            ("cumulative_savings", pa.float64()),
+            ("cumulative_savings_pct", pa.float64()),
+        ]
+    ),
+}
+
+# Hive partition keys per table; filters on them skip whole directories.
+PARTITIONS = {"assessments": ["function", "score_band"], "scenarios": ["function", "scenario"]}
+
+CALCULATOR_TOOL_NAME = "Agentic_Calculator_Tool"
+SCENARIO_TOOL_NAME = "Workforce_Scenario_Tool"
+
+# Filter operators for `(op, value)` filter values.
+OPERATORS = {"==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+AGGREGATIONS = ("count", "sum", "mean", "min", "max")
+
+# How partial aggregates of each kind are combined across batches.
+_MERGE = {"sum": "sum", "count": "sum", "count_all": "sum", "min": "min", "max": "max"}
+
+Filter_Value = Union[Any, Sequence[Any], tuple]
+
+
+class Store_Benchmark_Report(BaseModel):
+    rows: int
+    files: int
+    write_s: float
+    compact_s: float
+    group_by_s: float
+    "Streaming mean/count of score by function and score band over every row"
+    filtered_group_by_s: float
+    "Same aggregation restricted to one function (partition pruning)"
+    query_s: float
+    "Materializing the filtered rows' key columns as a DataFrame"
+    stored_mb: float
+    "Parquet size on disk"
+    peak_query_memory_mb: float
+    "Peak Arrow allocation during the queries, to compare with the size of the data"
+
+
+def score_bands(scores: pd.Series) -> pd.Series:
+    """Vectorized `Agentic_Calculator_Cascade.classify`; missing scores map to `UNSCORED`."""
+    from src.Tools.Agentic_Calculator_Cascade import BANDS
+
+    values = pd.to_numeric(scores, errors="coerce").to_numpy(dtype="float64")
+    labels = np.select([values >= bound for bound, _ in BANDS], [label for _, label in BANDS], default=UNSCORED)
+    return pd.Series(labels, index=scores.index, dtype="object")
+
+
+def _expression(filters: Optional[Dict[str, Filter_Value]]) -> Optional[ds.Expression]:
+    """
+    Build a dataset filter from `{column: value}`.
+
+    A scalar means equality, a list/set means "one of", `None` means missing, and a
+    `(op, value)` tuple applies one of `OPERATORS`, e.g. `{"score": (">=", 4)}`.
+    """
+    expression = None
+    for column, value in (filters or {}).items():
+        field = ds.field(column)
+        if isinstance(value, tuple):
+            op, operand = value
+            term = OPERATORS[op](field, operand)
+        elif isinstance(value, (list, set, frozenset)):
+            term = field.isin(list(value))
+        elif value is None:
+            term = field.is_null()
+        else:
+            term = field == value
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def _merge_partials(partials: List[pa.Table], keys: List[str]) -> pa.Table:
+    """Combine per-batch partial aggregates (`<column>_<kind>` / `count_all`) into one row per group."""
+    table = pa.concat_tables(partials)
+    specs = []
+    for name in table.column_names:
+        if name not in keys:
+            kind = "count_all" if name == "count_all" else name.rsplit("_", 1)[-1]
+            specs.append((name, _MERGE[kind]))
+    merged = table.group_by(keys).aggregate(specs)
+    # `score_sum` merged with "sum" comes back as `score_sum_sum`.
+    return merged.rename_columns([name if name in keys else name.rsplit("_", 1)[0] for name in merged.column_names])
+
+
+class Assessment_Store:
+    """
+    Append-only, partitioned Parquet store of calculator assessments and scenario figures.
+
+    Each table lives under `<root>/<table>/` with Hive partitions (`PARTITIONS`). Every
+    write adds new files, so concurrent writers from batch runs, job workers and the apps
+    never touch each other's data; `compact` merges the small files later. Reads go
+    through memory-mapped Arrow datasets and stream record batches, so filters,
+    projections and group-bys cost memory proportional to the columns and groups they
+    touch, not the size of the store.
+
+    Args:
+        root: Directory holding the tables.
+        max_rows_per_file: Upper bound on rows per written file.
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_STORE_PATH, max_rows_per_file: int = 1_000_000):
+        self.root = Path(root)
+        self.max_rows_per_file = max_rows_per_file
+        self.filesystem = pafs.LocalFileSystem(use_mmap=True)
+
+    # Writes
+
+    def _write(self, table_name: str, frame: pd.DataFrame, source: str, run_id: Optional[str], function: Optional[str], team: Optional[str]) -> int:
+        if frame.empty:
+            return 0
+        schema = SCHEMAS[table_name]
+        frame = frame.copy()
+        # One random prefix per write plus the row number: unique without a uuid per row.
+        frame[schema.names[0]] = f"{uuid.uuid4().hex}-" + pd.Series(range(len(frame)), index=frame.index).astype(str)
+        frame["recorded_at"] = pd.Timestamp.now(tz="UTC").floor("ms")
+        frame["source"] = source
+        frame["run_id"] = run_id
+        for column, default in (("function", function), ("team", team)):
+            if column not in frame:
+                frame[column] = default
+        frame["function"] = frame["function"].fillna(UNASSIGNED).astype(str)
+        for name in schema.names:
+            if name not in frame:
+                frame[name] = None
+        table = pa.Table.from_pandas(frame[schema.names], schema=schema, preserve_index=False)
+        ds.write_dataset(
+            table,
+            str(self.root / table_name),
+            format="parquet",
+            partitioning=self._partitioning(table_name),
+            basename_template=f"part-{int(time.time())}-{uuid.uuid4().hex[:12]}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            max_rows_per_file=self.max_rows_per_file,
+            max_rows_per_group=min(self.max_rows_per_file, 256 * 1024),
+        )
+        return len(frame)
+
+    def add_assessments(
+        self,
+        frame: pd.DataFrame,
+        source: str = "batch",
+        run_id: Optional[str] = None,
+        function: Optional[str] = None,
+        team: Optional[str] = None,
+    ) -> int:
+        """
+        Append calculator results.
+
+        Args:
+            frame: Rows with `score`, `reasoning` and `hallucination_score` (e.g. the output of
+                `Agentic_Calculator_Batch.score_activities`), optionally `activity_id`,
+                `activity`, `function` and `team`.
+            source: Label of the producer.
+            run_id: Batch / session the rows belong to.
+            function, team: Used for rows whose frame has no such column.
+
+        Returns:
+            The number of rows written.
+        """
+        frame = frame.copy()
+        frame["score_band"] = score_bands(frame["score"]) if "score" in frame else UNSCORED
+        if "activity_id" in frame:
+            frame["activity_id"] = frame["activity_id"].astype(str)
+        return self._write("assessments", frame, source, run_id, function, team)
+
+    def add_scenarios(
+        self,
+        frame: pd.DataFrame,
+        source: str = "batch",
+        run_id: Optional[str] = None,
+        function: Optional[str] = None,
+    ) -> int:
+        """Append scenario figures, one row per team and scenario (`Scenario_Results.summary()`)."""
+        return self._write("scenarios", frame, source, run_id, function, None)
+
+    def record_run_items(
+        self,
+        items: Iterable[Any],
+        source: str = "chat",
+        run_id: Optional[str] = None,
+        function: Optional[str] = None,
+        team: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Persist the calculator and scenario tool results of one agent run (`result.new_items`).
+
+        Calls are matched to their outputs by `call_id`; outputs that do not parse (errors,
+        truncated text) are skipped.
+
+        Returns:
+            Rows written per table.
+        """
+        calls: Dict[str, Any] = {}
+        assessments: List[dict] = []
+        scenarios: List[dict] = []
+        for item in items:
+            raw = getattr(item, "raw_item", None)
+            if getattr(item, "type", None) == "tool_call_item" and getattr(raw, "name", None) in (CALCULATOR_TOOL_NAME, SCENARIO_TOOL_NAME):
+                calls[raw.call_id] = raw
+            elif getattr(item, "type", None) == "tool_call_output_item":
+                call_id = raw.get("call_id") if isinstance(raw, dict) else getattr(raw, "call_id", None)
+                call = calls.get(call_id)
+                if call is None:
+                    continue
+                try:
+                    output = json.loads(str(item.output))
+                    arguments = json.loads(call.arguments or "{}")
+                except (TypeError, ValueError):
+                    continue
+                if call.name == CALCULATOR_TOOL_NAME and isinstance(output, dict) and "score" in output:
+                    assessments.append({"activity_id": call_id, "activity": arguments.get("input"), **output})
+                elif call.name == SCENARIO_TOOL_NAME and isinstance(output, dict):
+                    scenarios.extend(output.get("scenarios", []))
+        return {
+            "assessments": self.add_assessments(pd.DataFrame(assessments), source, run_id, function, team) if assessments else 0,
+            "scenarios": self.add_scenarios(pd.DataFrame(scenarios), source, run_id, function) if scenarios else 0,
+        }
+
+    # Reads
+
+    def _partitioning(self, table_name: str) -> ds.Partitioning:
+        return ds.partitioning(pa.schema([(key, pa.string()) for key in PARTITIONS[table_name]]), flavor="hive")
+
+    def dataset(self, table_name: str) -> ds.Dataset:
+        """Memory-mapped Arrow dataset over every file of a table."""
+        path = self.root / table_name
+        if not path.exists():
+            return ds.dataset(SCHEMAS[table_name].empty_table())
+        return ds.dataset(
+            str(path),
+            schema=SCHEMAS[table_name],
+            format="parquet",
+            partitioning=self._partitioning(table_name),
+            filesystem=self.filesystem,
+        )
+
+    def scan(
+        self,
+        table_name: str,
+        filters: Optional[Dict[str, Filter_Value]] = None,
+        columns: Optional[List[str]] = None,
+        batch_size: int = 256 * 1024,
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream matching rows as record batches; only `columns` are read from disk."""
+        scanner = self.dataset(table_name).scanner(columns=columns, filter=_expression(filters), batch_size=batch_size)
+        yield from scanner.to_batches()
+
+    def query(
+        self,
+        table_name: str,
+        filters: Optional[Dict[str, Filter_Value]] = None,
+        columns: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Matching rows as a DataFrame (project `columns` and `limit` for large stores)."""
+        scanner = self.dataset(table_name).scanner(columns=columns, filter=_expression(filters))
+        table = scanner.head(limit) if limit is not None else scanner.to_table()
+        return table.to_pandas()
+
+    def aggregate(
+        self,
+        table_name: str,
+        group_by: List[str],
+        metrics: Optional[Dict[str, List[str]]] = None,
+        filters: Optional[Dict[str, Filter_Value]] = None,
+        merge_every: int = 64,
+    ) -> pd.DataFrame:
+        """
+        Group-by over the whole store without materializing it.
+
+        Each scanned batch is reduced to per-group partial sums/counts/minima/maxima, and
+        partials are merged every `merge_every` batches, so memory grows with the number
+        of groups rather than rows.
+
+        Args:
+            group_by: Key columns, e.g. `["function", "score_band"]`; `[]` for one overall row.
+            metrics: `{column: [aggregation, ...]}` with aggregations from `AGGREGATIONS`.
+                Defaults to the mean and count of `score` (assessments) or
+                `cumulative_savings` (scenarios).
+            filters: See `_expression`.
+
+        Returns:
+            One row per group with `rows` and `<column>_<aggregation>` columns.
+        """
+        metrics = metrics or ({"score": ["mean", "count"]} if table_name == "assessments" else {"cumulative_savings": ["mean", "sum"]})
+        unknown = {fn for fns in metrics.values() for fn in fns} - set(AGGREGATIONS)
+        if unknown:
+            raise ValueError(f"Unsupported aggregations {sorted(unknown)}; expected one of {AGGREGATIONS}")
+
+        partial_specs: List[tuple] = [([], "count_all")]
+        for column, fns in metrics.items():
+            needed = {"sum", "count"} if "mean" in fns else set()
+            needed |= {fn for fn in fns if fn != "mean"}
+            partial_specs += [(column, fn) for fn in sorted(needed)]
+
+        partials: List[pa.Table] = []
+        for batch in self.scan(table_name, filters, columns=list(dict.fromkeys(group_by + list(metrics)))):
+            if batch.num_rows == 0:
+                continue
+            partials.append(pa.Table.from_batches([batch]).group_by(group_by).aggregate(partial_specs))
+            if len(partials) >= merge_every:
+                partials = [_merge_partials(partials, group_by)]
+
+        if not partials:
+            return pd.DataFrame(columns=group_by + ["rows"] + [f"{c}_{fn}" for c, fns in metrics.items() for fn in fns])
+        frame = _merge_partials(partials, group_by).to_pandas().rename(columns={"count_all": "rows"})
+        output = frame[group_by + ["rows"]].copy()
+        for column, fns in metrics.items():
+            for fn in fns:
+                if fn == "mean":
+                    output[f"{column}_mean"] = frame[f"{column}_sum"] / frame[f"{column}_count"].replace(0, np.nan)
+                else:
+                    output[f"{column}_{fn}"] = frame[f"{column}_{fn}"]
+        return output.sort_values(group_by).reset_index(drop=True) if group_by else output
+
+    def figure(
+        self,
+        table_name: str,
+        x: str,
+        metric: str = "score",
+        aggregation: str = "mean",
+        color: Optional[str] = None,
+        filters: Optional[Dict[str, Filter_Value]] = None,
+    ):
+        """Plotly bar chart of one aggregated metric by `x` (and `color`)."""
+        import plotly.express as px
+
+        keys = [x] + ([color] if color else [])
+        frame = self.aggregate(table_name, keys, {metric: [aggregation]}, filters)
+        return px.bar(frame, x=x, y=f"{metric}_{aggregation}", color=color, barmode="group", hover_data=["rows"])
+
+    # Maintenance
+
+    def compact(self, table_name: str) -> int:
+        """
+        Merge each partition's files into one. Run it when no query is in flight; a reader
+        that listed the old files while they are swapped out may miss rows.
+
+        Returns:
+            The number of files removed.
+        """
+        removed = 0
+        root = self.root / table_name
+        if not root.exists():
+            return 0
+        file_schema = pa.schema([f for f in SCHEMAS[table_name] if f.name not in PARTITIONS[table_name]])
+        for directory in sorted({p.parent for p in root.rglob("*.parquet")}):
+            files = sorted(p for p in directory.glob("*.parquet") if not p.name.startswith("."))
+            if len(files) < 2:
+                continue
+            table = ds.dataset([str(p) for p in files], schema=file_schema, format="parquet").to_table()
+            staging = directory / f".part-compacted-{uuid.uuid4().hex[:12]}.parquet"
+            pq.write_table(table, staging, row_group_size=256 * 1024)
+            staging.rename(directory / staging.name[1:])
+            for path in files:
+                path.unlink()
+            removed += len(files) - 1
+        return removed
+
+
+def benchmark_store(rows: int = 2_000_000, chunk_rows: int = 250_000, root: Optional[str] = None, seed: int = 0) -> Store_Benchmark_Report:
+    """Write `rows` synthetic assessments in chunks, compact, then time typical analyst queries."""
+    rng = np.random.default_rng(seed)
+    functions = ["Finance", "HR", "Legal", "Procurement", "Facilities", "IT", "Compliance", "Internal Audit"]
+    cleanup = root is None
+    store = Assessment_Store(root or tempfile.mkdtemp(prefix="assessment_store_"))
+    try:
+        started = time.perf_counter()
+        for offset in range(0, rows, chunk_rows):
+            n = min(chunk_rows, rows - offset)
+            function_idx = rng.integers(0, len(functions), n)
+            frame = pd.DataFrame(
+                {
+                    "activity_id": np.arange(offset, offset + n).astype(str),
+                    "activity": "Synthetic activity",
+                    "function": np.array(functions)[function_idx],
+                    "team": [f"Team {i}" for i in function_idx * 5 + rng.integers(0, 5, n)],
+                    "score": np.round(rng.uniform(1, 5, n), 1),
+                    "hallucination_score": rng.choice(["Low", "Medium", "High"], n),
+                    "reasoning": "Synthetic reasoning",
+                }
+            )
+            store.add_assessments(frame, source="benchmark", run_id=f"chunk-{offset // chunk_rows}")
+        write_s = time.perf_counter() - started
+        started = time.perf_counter()
+        store.compact("assessments")
+        compact_s = time.perf_counter() - started
+        files = len(list((store.root / "assessments").rglob("*.parquet")))
+
+        stored_mb = sum(p.stat().st_size for p in (store.root / "assessments").rglob("*.parquet")) / 2**20
+
+        def timed(fn) -> float:
+            started = time.perf_counter()
+            fn()
+            return time.perf_counter() - started
+
+        # Route Arrow allocations through a proxy pool to measure the queries' own peak.
+        previous_pool = pa.default_memory_pool()
+        tracked_pool = pa.proxy_memory_pool(previous_pool)
+        pa.set_memory_pool(tracked_pool)
+        try:
+            group_by_s = timed(lambda: store.aggregate("assessments", ["function", "score_band"]))
+            filtered_s = timed(lambda: store.aggregate("assessments", ["team", "score_band"], filters={"function": "Finance"}))
+            query_s = timed(lambda: store.query("assessments", {"function": "HR", "score": (">=", 4.5)}, columns=["team", "activity_id", "score"]))
+        finally:
+            pa.set_memory_pool(previous_pool)
+        return Store_Benchmark_Report(
+            rows=rows,
+            files=files,
+            write_s=write_s,
+            compact_s=compact_s,
+            group_by_s=group_by_s,
+            filtered_group_by_s=filtered_s,
+            query_s=query_s,
+            stored_mb=stored_mb,
+            peak_query_memory_mb=tracked_pool.max_memory() / 2**20,
+        )
+    finally:
+        if cleanup:
+            shutil.rmtree(store.root, ignore_errors=True)
+
+
+def _parse_filters(items: List[str]) -> Dict[str, Filter_Value]:
+    """`column=value`, `column=a|b` (one of) or `column>=4` style filters from the command line."""
+    filters: Dict[str, Filter_Value] = {}
+    for item in items:
+        for op in (">=", "<=", "!=", ">", "<", "="):
+            if op in item:
+                column, value = item.split(op, 1)
+                break
+        else:
+            raise ValueError(f"Cannot parse filter {item!r}")
+        if op == "=":
+            filters[column] = value.split("|") if "|" in value else value
+        else:
+            filters[column] = (op, float(value))
+    return filters
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Partitioned Parquet store of assessments and scenario results.")
+    parser.add_argument("--root", default=DEFAULT_STORE_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query = commands.add_parser("query", help="Aggregate (with --group-by) or list stored rows")
+    query.add_argument("--table", choices=list(SCHEMAS), default="assessments")
+    query.add_argument("--group-by", nargs="*", default=None, help="e.g. function team score_band scenario")
+    query.add_argument("--metric", action="append", default=[], metavar="COLUMN:AGG", help="e.g. score:mean (repeatable)")
+    query.add_argument("--filter", action="append", default=[], help="column=value, column=a|b or column>=4 (repeatable)")
+    query.add_argument("--columns", nargs="*", default=None)
+    query.add_argument("--limit", type=int, default=50)
+    query.add_argument("--output", default=None, help="Write the result to .parquet, .csv or .xlsx")
+
+    compact = commands.add_parser("compact", help="Merge small files per partition")
+    compact.add_argument("--table", choices=list(SCHEMAS), default=None)
+
+    benchmark = commands.add_parser("benchmark", help="Time group-bys over synthetic assessments")
+    benchmark.add_argument("--rows", type=int, default=2_000_000)
+
+    args = parser.parse_args(argv)
+    if args.command == "benchmark":
+        print(benchmark_store(args.rows).model_dump_json(indent=2))
+        return
+
+    store = Assessment_Store(args.root)
+    if args.command == "compact":
+        for table_name in [args.table] if args.table else list(SCHEMAS):
+            print(f"{table_name}: removed {store.compact(table_name)} file(s)")
+    elif args.command == "query":
+        filters = _parse_filters(args.filter)
+        if args.group_by is not None:
+            metrics: Dict[str, List[str]] = {}
+            for item in args.metric:
+                column, fn = item.split(":", 1)
+                metrics.setdefault(column, []).append(fn)
+            frame = store.aggregate(args.table, args.group_by, metrics or None, filters)
+        else:
+            frame = store.query(args.table, filters, args.columns, args.limit)
+        if args.output:
+            from src.Pipelines.Agentic_Calculator_Batch import save_results
+            save_results(frame, args.output)
+            print(f"Wrote {len(frame)} row(s) to {args.output}")
+        else:
+            with pd.option_context("display.width", 200, "display.max_columns", None):
+                print(frame.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
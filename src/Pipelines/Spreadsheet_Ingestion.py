@@ -0,0 +1,349 @@
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Literal, Optional, Union
+
+from pydantic import BaseModel
+
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm", ".xls")
+Output_Format = Literal["parquet", "jsonl", "json"]
+
+
+class Sheet_Result(BaseModel):
+    workbook: str
+    sheet: str
+    columns: Dict[str, str]
+    "Column name -> logical type (float, bool, timestamp, string), inferred from the first chunk"
+    widened_columns: List[str] = []
+    "Columns whose later chunks did not fit the first chunk's type; written as strings in every part"
+    parts: List[str]
+    rows: int
+    elapsed_s: float
+
+
+class Ingestion_Report(BaseModel):
+    sheets: List[Sheet_Result]
+    failed: Dict[str, str]
+    rows: int
+    elapsed_s: float
+    rows_per_s: float
+    workers: int
+
+
+def _sanitize(name: str) -> str:
+    # Keep it filesystem-friendly and stable
+    name = name.strip()
+    name = re.sub(r"\s+", "_", name)          # spaces -> underscores
+    name = re.sub(r"[^A-Za-z0-9._-]", "", name)  # drop unsafe chars
+    return name or "Sheet"
+
+
+def _column_names(header: tuple) -> List[str]:
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for i, value in enumerate(header):
+        name = str(value).strip() if value not in (None, "") else f"column_{i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}_{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _iter_rows(workbook_path: Path, sheet: str) -> Iterator[tuple]:
+    """Yield raw row tuples without ever materializing the whole sheet."""
+    if workbook_path.suffix.lower() == ".xls":
+        # openpyxl cannot read legacy .xls; xlrd loads the sheet, but rows are still emitted one at a time.
+        import xlrd
+        book = xlrd.open_workbook(str(workbook_path), on_demand=True)
+        try:
+            worksheet = book.sheet_by_name(sheet)
+            for r in range(worksheet.nrows):
+                yield tuple(
+                    xlrd.xldate.xldate_as_datetime(cell.value, book.datemode) if cell.ctype == xlrd.XL_CELL_DATE else cell.value
+                    for cell in worksheet.row(r)
+                )
+        finally:
+            book.release_resources()
+        return
+
+    from openpyxl import load_workbook
+    book = load_workbook(workbook_path, read_only=True, data_only=True)
+    try:
+        yield from book[sheet].iter_rows(values_only=True)
+    finally:
+        book.close()
+
+
+def list_sheets(workbook_path: Union[str, Path]) -> List[str]:
+    workbook_path = Path(workbook_path)
+    if workbook_path.suffix.lower() == ".xls":
+        import xlrd
+        book = xlrd.open_workbook(str(workbook_path), on_demand=True)
+        try:
+            return book.sheet_names()
+        finally:
+            book.release_resources()
+    from openpyxl import load_workbook
+    book = load_workbook(workbook_path, read_only=True)
+    try:
+        return book.sheetnames
+    finally:
+        book.close()
+
+
+def _logical_type(values: List[Any]) -> str:
+    present = [v for v in values if v is not None and v != ""]
+    if not present:
+        return "string"
+    if all(isinstance(v, bool) for v in present):
+        return "bool"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return "float"
+    if all(isinstance(v, (datetime.datetime, datetime.date)) for v in present):
+        return "timestamp"
+    return "string"
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def _to_text(value: Any) -> Optional[str]:
+    """Cell value as it is stored in a string column; integral floats render as ints ("3", not "3.0")."""
+    value = _to_json_value(value)
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _widen_part(path: Path, columns: List[str]) -> None:
+    """Rewrite a Parquet part with `columns` as strings, formatted like a widened chunk's values."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path)
+    for name in columns:
+        values = [_to_text(v) for v in table.column(name).to_pylist()]
+        table = table.set_column(table.schema.get_field_index(name), name, pa.array(values, type=pa.string()))
+    pq.write_table(table, path, compression="zstd")
+
+
+def _write_chunk(
+    rows: List[tuple],
+    names: List[str],
+    types: Dict[str, str],
+    widened: List[str],
+    path: Path,
+    output_format: Output_Format,
+) -> None:
+    columns = {name: [row[i] if i < len(row) else None for row in rows] for i, name in enumerate(names)}
+
+    if output_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        arrow_types = {"float": pa.float64(), "bool": pa.bool_(), "timestamp": pa.timestamp("us"), "string": pa.string()}
+        arrays = []
+        for name in names:
+            values = [None if v == "" else v for v in columns[name]]
+            kind = types[name]
+            if kind != "string" and any(v is not None for v in values) and _logical_type(values) != kind:
+                kind = types[name] = "string"
+                widened.append(name)
+            if kind == "string":
+                values = [_to_text(v) for v in values]
+            elif kind == "float":
+                values = [None if v is None else float(v) for v in values]
+            arrays.append(pa.array(values, type=arrow_types[kind]))
+        pq.write_table(pa.Table.from_arrays(arrays, names=names), path, compression="zstd")
+        return
+
+    with open(path, "w", encoding="utf-8") as f:
+        if output_format == "json":
+            f.write("[\n")
+        for r in range(len(rows)):
+            record = {name: _to_json_value(columns[name][r]) for name in names}
+            line = json.dumps(record, ensure_ascii=False, default=str)
+            if output_format == "json":
+                f.write(line + (",\n" if r < len(rows) - 1 else "\n"))
+            else:
+                f.write(line + "\n")
+        if output_format == "json":
+            f.write("]\n")
+
+
+def ingest_sheet(
+    workbook_path: Union[str, Path],
+    sheet: str,
+    output_dir: Union[str, Path],
+    output_format: Output_Format = "parquet",
+    chunk_rows: int = 50_000,
+) -> Sheet_Result:
+    """
+    Stream one sheet into chunked files; at most `chunk_rows` rows are held in memory.
+
+    The first row is the header. Parts are written to
+    `<output_dir>/<workbook>__<sheet>__<path hash>/part-00000.<ext>`, one per chunk; the hash
+    of the workbook's full path keeps same-named workbooks from different folders apart.
+    All Parquet parts of a sheet share one schema: when a later chunk widens a column to
+    string, the earlier parts are rewritten to match.
+    """
+    started = time.perf_counter()
+    workbook_path, output_dir = Path(workbook_path), Path(output_dir)
+    path_hash = hashlib.sha1(str(workbook_path.resolve()).encode("utf-8")).hexdigest()[:8]
+    sheet_dir = output_dir / f"{workbook_path.stem}__{_sanitize(str(sheet))}__{path_hash}"
+    sheet_dir.mkdir(parents=True, exist_ok=True)
+    for stale in sheet_dir.glob("part-*"):
+        stale.unlink()
+
+    rows_iter = _iter_rows(workbook_path, sheet)
+    header = next(rows_iter, None)
+    names = _column_names(header or ())
+    types: Dict[str, str] = {}
+    widened: List[str] = []
+    parts: List[str] = []
+    part_types: List[Dict[str, str]] = []
+    total = 0
+    buffer: List[tuple] = []
+
+    def flush() -> None:
+        nonlocal buffer
+        if not buffer:
+            return
+        if not types:
+            types.update({name: _logical_type([row[i] if i < len(row) else None for row in buffer]) for i, name in enumerate(names)})
+        path = sheet_dir / f"part-{len(parts):05d}.{output_format}"
+        _write_chunk(buffer, names, types, widened, path, output_format)
+        parts.append(str(path))
+        part_types.append(dict(types))
+        buffer = []
+
+    for row in rows_iter:
+        if row is None or all(v is None for v in row):
+            continue
+        buffer.append(row)
+        total += 1
+        if len(buffer) >= chunk_rows:
+            flush()
+    flush()
+
+    if output_format == "parquet" and widened:
+        for path, written in zip(parts, part_types):
+            stale_columns = [name for name in widened if written[name] != "string"]
+            if stale_columns:
+                _widen_part(Path(path), stale_columns)
+
+    return Sheet_Result(
+        workbook=str(workbook_path),
+        sheet=str(sheet),
+        columns=types or {name: "string" for name in names},
+        widened_columns=widened,
+        parts=parts,
+        rows=total,
+        elapsed_s=time.perf_counter() - started,
+    )
+
+
+def ingest_workbooks(
+    paths: List[Union[str, Path]],
+    output_dir: Union[str, Path],
+    output_format: Output_Format = "parquet",
+    chunk_rows: int = 50_000,
+    workers: Optional[int] = None,
+) -> Ingestion_Report:
+    """
+    Convert every sheet of every workbook to chunked columnar files in parallel.
+
+    One process-pool task per sheet; each task streams its sheet in openpyxl
+    read-only mode, so memory stays bounded by `chunk_rows` per worker regardless
+    of sheet size. A `manifest.json` describing every sheet's schema and parts is
+    written to `output_dir`.
+
+    Args:
+        paths: Workbook files (.xlsx/.xlsm/.xls); other files are ignored.
+        output_dir: Folder for the sheet folders and the manifest.
+        output_format: "parquet" (zstd), "jsonl", or "json" (one JSON array per part, uploadable to file search).
+        chunk_rows: Rows per part file.
+        workers: Process-pool size. Defaults to the CPU count.
+
+    Returns:
+        An `Ingestion_Report` with per-sheet results, failures and rows/sec.
+    """
+    started = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    workbooks = [Path(p) for p in paths if str(p).lower().endswith(EXCEL_EXTENSIONS)]
+
+    results: List[Sheet_Result] = []
+    failed: Dict[str, str] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for workbook in workbooks:
+            try:
+                sheets = list_sheets(workbook)
+            except Exception as e:
+                failed[str(workbook)] = f"{type(e).__name__}: {e}"
+                continue
+            for sheet in sheets:
+                future = pool.submit(ingest_sheet, workbook, sheet, output_dir, output_format, chunk_rows)
+                futures[future] = f"{workbook}::{sheet}"
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                failed[futures[future]] = f"{type(e).__name__}: {e}"
+
+    results.sort(key=lambda r: (r.workbook, r.sheet))
+    elapsed = time.perf_counter() - started
+    rows = sum(r.rows for r in results)
+    report = Ingestion_Report(
+        sheets=results,
+        failed=failed,
+        rows=rows,
+        elapsed_s=elapsed,
+        rows_per_s=rows / elapsed if elapsed > 0 else 0.0,
+        workers=workers,
+    )
+    with open(output_dir / "manifest.json", "w", encoding="utf-8") as f:
+        f.write(report.model_dump_json(indent=2))
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Stream Excel workbooks into chunked Parquet/JSONL/JSON files.")
+    parser.add_argument("inputs", nargs="+", help="Workbook files or folders (searched recursively)")
+    parser.add_argument("--output", default="Data/Knowledge_Base/Intermediate")
+    parser.add_argument("--format", choices=["parquet", "jsonl", "json"], default="parquet")
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    paths: List[Path] = []
+    for item in map(Path, args.inputs):
+        paths.extend(sorted(p for p in item.rglob("*") if p.is_file()) if item.is_dir() else [item])
+    report = ingest_workbooks(paths, args.output, args.format, args.chunk_rows, args.workers)
+    for sheet in report.sheets:
+        print(f"{sheet.rows:>10,} rows  {len(sheet.parts):>3} parts  {Path(sheet.workbook).name} :: {sheet.sheet}")
+    for name, error in report.failed.items():
+        print(f"FAILED {name}: {error}")
+    print(f"{report.rows:,} rows in {report.elapsed_s:.1f}s ({report.rows_per_s:,.0f} rows/s, {report.workers} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+import argparse
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Protocol, Set, Union
+
+from pydantic import BaseModel
+
+ALLOWED_EXTENSIONS = {
+    ".c", ".cpp", ".cs", ".css", ".doc", ".docx", ".go", ".html", ".java",
+    ".js", ".json", ".md", ".pdf", ".php", ".pptx", ".py", ".rb", ".sh",
+    ".tex", ".ts", ".txt"
+}
+
+
+class Manifest_Entry(BaseModel):
+    sha256: str
+    size: int
+    mtime: float
+    file_id: Optional[str] = None
+    "OpenAI file id once the upload finished"
+    attached: bool = False
+    "True once the file is indexed in the vector store"
+
+
+class Sync_Manifest(BaseModel):
+    vector_store_id: str
+    corpus_dir: str
+    files: Dict[str, Manifest_Entry] = {}
+    "Keyed on the path relative to `corpus_dir` (POSIX separators)"
+
+
+class Sync_Plan(BaseModel):
+    added: List[str] = []
+    changed: List[str] = []
+    removed: List[str] = []
+    unchanged: List[str] = []
+    resumed: List[str] = []
+    "Uploaded by an interrupted run but not yet attached to the vector store"
+
+
+class Sync_Report(BaseModel):
+    vector_store_id: str
+    uploaded: int
+    attached: int
+    deleted: int
+    unchanged: int
+    failed: List[str]
+    bytes_uploaded: int
+    elapsed_s: float
+
+
+class Vector_Store_Backend(Protocol):
+    """The subset of the vector-store API the sync needs; implemented for OpenAI and in-memory."""
+
+    async def create_vector_store(self, name: str) -> str: ...
+
+    async def upload_file(self, path: Path) -> str: ...
+
+    async def attach_files(self, vector_store_id: str, file_ids: List[str]) -> Dict[str, str]:
+        """Index files in a vector store; returns {file_id: status}."""
+        ...
+
+    async def detach_file(self, vector_store_id: str, file_id: str) -> None: ...
+
+    async def delete_file(self, file_id: str) -> None: ...
+
+
+class OpenAI_Vector_Store_Backend:
+    def __init__(self, client=None):
+        if client is None:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_API_BASE"))
+        self.client = client
+
+    async def create_vector_store(self, name: str) -> str:
+        return (await self.client.vector_stores.create(name=name)).id
+
+    async def upload_file(self, path: Path) -> str:
+        # One handle at a time per worker, closed as soon as the upload returns.
+        with open(path, "rb") as f:
+            return (await self.client.files.create(file=f, purpose="assistants")).id
+
+    async def attach_files(self, vector_store_id: str, file_ids: List[str]) -> Dict[str, str]:
+        batch = await self.client.vector_stores.file_batches.create_and_poll(
+            vector_store_id=vector_store_id, file_ids=file_ids
+        )
+        statuses: Dict[str, str] = {}
+        async for vs_file in self.client.vector_stores.file_batches.list_files(
+            batch_id=batch.id, vector_store_id=vector_store_id, limit=100
+        ):
+            statuses[vs_file.id] = vs_file.status
+        return statuses
+
+    async def detach_file(self, vector_store_id: str, file_id: str) -> None:
+        await self.client.vector_stores.files.delete(file_id=file_id, vector_store_id=vector_store_id)
+
+    async def delete_file(self, file_id: str) -> None:
+        await self.client.files.delete(file_id)
+
+
+class Fake_Vector_Store_Backend:
+    """
+    In-memory stand-in for the vector-store API, for offline tests and dry runs.
+
+    Records every call so tests can assert that only changed files were uploaded.
+    Set `fail_paths` to make uploads of those file names raise.
+    """
+
+    def __init__(self, latency_s: float = 0.0, fail_paths: Optional[Set[str]] = None):
+        self.latency_s = latency_s
+        self.fail_paths = fail_paths or set()
+        self.files: Dict[str, bytes] = {}
+        self.vector_stores: Dict[str, Set[str]] = {}
+        self.calls: List[tuple] = []
+        self.max_open_uploads = 0
+        self._open_uploads = 0
+
+    async def create_vector_store(self, name: str) -> str:
+        vector_store_id = f"vs_{uuid.uuid4().hex[:24]}"
+        self.vector_stores[vector_store_id] = set()
+        self.calls.append(("create_vector_store", name))
+        return vector_store_id
+
+    async def upload_file(self, path: Path) -> str:
+        self._open_uploads += 1
+        self.max_open_uploads = max(self.max_open_uploads, self._open_uploads)
+        try:
+            await asyncio.sleep(self.latency_s)
+            if path.name in self.fail_paths:
+                raise IOError(f"Simulated upload failure: {path.name}")
+            file_id = f"file-{uuid.uuid4().hex[:24]}"
+            self.files[file_id] = path.read_bytes()
+            self.calls.append(("upload_file", path.name))
+            return file_id
+        finally:
+            self._open_uploads -= 1
+
+    async def attach_files(self, vector_store_id: str, file_ids: List[str]) -> Dict[str, str]:
+        await asyncio.sleep(self.latency_s)
+        store = self.vector_stores.setdefault(vector_store_id, set())
+        statuses = {}
+        for file_id in file_ids:
+            if file_id in self.files:
+                store.add(file_id)
+                statuses[file_id] = "completed"
+            else:
+                statuses[file_id] = "failed"
+        self.calls.append(("attach_files", len(file_ids)))
+        return statuses
+
+    async def detach_file(self, vector_store_id: str, file_id: str) -> None:
+        self.vector_stores.get(vector_store_id, set()).discard(file_id)
+        self.calls.append(("detach_file", file_id))
+
+    async def delete_file(self, file_id: str) -> None:
+        self.files.pop(file_id, None)
+        self.calls.append(("delete_file", file_id))
+
+
+def _sha256(path: Path, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def scan_corpus(
+    corpus_dir: Union[str, Path],
+    previous: Optional[Dict[str, Manifest_Entry]] = None,
+    extensions: Iterable[str] = ALLOWED_EXTENSIONS,
+) -> Dict[str, Manifest_Entry]:
+    """
+    Fingerprint every allowed file under `corpus_dir`.
+
+    Files whose size and mtime match the previous manifest reuse its hash, so an
+    unchanged corpus is scanned without reading file contents.
+    """
+    corpus_dir = Path(corpus_dir)
+    previous = previous or {}
+    extensions = {e.lower() for e in extensions}
+    entries: Dict[str, Manifest_Entry] = {}
+    for path in sorted(corpus_dir.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in extensions:
+            continue
+        relative = path.relative_to(corpus_dir).as_posix()
+        stat = path.stat()
+        old = previous.get(relative)
+        if old is not None and old.size == stat.st_size and old.mtime == stat.st_mtime:
+            sha256 = old.sha256
+        else:
+            sha256 = _sha256(path)
+        entries[relative] = Manifest_Entry(sha256=sha256, size=stat.st_size, mtime=stat.st_mtime)
+    return entries
+
+
+def plan_sync(manifest: Sync_Manifest, current: Dict[str, Manifest_Entry]) -> Sync_Plan:
+    """Diff the scanned corpus against the manifest."""
+    plan = Sync_Plan()
+    for relative, entry in current.items():
+        old = manifest.files.get(relative)
+        if old is None or old.file_id is None:
+            plan.added.append(relative)
+        elif old.sha256 != entry.sha256:
+            plan.changed.append(relative)
+        elif not old.attached:
+            plan.resumed.append(relative)
+        else:
+            plan.unchanged.append(relative)
+    plan.removed = [relative for relative in manifest.files if relative not in current]
+    return plan
+
+
+def load_manifest(path: Union[str, Path]) -> Optional[Sync_Manifest]:
+    path = Path(path)
+    if not path.exists():
+        return None
+    return Sync_Manifest.model_validate_json(path.read_text(encoding="utf-8"))
+
+
+def save_manifest(manifest: Sync_Manifest, path: Union[str, Path]) -> None:
+    """Atomically replace the manifest so an interruption never leaves a torn file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(manifest.model_dump_json(indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+async def sync_vector_store(
+    corpus_dir: Union[str, Path],
+    manifest_path: Union[str, Path],
+    backend: Optional[Vector_Store_Backend] = None,
+    vector_store_id: Optional[str] = None,
+    vector_store_name: Optional[str] = None,
+    extensions: Iterable[str] = ALLOWED_EXTENSIONS,
+    concurrency: int = 8,
+    batch_size: int = 100,
+    dry_run: bool = False,
+) -> Sync_Report:
+    """
+    Bring a vector store in line with a local folder, uploading only what changed.
+
+    Args:
+        corpus_dir: Folder to mirror (searched recursively).
+        manifest_path: JSON manifest recording the content hash and file id of every synced file.
+        backend: Vector-store API. Defaults to `OpenAI_Vector_Store_Backend`.
+        vector_store_id: Existing vector store. Defaults to the one in the manifest, or a new store.
+        vector_store_name: Name for a newly created vector store.
+        extensions: File extensions to include.
+        concurrency: Maximum simultaneous uploads (and open file handles).
+        batch_size: Files attached to the vector store per batch; the manifest is saved after each.
+        dry_run: Only compute and print the plan.
+
+    Returns:
+        A `Sync_Report` with counts, bytes uploaded and elapsed time.
+    """
+    started = time.perf_counter()
+    backend = backend or OpenAI_Vector_Store_Backend()
+    corpus_dir = Path(corpus_dir)
+
+    manifest = load_manifest(manifest_path)
+    if manifest is None or (vector_store_id and manifest.vector_store_id != vector_store_id):
+        if vector_store_id is None and not dry_run:
+            vector_store_id = await backend.create_vector_store(vector_store_name or corpus_dir.name)
+        manifest = Sync_Manifest(vector_store_id=vector_store_id or "", corpus_dir=str(corpus_dir))
+
+    current = scan_corpus(corpus_dir, manifest.files, extensions)
+    plan = plan_sync(manifest, current)
+    if dry_run:
+        print(plan.model_dump_json(indent=2))
+        return Sync_Report(
+            vector_store_id=manifest.vector_store_id, uploaded=0, attached=0, deleted=0,
+            unchanged=len(plan.unchanged), failed=[], bytes_uploaded=0, elapsed_s=time.perf_counter() - started,
+        )
+
+    deleted = 0
+    failed: List[str] = []
+    # Stale copies go first so the store never serves an old and a new version side by side.
+    # A copy that cannot be deleted keeps its manifest entry (so the next run retries it), and
+    # its new version is not uploaded until it is gone.
+    for relative in plan.removed + plan.changed:
+        old = manifest.files.get(relative)
+        if old is not None and old.file_id:
+            try:
+                if old.attached:
+                    await backend.detach_file(manifest.vector_store_id, old.file_id)
+                    old.attached = False
+                await backend.delete_file(old.file_id)
+            except Exception as e:
+                failed.append(relative)
+                print(f"Could not delete {relative} ({old.file_id}): {e}")
+                continue
+            deleted += 1
+        manifest.files.pop(relative, None)
+    save_manifest(manifest, manifest_path)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    counters = {"uploaded": 0, "attached": 0, "bytes": 0}
+
+    async def upload(relative: str) -> None:
+        async with semaphore:
+            try:
+                file_id = await backend.upload_file(corpus_dir / relative)
+            except Exception as e:
+                failed.append(relative)
+                print(f"Upload failed for {relative}: {e}")
+                return
+        manifest.files[relative] = current[relative].model_copy(update={"file_id": file_id, "attached": False})
+        counters["uploaded"] += 1
+        counters["bytes"] += current[relative].size
+
+    async def attach(relatives: List[str]) -> None:
+        if not relatives:
+            return
+        statuses = await backend.attach_files(manifest.vector_store_id, [manifest.files[r].file_id for r in relatives])
+        for relative in relatives:
+            if statuses.get(manifest.files[relative].file_id) == "completed":
+                manifest.files[relative].attached = True
+                counters["attached"] += 1
+            else:
+                failed.append(relative)
+        save_manifest(manifest, manifest_path)
+
+    for start in range(0, len(plan.resumed), batch_size):
+        await attach(plan.resumed[start:start + batch_size])
+
+    to_upload = plan.added + [relative for relative in plan.changed if relative not in failed]
+    for start in range(0, len(to_upload), batch_size):
+        batch = to_upload[start:start + batch_size]
+        await asyncio.gather(*(upload(relative) for relative in batch))
+        # Persist file ids before attaching: a crash here resumes by attaching, not re-uploading.
+        save_manifest(manifest, manifest_path)
+        await attach([r for r in batch if r in manifest.files and not manifest.files[r].attached])
+
+    return Sync_Report(
+        vector_store_id=manifest.vector_store_id,
+        uploaded=counters["uploaded"],
+        attached=counters["attached"],
+        deleted=deleted,
+        unchanged=len(plan.unchanged),
+        failed=failed,
+        bytes_uploaded=counters["bytes"],
+        elapsed_s=time.perf_counter() - started,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Incrementally sync a folder into an OpenAI vector store.")
+    parser.add_argument("corpus_dir", help="e.g. Data/GenAI_Process_Knowledge_Base")
+    parser.add_argument("--manifest", default=None, help="Default: Data/Intermediate/<corpus>.vector_store_manifest.json")
+    parser.add_argument("--vector-store-id", default=None)
+    parser.add_argument("--name", default=None, help="Name for a newly created vector store")
+    parser.add_argument("--extensions", nargs="*", default=None, help="e.g. .pdf (default: all supported types)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--fake",
+        action="store_true",
+        help="Use the in-memory vector-store fake (offline); its manifest goes to a temporary folder unless --manifest is given",
+    )
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    default_manifest = f"Data/Intermediate/{Path(args.corpus_dir).name}.vector_store_manifest.json"
+    manifest = args.manifest or default_manifest
+    if args.fake:
+        # Fake file ids in the real manifest would make the next real sync skip every file.
+        if args.manifest is None:
+            manifest = str(Path(tempfile.mkdtemp(prefix="vector_store_sync_")) / Path(default_manifest).name)
+        elif Path(args.manifest).resolve() == Path(default_manifest).resolve():
+            parser.error("--fake must not write to the default manifest; pass another --manifest path")
+    report = asyncio.run(
+        sync_vector_store(
+            args.corpus_dir,
+            manifest,
+            backend=Fake_Vector_Store_Backend() if args.fake else None,
+            vector_store_id=args.vector_store_id,
+            vector_store_name=args.name,
+            extensions=args.extensions or ALLOWED_EXTENSIONS,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+        )
+    )
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+import bisect
+import json
+import os
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from agents.tracing import Span, Trace, TracingProcessor
+
+DEFAULT_JSONL_PATH = os.getenv("AGENT_METRICS_JSONL", "Data/Results/Metrics/agent_spans.jsonl")
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+TOKEN_BUCKETS = (100, 250, 500, 1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000)
+
+# Metric name -> (help text, bucket bounds)
+METRICS = {
+    "agent_span_seconds": ("Duration of one agent turn loop (agent span)", SECONDS_BUCKETS),
+    "tool_span_seconds": ("Duration of a function tool call", SECONDS_BUCKETS),
+    "model_call_seconds": ("Duration of a model (Responses API) call", SECONDS_BUCKETS),
+    "trace_seconds": ("Duration of a whole traced workflow", SECONDS_BUCKETS),
+    "queue_wait_seconds": ("Time work waited before it started running", SECONDS_BUCKETS),
+    "ttft_seconds": ("Time to the first streamed text token", SECONDS_BUCKETS),
+    "prompt_tokens": ("Input tokens per model call", TOKEN_BUCKETS),
+    "cached_prompt_tokens": ("Cached input tokens per model call", TOKEN_BUCKETS),
+    "uncached_prompt_tokens": ("Input tokens per model call that missed the prompt cache", TOKEN_BUCKETS),
+    "completion_tokens": ("Output tokens per model call", TOKEN_BUCKETS),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics) for one metric and label set."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf if it is the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        target, running = q * self.count, 0
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            running += n
+            if running >= target:
+                return bound
+        return float("inf")
+
+
+class Rotating_JSONL_Writer:
+    """Appends JSON lines, rotating `path` -> `path.1` -> ... once it exceeds `max_bytes`."""
+
+    def __init__(self, path: str, max_bytes: int = 20_000_000, backups: int = 5):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        self._file.write("".join(json.dumps(r, default=str) + "\n" for r in records))
+        self._file.flush()
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{i}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backups > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class Agent_Instrumentation(TracingProcessor):
+    """
+    Local trace processor: span durations, model-call tokens, queue wait and TTFT.
+
+    The tracing callbacks only take a timestamp and put a small tuple on a bounded queue;
+    a background thread turns those into histogram observations and JSONL records, so a
+    slow disk or a scrape never adds latency to a run. When the queue is full, events are
+    dropped and counted rather than blocking.
+
+    Register it next to other processors, e.g.
+        set_trace_processors([GalileoTracingProcessor(), Agent_Instrumentation()])
+    or `add_trace_processor(Agent_Instrumentation())` to keep the existing ones.
+    """
+
+    def __init__(
+        self,
+        jsonl_path: Optional[str] = DEFAULT_JSONL_PATH,
+        max_bytes: int = 20_000_000,
+        backups: int = 5,
+        queue_size: int = 10_000,
+        flush_interval_s: float = 1.0,
+    ):
+        self._events: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=queue_size)
+        self._started: Dict[str, float] = {}
+        self._span_agent: Dict[str, str] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {name: {} for name in METRICS}
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.flush_interval_s = flush_interval_s
+        self._writer = Rotating_JSONL_Writer(jsonl_path, max_bytes, backups) if jsonl_path else None
+        self._worker = threading.Thread(target=self._drain, name="agent-instrumentation", daemon=True)
+        self._worker.start()
+        self._metrics_server: Optional[ThreadingHTTPServer] = None
+
+    # Request path: timestamps and a queue put only.
+
+    def _put(self, event: tuple) -> None:
+        try:
+            self._events.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def on_trace_start(self, trace: Trace) -> None:
+        self._started[trace.trace_id] = time.perf_counter()
+
+    def on_trace_end(self, trace: Trace) -> None:
+        started = self._started.pop(trace.trace_id, None)
+        if started is not None:
+            self._put(("trace", trace.name, time.perf_counter() - started, trace.trace_id))
+
+    def on_span_start(self, span: Span[Any]) -> None:
+        self._started[span.span_id] = time.perf_counter()
+        if span.span_data.type == "agent":
+            self._span_agent[span.span_id] = span.span_data.name
+
+    def on_span_end(self, span: Span[Any]) -> None:
+        started = self._started.pop(span.span_id, None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        data = span.span_data
+        kind = data.type
+        if kind == "agent":
+            self._span_agent.pop(span.span_id, None)
+            self._put(("agent", data.name, elapsed, span.trace_id))
+        elif kind == "function":
+            self._put(("tool", data.name, elapsed, span.trace_id, self._span_agent.get(span.parent_id or "")))
+        elif kind == "response":
+            usage = getattr(data.response, "usage", None) if data.response is not None else None
+            self._put(("response", self._span_agent.get(span.parent_id or "", "unknown"), elapsed, span.trace_id, usage))
+
+    def observe(self, metric: str, value: float, **labels: str) -> None:
+        """Record a value measured outside tracing (e.g. TTFT from a stream, runtime queue wait)."""
+        self._put(("observe", metric, value, labels))
+
+    def shutdown(self) -> None:
+        self.force_flush()
+        self._events.put(None)
+        self._worker.join(timeout=5)
+        if self._writer:
+            self._writer.close()
+        if self._metrics_server:
+            self._metrics_server.shutdown()
+
+    def force_flush(self) -> None:
+        deadline = time.time() + 5
+        while not self._events.empty() and time.time() < deadline:
+            time.sleep(0.01)
+
+    # Background thread.
+
+    def _record(self, metric: str, value: float, labels: Dict[str, str]) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            histogram = self._histograms[metric].get(key)
+            if histogram is None:
+                histogram = self._histograms[metric][key] = Histogram(METRICS[metric][1])
+            histogram.observe(value)
+
+    def _handle(self, event: tuple) -> Dict[str, Any]:
+        kind = event[0]
+        if kind == "observe":
+            _, metric, value, labels = event
+            self._record(metric, value, labels)
+            return {"type": metric, "value": value, **labels}
+        if kind == "trace":
+            _, name, elapsed, trace_id = event
+            self._record("trace_seconds", elapsed, {"workflow": name})
+            return {"type": "trace", "workflow": name, "seconds": elapsed, "trace_id": trace_id}
+        if kind == "agent":
+            _, name, elapsed, trace_id = event
+            self._record("agent_span_seconds", elapsed, {"agent": name})
+            return {"type": "agent", "agent": name, "seconds": elapsed, "trace_id": trace_id}
+        if kind == "tool":
+            _, name, elapsed, trace_id, agent = event
+            self._record("tool_span_seconds", elapsed, {"tool": name})
+            return {"type": "tool", "tool": name, "agent": agent, "seconds": elapsed, "trace_id": trace_id}
+
+        _, agent, elapsed, trace_id, usage = event
+        self._record("model_call_seconds", elapsed, {"agent": agent})
+        record = {"type": "model_call", "agent": agent, "seconds": elapsed, "trace_id": trace_id}
+        if usage is not None:
+            cached = getattr(getattr(usage, "input_tokens_details", None), "cached_tokens", 0) or 0
+            self._record("prompt_tokens", usage.input_tokens, {"agent": agent})
+            self._record("cached_prompt_tokens", cached, {"agent": agent})
+            self._record("uncached_prompt_tokens", usage.input_tokens - cached, {"agent": agent})
+            self._record("completion_tokens", usage.output_tokens, {"agent": agent})
+            record.update(
+                prompt_tokens=usage.input_tokens,
+                cached_prompt_tokens=cached,
+                uncached_prompt_tokens=usage.input_tokens - cached,
+                completion_tokens=usage.output_tokens,
+            )
+        return record
+
+    def _drain(self) -> None:
+        pending: List[Dict[str, Any]] = []
+        last_flush = time.monotonic()
+        while True:
+            try:
+                event = self._events.get(timeout=self.flush_interval_s)
+            except queue.Empty:
+                event = ()
+            if event is None:
+                break
+            if event:
+                try:
+                    record = self._handle(event)
+                    record["ts"] = time.time()
+                    pending.append(record)
+                except Exception:
+                    self.dropped += 1
+            if pending and (time.monotonic() - last_flush >= self.flush_interval_s or len(pending) >= 1_000):
+                self._flush(pending)
+                pending, last_flush = [], time.monotonic()
+        self._flush(pending)
+
+    def _flush(self, records: List[Dict[str, Any]]) -> None:
+        if self._writer and records:
+            try:
+                self._writer.write(records)
+            except OSError:
+                self.dropped += len(records)
+
+    # Reading.
+
+    def snapshot(self) -> Dict[str, Dict[LabelKey, Dict[str, float]]]:
+        """count/sum/p50/p95 per metric and label set."""
+        with self._lock:
+            return {
+                metric: {
+                    key: {"count": h.count, "sum": h.sum, "p50": h.quantile(0.5), "p95": h.quantile(0.95)}
+                    for key, h in series.items()
+                }
+                for metric, series in self._histograms.items()
+                if series
+            }
+
+    def prometheus_text(self) -> str:
+        """Current histograms in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for metric, series in self._histograms.items():
+                name = f"agent_{metric}"
+                lines.append(f"# HELP {name} {METRICS[metric][0]}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, h in series.items():
+                    labels = ",".join(f'{k}="{v}"' for k, v in key)
+                    running = 0
+                    for bound, n in zip(h.bounds + (float("inf"),), h.counts):
+                        running += n
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f'{name}_bucket{{{labels + "," if labels else ""}le="{le}"}} {running}')
+                    lines.append(f"{name}_sum{{{labels}}} {h.sum:.6f}")
+                    lines.append(f"{name}_count{{{labels}}} {h.count}")
+        lines.append("# TYPE agent_instrumentation_dropped_events counter")
+        lines.append(f"agent_instrumentation_dropped_events {self.dropped}")
+        return "\n".join(lines) + "\n"
+
+    def serve_metrics(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve `prometheus_text()` at `http://host:port/metrics` from a daemon thread."""
+        instrumentation = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = instrumentation.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._metrics_server = ThreadingHTTPServer((host, port), Handler)
+        self._metrics_server.daemon_threads = True
+        threading.Thread(target=self._metrics_server.serve_forever, name="agent-metrics-http", daemon=True).start()
+        return self._metrics_server
@@ -0,0 +1,307 @@
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import os
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+# Import Necessary Libraries
+from src.Agents import Agent_Registry
+
+if TYPE_CHECKING:
+    # Importing the instrumentation imports all of `agents`; the runtime only needs it once tracing is configured.
+    from src.Runtime.Agent_Instrumentation import Agent_Instrumentation
+
+T = TypeVar("T")
+
+
+class Turn_Metrics(BaseModel):
+    turns: int
+    overhead_p50_ms: float
+    "Script start -> coroutine running on the loop (everything a turn pays before the model call)"
+    overhead_p95_ms: float
+    total_p50_ms: float
+    total_p95_ms: float
+
+
+class _Stream_Error:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_STREAM_DONE = object()
+
+
+class Agent_Runtime:
+    """
+    One long-lived asyncio event loop on a daemon thread, shared by every Streamlit rerun.
+
+    Keeping the loop alive keeps the OpenAI client's HTTP connection pool (and anything
+    else bound to the loop) warm between turns, instead of tearing it down with a fresh
+    `asyncio.run(...)` per message.
+    """
+
+    def __init__(self, max_turn_history: int = 500):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run_loop, name="agent-runtime-loop", daemon=True)
+        self.thread.start()
+        self._resources: Dict[str, Any] = {}
+        self._resources_lock = threading.Lock()
+        self._overhead: Deque[float] = collections.deque(maxlen=max_turn_history)
+        self._total: Deque[float] = collections.deque(maxlen=max_turn_history)
+        self.instrumentation: Optional["Agent_Instrumentation"] = None
+        self._ready = threading.Event()
+        self._ready.set()
+        self._bootstrap_error: Optional[BaseException] = None
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Awaitable[T], turn_started: Optional[float] = None) -> "concurrent.futures.Future[T]":
+        """
+        Schedule a coroutine on the runtime loop from any thread.
+
+        Args:
+            coro: Coroutine to run.
+            turn_started: `time.perf_counter()` at the start of the Streamlit turn; when given,
+                the delay until the coroutine starts and its total duration are recorded.
+        """
+
+        async def timed() -> T:
+            if not self._ready.is_set():
+                await asyncio.to_thread(self._ready.wait)
+            if self._bootstrap_error is not None:
+                if asyncio.iscoroutine(coro):
+                    coro.close()
+                raise RuntimeError("Agent runtime bootstrap failed") from self._bootstrap_error
+            if turn_started is not None:
+                self._overhead.append(time.perf_counter() - turn_started)
+                if self.instrumentation is not None:
+                    self.instrumentation.observe("queue_wait_seconds", self._overhead[-1], source="agent_runtime")
+            try:
+                return await coro
+            finally:
+                if turn_started is not None:
+                    self._total.append(time.perf_counter() - turn_started)
+
+        return asyncio.run_coroutine_threadsafe(timed(), self.loop)
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None, turn_started: Optional[float] = None) -> T:
+        """Run a coroutine on the runtime loop and block until it finishes."""
+        future = self.submit(coro, turn_started)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def iterate(
+        self,
+        factory: Callable[[], AsyncIterator[T]],
+        turn_started: Optional[float] = None,
+    ) -> Iterator[T]:
+        """
+        Consume an async iterator created on the runtime loop as a plain iterator.
+
+        `factory` is called on the loop (so it may create tasks, e.g. `Runner.run_streamed`)
+        and items are handed to the calling thread through a queue, so Streamlit can render
+        from its own script thread. Closing the iterator early cancels the producer.
+        """
+        items: "queue.Queue[Any]" = queue.Queue()
+
+        async def pump() -> None:
+            try:
+                async for item in factory():
+                    items.put(item)
+            except BaseException as e:
+                items.put(_Stream_Error(e))
+                raise
+            finally:
+                items.put(_STREAM_DONE)
+
+        future = self.submit(pump(), turn_started)
+        try:
+            while True:
+                try:
+                    item = items.get(timeout=0.1)
+                except queue.Empty:
+                    # `pump` never ran (e.g. bootstrap failed and it was closed unstarted),
+                    # so nothing will reach the queue: surface the future's outcome instead.
+                    if future.done():
+                        if not future.cancelled() and future.exception() is not None:
+                            raise future.exception()
+                        return
+                    continue
+                if item is _STREAM_DONE:
+                    return
+                if isinstance(item, _Stream_Error):
+                    raise item.error
+                yield item
+        finally:
+            if not future.done():
+                future.cancel()
+
+    def resource(self, key: str, factory: Callable[[], T]) -> T:
+        """Create a process-wide resource once and return the same instance on every call."""
+        with self._resources_lock:
+            if key not in self._resources:
+                self._resources[key] = factory()
+            return self._resources[key]
+
+    def agent(self, name: str):
+        """Import and return a registered agent (see `Agent_Registry`) once per process."""
+        return Agent_Registry.get(name)
+
+    def bootstrap(self, *steps: Callable[["Agent_Runtime"], None]) -> None:
+        """
+        Run setup steps on a background thread so the caller (a Streamlit script) can render
+        immediately. Coroutines submitted meanwhile wait for the steps to finish; if a step
+        fails, they raise instead of running half-configured.
+        """
+        self._ready.clear()
+
+        def run_steps() -> None:
+            try:
+                for step in steps:
+                    step(self)
+            except BaseException as e:
+                self._bootstrap_error = e
+            finally:
+                self._ready.set()
+
+        threading.Thread(target=run_steps, name="agent-runtime-bootstrap", daemon=True).start()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until `bootstrap` has finished; False on timeout."""
+        return self._ready.wait(timeout)
+
+    def metrics(self) -> Turn_Metrics:
+        def pct(values: Deque[float], q: float) -> float:
+            if not values:
+                return 0.0
+            ordered = sorted(values)
+            return 1000 * ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+        return Turn_Metrics(
+            turns=len(self._total),
+            overhead_p50_ms=pct(self._overhead, 0.5),
+            overhead_p95_ms=pct(self._overhead, 0.95),
+            total_p50_ms=pct(self._total, 0.5),
+            total_p95_ms=pct(self._total, 0.95),
+        )
+
+
+_runtime: Optional[Agent_Runtime] = None
+_runtime_lock = threading.Lock()
+
+
+def load_secrets(path: str = ".streamlit/secrets.toml") -> None:
+    """
+    Copy Streamlit secrets into the environment (agents read their settings from it), then
+    fill anything still unset from `.env`.
+    """
+    from dotenv import load_dotenv
+
+    if os.path.exists(path):
+        import toml
+        for key, value in toml.load(path).items():
+            os.environ[key] = str(value)
+    load_dotenv()
+
+
+def configure_tracing(runtime: Agent_Runtime) -> None:
+    """
+    Register the Galileo trace processor alongside the local instrumentation processor.
+
+    Local span metrics go to `AGENT_METRICS_JSONL` and, when `AGENT_METRICS_PORT` is set,
+    to a Prometheus endpoint on that port.
+    """
+    from agents import set_trace_processors
+    from galileo.handlers.openai_agents import GalileoTracingProcessor
+    from src.Runtime.Agent_Instrumentation import Agent_Instrumentation
+
+    runtime.instrumentation = Agent_Instrumentation()
+    if os.getenv("AGENT_METRICS_PORT"):
+        runtime.instrumentation.serve_metrics(int(os.environ["AGENT_METRICS_PORT"]))
+    set_trace_processors([GalileoTracingProcessor(), runtime.instrumentation])
+
+
+def configure_openai_client(runtime: Agent_Runtime) -> None:
+    """Create one AsyncOpenAI client on the runtime loop and make it the agents' default."""
+    from agents import set_default_openai_client
+    from openai import AsyncOpenAI
+
+    async def create() -> AsyncOpenAI:
+        return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_API_BASE"))
+
+    # Straight onto the loop: `runtime.run` would wait for the bootstrap this runs in.
+    set_default_openai_client(asyncio.run_coroutine_threadsafe(create(), runtime.loop).result())
+
+
+def get_runtime(secrets_path: str = ".streamlit/secrets.toml", tracing: bool = True) -> Agent_Runtime:
+    """
+    Process-wide runtime, bootstrapped on first call.
+
+    The first call loads secrets and starts registering tracing and creating the shared
+    OpenAI client in the background (those import `galileo`, `agents` and `openai`), so the
+    page renders before they finish; the first turn waits for them. Later calls (every
+    Streamlit rerun) return the same runtime immediately.
+    """
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            load_secrets(secrets_path)
+            runtime = Agent_Runtime()
+            runtime.bootstrap(*([configure_tracing] if tracing else []), configure_openai_client)
+            _runtime = runtime
+        return _runtime
+
+
+def benchmark_turn_overhead(turns: int = 50, secrets_path: str = ".streamlit/secrets.toml") -> Dict[str, float]:
+    """
+    Per-turn setup cost without a model call: the old pattern (parse secrets, new event loop,
+    new OpenAI client per message) vs. submitting to the shared runtime.
+
+    Returns:
+        Mean milliseconds per turn for `before` and `after`.
+    """
+    from openai import AsyncOpenAI
+
+    async def noop_turn() -> None:
+        AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY", "sk-benchmark"), base_url=os.getenv("OPENAI_API_BASE"))
+        await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    for _ in range(turns):
+        load_secrets(secrets_path)
+        asyncio.run(noop_turn())
+    before = (time.perf_counter() - started) / turns
+
+    runtime = Agent_Runtime()
+
+    async def shared_turn() -> None:
+        await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    for _ in range(turns):
+        runtime.run(shared_turn())
+    after = (time.perf_counter() - started) / turns
+    return {"before_ms": before * 1000, "after_ms": after * 1000}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure per-turn runtime overhead before/after the shared loop.")
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args(argv)
+    result = benchmark_turn_overhead(args.turns)
+    print(f"before: {result['before_ms']:.2f} ms/turn  after: {result['after_ms']:.2f} ms/turn")
+
+
+if __name__ == "__main__":
+    main()
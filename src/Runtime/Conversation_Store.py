@@ -0,0 +1,394 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.getenv("CONVERSATION_STORE_PATH", "Data/Intermediate/conversations.sqlite")
+
+SUMMARY_PREFIX = "Summary of the earlier conversation (older turns were compacted):\n"
+
+SUMMARIZER_PROMPT = '''
+You compact chat history for a workforce-planning assistant.
+Merge the previous summary (if any) and the transcript into one concise summary that preserves:
+- the user's goals, company/function/team context and constraints;
+- every number, score, scenario result and assumption that was stated or agreed;
+- open questions and decisions still pending;
+- sources/citations referenced, by name.
+Drop greetings, repetition and tool-call mechanics. Write in terse bullet points.
+'''
+
+# Summarizer: (previous summary, items to fold in) -> new summary
+Summarizer = Callable[[str, List[dict]], Awaitable[str]]
+
+
+class Compaction_Config(BaseModel):
+    token_budget: int = 12_000
+    "Compact once summary + retained history exceeds this many tokens"
+    keep_turns: int = 4
+    "Most recent user turns (with their tool calls and answers) kept verbatim"
+    summary_max_tokens: int = 1_500
+    "Summaries longer than this are truncated before being stored"
+
+
+class Turn_Record(BaseModel):
+    session_id: str
+    turn: int
+    prompt_tokens: int
+    "History sent with the turn (summary + retained items) plus the new user input; excludes instructions and tool schemas"
+    history_items: int
+    latency_s: float
+    "Time from history load to the turn being saved, i.e. the agent run"
+    compacted: bool
+    "The turn pushed the history over budget and started a compaction"
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    import tiktoken
+    return tiktoken.get_encoding("o200k_base")
+
+
+def count_item_tokens(item: Union[dict, str]) -> int:
+    """Approximate prompt tokens of one input item (its JSON form for non-text items)."""
+    if isinstance(item, dict) and isinstance(item.get("content"), str):
+        text = item["content"]
+    else:
+        text = item if isinstance(item, str) else json.dumps(item, ensure_ascii=False)
+    try:
+        return len(_encoding().encode(text, disallowed_special=()))
+    except Exception:
+        return max(1, len(text) // 4)
+
+
+def _is_user_message(item: dict) -> bool:
+    return item.get("role") == "user" and item.get("type", "message") == "message"
+
+
+class Connection_Pool:
+    """Fixed-size pool of SQLite connections in WAL mode, shared across threads."""
+
+    def __init__(self, path: str, size: int = 4):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._pool.put(conn)
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+class Compacting_Session:
+    """
+    `Session` for one user whose history stays within a token budget.
+
+    Implements the `agents` session protocol structurally rather than subclassing
+    `SessionABC`, so the Streamlit apps can open a store without importing `agents`.
+
+    Items are stored with their token counts. Once the summary plus the retained items
+    exceed `Compaction_Config.token_budget`, everything before the last `keep_turns` user
+    turns is folded into a running summary, which `get_items` returns ahead of the
+    retained items.
+    """
+
+    def __init__(self, session_id: str, store: "Conversation_Store"):
+        self.session_id = session_id
+        self.store = store
+        self._compaction_lock = asyncio.Lock()
+        self._compaction_task: Optional[asyncio.Task] = None
+        self._loaded_at: Optional[float] = None
+        self._loaded_tokens = 0
+        self._loaded_items = 0
+
+    async def get_items(self, limit: Optional[int] = None) -> List[dict]:
+        summary, summary_tokens, rows = await asyncio.to_thread(self.store._load, self.session_id)
+        if limit is not None:
+            return [item for _, item, _ in rows[-limit:]] if limit > 0 else []
+        self._loaded_at = time.perf_counter()
+        self._loaded_tokens = summary_tokens + sum(tokens for _, _, tokens in rows)
+        self._loaded_items = len(rows)
+        items = [item for _, item, _ in rows]
+        if summary:
+            items.insert(0, {"role": "system", "content": SUMMARY_PREFIX + summary})
+        return items
+
+    async def add_items(self, items: List[dict]) -> None:
+        if not items:
+            return
+        tokens = [count_item_tokens(item) for item in items]
+        input_tokens = 0
+        for item, n in zip(items, tokens):
+            if not _is_user_message(item):
+                break
+            input_tokens += n
+        retained_tokens = await asyncio.to_thread(self.store._insert, self.session_id, items, tokens)
+
+        # Summarizing is a model call; run it off the turn so the reply is not held up by it.
+        compacted = False
+        budget = self.store.config.token_budget
+        if budget > 0 and retained_tokens > budget and not self._compaction_lock.locked():
+            self._compaction_task = asyncio.create_task(self.compact())
+            self._compaction_task.add_done_callback(self._log_compaction_failure)
+            compacted = True
+        if self._loaded_at is not None:
+            await asyncio.to_thread(
+                self.store._record_turn,
+                self.session_id,
+                self._loaded_tokens + input_tokens,
+                self._loaded_items,
+                time.perf_counter() - self._loaded_at,
+                compacted,
+            )
+            self._loaded_at = None
+
+    def _log_compaction_failure(self, task: asyncio.Task) -> None:
+        """Done-callback of the background compaction: nothing awaits it, so surface its error here."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Compaction failed for session %s", self.session_id, exc_info=task.exception())
+
+    async def compact(self, force: bool = False) -> bool:
+        """
+        Fold older turns into the summary if the history is over budget (or `force`).
+
+        Returns:
+            True if anything was compacted.
+        """
+        config = self.store.config
+        async with self._compaction_lock:
+            summary, summary_tokens, rows = await asyncio.to_thread(self.store._load, self.session_id)
+            total = summary_tokens + sum(tokens for _, _, tokens in rows)
+            if not force and total <= config.token_budget:
+                return False
+            user_positions = [i for i, (_, item, _) in enumerate(rows) if _is_user_message(item)]
+            if len(user_positions) <= config.keep_turns:
+                return False
+            cut = user_positions[-config.keep_turns] if config.keep_turns > 0 else len(rows)
+            folded = [item for _, item, _ in rows[:cut]]
+            new_summary = await self.store.summarizer(summary, folded)
+            new_summary = _truncate_tokens(new_summary, config.summary_max_tokens)
+            await asyncio.to_thread(
+                self.store._save_summary,
+                self.session_id,
+                new_summary,
+                count_item_tokens(new_summary),
+                rows[cut - 1][0],
+            )
+            return True
+
+    async def pop_item(self) -> Optional[dict]:
+        return await asyncio.to_thread(self.store._pop, self.session_id)
+
+    async def clear_session(self) -> None:
+        await asyncio.to_thread(self.store._clear, self.session_id)
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    try:
+        encoding = _encoding()
+        ids = encoding.encode(text, disallowed_special=())
+        return text if len(ids) <= max_tokens else encoding.decode(ids[:max_tokens])
+    except Exception:
+        return text[: max_tokens * 4]
+
+
+def _transcript(items: List[dict]) -> str:
+    lines = []
+    for item in items:
+        if isinstance(item.get("content"), str):
+            lines.append(f"{item.get('role', item.get('type'))}: {item['content']}")
+        elif item.get("type") == "message":
+            text = " ".join(part.get("text", "") for part in item.get("content", []) if isinstance(part, dict))
+            lines.append(f"{item.get('role')}: {text}")
+        elif item.get("type") == "function_call_output":
+            lines.append(f"tool result: {str(item.get('output'))[:2_000]}")
+    return "\n".join(lines)
+
+
+async def agent_summarizer(previous_summary: str, items: List[dict]) -> str:
+    """Summarize with a small low-effort agent on `LLM_MODEL`."""
+    from agents import Agent, Runner
+    from agents.model_settings import ModelSettings
+
+    summarizer = Agent(
+        name="Conversation_Summarizer",
+        instructions=SUMMARIZER_PROMPT,
+        model=os.getenv("LLM_MODEL"),
+        model_settings=ModelSettings(reasoning={"effort": "low"}),
+    )
+    result = await Runner.run(
+        summarizer,
+        f"<previous_summary>\n{previous_summary}\n</previous_summary>\n<transcript>\n{_transcript(items)}\n</transcript>",
+    )
+    return str(result.final_output)
+
+
+async def extractive_summarizer(previous_summary: str, items: List[dict]) -> str:
+    """Model-free fallback: keep the previous summary and the text of each folded message."""
+    return "\n".join(part for part in (previous_summary, _transcript(items)) if part)
+
+
+class Conversation_Store:
+    """
+    Per-user conversation histories in one SQLite database.
+
+    Example:
+        store = Conversation_Store()
+        session = store.session(user_id)
+        await Runner.run(agent, prompt, session=session)
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_DB_PATH,
+        config: Optional[Compaction_Config] = None,
+        summarizer: Optional[Summarizer] = None,
+        pool_size: int = 4,
+    ):
+        self.config = config or Compaction_Config()
+        self.summarizer = summarizer or agent_summarizer
+        self.pool = Connection_Pool(path, pool_size)
+        self._sessions: Dict[str, Compacting_Session] = {}
+        self._sessions_lock = threading.Lock()
+        with self.pool.connection() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS conversation_items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL,
+                    item TEXT NOT NULL,
+                    tokens INTEGER NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_conversation_items_session ON conversation_items (session_id, id);
+                CREATE TABLE IF NOT EXISTS conversation_summaries (
+                    session_id TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    tokens INTEGER NOT NULL,
+                    through_id INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS conversation_turns (
+                    session_id TEXT NOT NULL,
+                    turn INTEGER NOT NULL,
+                    prompt_tokens INTEGER NOT NULL,
+                    history_items INTEGER NOT NULL,
+                    latency_s REAL NOT NULL,
+                    compacted INTEGER NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                """
+            )
+
+    def session(self, user_id: str) -> Compacting_Session:
+        """The session for one user, created on first use and reused afterwards."""
+        with self._sessions_lock:
+            if user_id not in self._sessions:
+                self._sessions[user_id] = Compacting_Session(user_id, self)
+            return self._sessions[user_id]
+
+    def turn_metrics(self, session_id: Optional[str] = None) -> "pd.DataFrame":
+        """Recorded turns (all users, or one) as a DataFrame of `Turn_Record` columns."""
+        import pandas as pd
+
+        query = "SELECT session_id, turn, prompt_tokens, history_items, latency_s, compacted FROM conversation_turns"
+        params: Tuple = ()
+        if session_id is not None:
+            query += " WHERE session_id = ?"
+            params = (session_id,)
+        with self.pool.connection() as conn:
+            rows = conn.execute(query + " ORDER BY created_at", params).fetchall()
+        return pd.DataFrame(
+            [Turn_Record(session_id=r[0], turn=r[1], prompt_tokens=r[2], history_items=r[3], latency_s=r[4], compacted=bool(r[5])).model_dump() for r in rows],
+            columns=list(Turn_Record.model_fields),
+        )
+
+    def close(self) -> None:
+        self.pool.close()
+
+    # Synchronous storage operations, run in worker threads by the sessions.
+
+    def _load(self, session_id: str) -> Tuple[str, int, List[Tuple[int, dict, int]]]:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT summary, tokens, through_id FROM conversation_summaries WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            summary, summary_tokens, through_id = row if row else ("", 0, 0)
+            rows = conn.execute(
+                "SELECT id, item, tokens FROM conversation_items WHERE session_id = ? AND id > ? ORDER BY id",
+                (session_id, through_id),
+            ).fetchall()
+        return summary, summary_tokens, [(i, json.loads(item), tokens) for i, item, tokens in rows]
+
+    def _insert(self, session_id: str, items: List[dict], tokens: List[int]) -> int:
+        """Append items; returns the session's retained tokens (summary + unsummarized items)."""
+        now = time.time()
+        with self.pool.connection() as conn:
+            conn.executemany(
+                "INSERT INTO conversation_items (session_id, item, tokens, created_at) VALUES (?, ?, ?, ?)",
+                [(session_id, json.dumps(item), n, now) for item, n in zip(items, tokens)],
+            )
+            (retained,) = conn.execute(
+                "SELECT COALESCE((SELECT tokens FROM conversation_summaries WHERE session_id = ?), 0) "
+                "+ COALESCE((SELECT SUM(tokens) FROM conversation_items WHERE session_id = ?), 0)",
+                (session_id, session_id),
+            ).fetchone()
+        return retained
+
+    def _save_summary(self, session_id: str, summary: str, tokens: int, through_id: int) -> None:
+        with self.pool.connection() as conn:
+            conn.execute(
+                "INSERT INTO conversation_summaries (session_id, summary, tokens, through_id) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET summary = excluded.summary, tokens = excluded.tokens, "
+                "through_id = excluded.through_id",
+                (session_id, summary, tokens, through_id),
+            )
+            conn.execute("DELETE FROM conversation_items WHERE session_id = ? AND id <= ?", (session_id, through_id))
+
+    def _record_turn(self, session_id: str, prompt_tokens: int, history_items: int, latency_s: float, compacted: bool) -> None:
+        with self.pool.connection() as conn:
+            (turn,) = conn.execute("SELECT COUNT(*) FROM conversation_turns WHERE session_id = ?", (session_id,)).fetchone()
+            conn.execute(
+                "INSERT INTO conversation_turns VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (session_id, turn + 1, prompt_tokens, history_items, latency_s, int(compacted), time.time()),
+            )
+
+    def _pop(self, session_id: str) -> Optional[dict]:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT id, item FROM conversation_items WHERE session_id = ? ORDER BY id DESC LIMIT 1", (session_id,)
+            ).fetchone()
+            if row:
+                conn.execute("DELETE FROM conversation_items WHERE id = ?", (row[0],))
+        return json.loads(row[1]) if row else None
+
+    def _clear(self, session_id: str) -> None:
+        with self.pool.connection() as conn:
+            conn.execute("DELETE FROM conversation_items WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM conversation_summaries WHERE session_id = ?", (session_id,))
@@ -0,0 +1,33 @@
+import os
+import re
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from agents.model_settings import ModelSettings
+
+# Prefix of every `prompt_cache_key`; requests sharing a key are routed to the same cache,
+# so one key per static prefix (agent) keeps concurrent calls hitting each other's prefix.
+PROMPT_CACHE_KEY_PREFIX = os.getenv("PROMPT_CACHE_KEY_PREFIX", "workforce-modeling")
+
+
+def static_prompt(text: str) -> str:
+    """
+    Canonical, byte-stable form of a static prompt.
+
+    Strips trailing whitespace from every line, collapses runs of blank lines and trims the
+    ends, so re-indenting or re-saving a prompt file cannot change its bytes (and its cache
+    prefix) without a visible edit. Per-request content belongs in the input, after it.
+    """
+    lines = [line.rstrip() for line in text.strip().splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+
+def prompt_cache_key(name: str) -> str:
+    return f"{PROMPT_CACHE_KEY_PREFIX}:{name}"
+
+
+def cached_model_settings(name: str, settings: Optional["ModelSettings"] = None) -> "ModelSettings":
+    """`settings` with a `prompt_cache_key` for `name`, merged into any existing `extra_args`."""
+    from agents.model_settings import ModelSettings
+
+    return (settings or ModelSettings()).resolve(ModelSettings(extra_args={"prompt_cache_key": prompt_cache_key(name)}))
@@ -0,0 +1,183 @@
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# `type` of a streamed text delta (openai.types.responses.ResponseTextDeltaEvent); compared by
+# value so rendering does not import `openai`.
+TEXT_DELTA_EVENT_TYPE = "response.output_text.delta"
+
+# Tool calls the Responses API runs server-side; they are complete when the agent reports them.
+HOSTED_TOOL_CALL_TYPES = {"file_search_call", "web_search_call", "code_interpreter_call", "image_generation_call"}
+
+
+class Stream_Renderer:
+    """
+    Renders a streamed answer into a Streamlit container without re-sending the whole text.
+
+    Deltas are buffered and drawn at most every `min_interval_s` unless `min_chars` have
+    piled up. Text up to the last paragraph break (outside code fences) is written once as a
+    finalized block; only the trailing, still-growing paragraph is redrawn. Tool calls are
+    shown above the answer as they start and finish.
+
+    Args:
+        container: Any Streamlit container (`st`, `st.container()`, a chat message, ...).
+        min_interval_s: Minimum time between redraws of the growing paragraph.
+        min_chars: Redraw early once this many characters are waiting.
+    """
+
+    def __init__(
+        self,
+        container,
+        min_interval_s: float = 0.1,
+        min_chars: int = 120,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.container = container
+        self.min_interval_s = min_interval_s
+        self.min_chars = min_chars
+        self.clock = clock
+        self.text = ""
+        self.renders = 0
+        self.rendered_chars = 0
+        "Characters sent to the page, to compare against re-rendering the whole answer per delta"
+        self._progress = container.empty()
+        self._tail_placeholder = container.empty()
+        self._tail = ""
+        self._unrendered = 0
+        self._last_render = 0.0
+        self._in_fence = False
+        self._tools: Dict[str, Dict[str, Any]] = {}
+
+    def on_delta(self, delta: str) -> None:
+        self.text += delta
+        self._tail += delta
+        self._unrendered += len(delta)
+        if self._unrendered >= self.min_chars or self.clock() - self._last_render >= self.min_interval_s:
+            self._render(cursor=True)
+
+    def on_tool_started(self, call_id: str, name: str, done: bool = False) -> None:
+        self._tools[call_id] = {"name": name, "started": self.clock(), "elapsed": 0.0 if done else None}
+        self._render_progress()
+
+    def on_tool_finished(self, call_id: str) -> None:
+        tool = self._tools.get(call_id)
+        if tool is not None and tool["elapsed"] is None:
+            tool["elapsed"] = self.clock() - tool["started"]
+            self._render_progress()
+
+    def on_event(self, event) -> None:
+        """Dispatch one `Runner.run_streamed(...).stream_events()` event."""
+        if event.type == "raw_response_event":
+            if getattr(event.data, "type", None) == TEXT_DELTA_EVENT_TYPE:
+                self.on_delta(event.data.delta)
+        elif event.type == "run_item_stream_event":
+            raw = event.item.raw_item
+            if event.name == "tool_called":
+                kind = getattr(raw, "type", None)
+                call_id = getattr(raw, "call_id", None) or getattr(raw, "id", None) or str(len(self._tools))
+                if kind in HOSTED_TOOL_CALL_TYPES:
+                    self.on_tool_started(call_id, kind[: -len("_call")], done=True)
+                else:
+                    self.on_tool_started(call_id, getattr(raw, "name", None) or str(kind))
+            elif event.name == "tool_output":
+                call_id = raw.get("call_id") if isinstance(raw, dict) else getattr(raw, "call_id", None)
+                if call_id:
+                    self.on_tool_finished(call_id)
+
+    def finish(self) -> str:
+        """Draw the remaining text, mark open tool calls finished and return the full answer."""
+        for call_id in list(self._tools):
+            self.on_tool_finished(call_id)
+        self._render(cursor=False)
+        return self.text
+
+    def _render(self, cursor: bool) -> None:
+        boundary = self._last_block_boundary()
+        if boundary > 0:
+            block, self._tail = self._tail[:boundary], self._tail[boundary + 2:]
+            self._in_fence ^= _fence_count(block) % 2 == 1
+            self._draw(self._tail_placeholder, block)
+            self._tail_placeholder = self.container.empty()
+        if self._tail:
+            self._draw(self._tail_placeholder, self._tail + (" ▌" if cursor else ""))
+        self._unrendered = 0
+        self._last_render = self.clock()
+
+    def _last_block_boundary(self) -> int:
+        """Index of the last paragraph break in the tail that is not inside a code fence (-1 if none)."""
+        search_end = len(self._tail)
+        while True:
+            boundary = self._tail.rfind("\n\n", 0, search_end)
+            if boundary <= 0:
+                return -1
+            fences_open = self._in_fence ^ (_fence_count(self._tail[:boundary]) % 2 == 1)
+            if not fences_open:
+                return boundary
+            search_end = boundary
+
+    def _draw(self, placeholder, text: str) -> None:
+        placeholder.markdown(text)
+        self.renders += 1
+        self.rendered_chars += len(text)
+
+    def _render_progress(self) -> None:
+        lines: List[str] = []
+        for tool in self._tools.values():
+            if tool["elapsed"] is None:
+                lines.append(f"- ⏳ `{tool['name']}` running…")
+            else:
+                lines.append(f"- ✅ `{tool['name']}` done ({tool['elapsed']:.1f}s)")
+        self._progress.markdown("\n".join(lines))
+
+
+def _fence_count(text: str) -> int:
+    return sum(1 for line in text.split("\n") if line.lstrip().startswith("```"))
+
+
+def stream_agent_reply(
+    runtime,
+    agent,
+    prompt: str,
+    container,
+    session=None,
+    turn_started: Optional[float] = None,
+    agent_name: Optional[str] = None,
+    results_store=None,
+    **renderer_kwargs,
+) -> str:
+    """
+    Run `agent` streamed on the shared runtime and render it incrementally into `container`.
+
+    Records time-to-first-token with the runtime's instrumentation when it is enabled, and
+    persists calculator/scenario tool results to `results_store` (an `Assessment_Store`)
+    when one is given. Search results of earlier turns are trimmed to cited excerpts
+    before they are sent back (`Prompt_Assembly.prompt_run_config`).
+
+    Returns:
+        The full answer text.
+    """
+    from agents import Runner
+
+    from src.Agents.Prompt_Assembly import prompt_run_config
+
+    renderer = Stream_Renderer(container, **renderer_kwargs)
+
+    runs = []
+
+    def events():
+        runs.append(Runner.run_streamed(agent, input=prompt, session=session, run_config=prompt_run_config()))
+        return runs[-1].stream_events()
+
+    for event in runtime.iterate(events, turn_started=turn_started):
+        if (
+            not renderer.text
+            and turn_started is not None
+            and runtime.instrumentation is not None
+            and event.type == "raw_response_event"
+            and getattr(event.data, "type", None) == TEXT_DELTA_EVENT_TYPE
+        ):
+            runtime.instrumentation.observe("ttft_seconds", time.perf_counter() - turn_started, agent=agent_name or agent.name)
+        renderer.on_event(event)
+    text = renderer.finish()
+    if results_store is not None and runs:
+        results_store.record_run_items(runs[-1].new_items, source="chat", run_id=getattr(session, "session_id", None))
+    return text
@@ -0,0 +1,309 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Literal, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+# Import Necessary Libraries
+from src.Scenarios.Workforce_Scenario_Engine import (
+    DEFAULT_ASSUMPTIONS,
+    MONTHS,
+    SCENARIOS,
+    Role_Baseline,
+    Scenario_Assumptions,
+    Team_Baseline,
+    assumption_arrays,
+    baseline_arrays,
+    project_scenarios,
+)
+
+PERCENTILES = (10, 50, 90)
+
+
+class Distribution(BaseModel):
+    kind: Literal["fixed", "uniform", "normal", "triangular", "beta", "lognormal"]
+    a: float
+    "fixed: value; uniform/triangular: low; normal/lognormal: mean (of log for lognormal); beta: alpha"
+    b: float = 0.0
+    "uniform: high; triangular: mode; normal/lognormal: std; beta: beta"
+    c: float = 0.0
+    "triangular: high"
+    low: Optional[float] = None
+    high: Optional[float] = None
+    "Optional clipping bounds applied after sampling"
+
+    def sample(self, rng: np.random.Generator, size) -> np.ndarray:
+        if self.kind == "fixed":
+            values = np.full(size, self.a, dtype=np.float64)
+        elif self.kind == "uniform":
+            values = rng.uniform(self.a, self.b, size)
+        elif self.kind == "normal":
+            values = rng.normal(self.a, self.b, size)
+        elif self.kind == "triangular":
+            values = rng.triangular(self.a, self.b, self.c, size)
+        elif self.kind == "beta":
+            values = rng.beta(self.a, self.b, size)
+        else:
+            values = rng.lognormal(self.a, self.b, size)
+        if self.low is not None or self.high is not None:
+            values = np.clip(values, self.low, self.high)
+        return values
+
+
+class Monte_Carlo_Config(BaseModel):
+    draws: int = 100_000
+    "Draws per team"
+    batch_draws: int = 50_000
+    "Draws evaluated per vectorized batch; bounds memory per worker (only per-batch histograms are kept across batches)"
+    histogram_bins: int = 8_192
+    "Bins per output cell used to estimate percentiles when there is more than one batch"
+    seed: int = 20240901
+    workers: int = 1
+    "Process-pool size; 1 runs in-process"
+    automation_uptake: Distribution = Distribution(kind="triangular", a=0.5, b=1.0, c=1.4, low=0.0)
+    "Multiplier on each scenario's max_reduction (1.0 = the deterministic assumption)"
+    annual_attrition: Distribution = Distribution(kind="beta", a=4.0, b=30.0)
+    "Annual natural attrition rate; reductions it absorbs carry no severance"
+    transition_cost_ratio: Distribution = Distribution(kind="triangular", a=0.2, b=0.35, c=0.6)
+    "One-time cost per removed or relocated FTE as a share of its annual cost"
+    offshore_wage_ratio: Distribution = Distribution(kind="lognormal", a=0.0, b=0.15, low=0.5, high=2.0)
+    "Multiplier on near/offshore cost per FTE (wage arbitrage erosion > 1, deepening < 1)"
+
+
+class Monte_Carlo_Results(BaseModel):
+    """Percentile arrays are indexed [team, percentile, scenario, month] or [team, percentile, scenario]."""
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    teams: List[str]
+    percentiles: List[int]
+    draws: int
+    fte: np.ndarray
+    cumulative_pct_change: np.ndarray
+    run_rate_cost: np.ndarray
+    cumulative_savings: np.ndarray
+    cumulative_savings_pct: np.ndarray
+    elapsed_s: float
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long table: one row per team, scenario and month with P10/P50/P90 columns."""
+        rows = []
+        for t, team in enumerate(self.teams):
+            for s, scenario in enumerate(SCENARIOS):
+                for m, month in enumerate(MONTHS):
+                    row = {"team": team, "scenario": scenario, "month": month}
+                    for p, percentile in enumerate(self.percentiles):
+                        row[f"fte_p{percentile}"] = self.fte[t, p, s, m]
+                        row[f"pct_change_p{percentile}"] = self.cumulative_pct_change[t, p, s, m]
+                        row[f"run_rate_cost_p{percentile}"] = self.run_rate_cost[t, p, s, m]
+                    rows.append(row)
+        return pd.DataFrame(rows)
+
+    def savings_frame(self) -> pd.DataFrame:
+        """One row per team and scenario with P10/P50/P90 cumulative savings."""
+        rows = []
+        for t, team in enumerate(self.teams):
+            for s, scenario in enumerate(SCENARIOS):
+                row = {"team": team, "scenario": scenario}
+                for p, percentile in enumerate(self.percentiles):
+                    row[f"savings_p{percentile}"] = self.cumulative_savings[t, p, s]
+                    row[f"savings_pct_p{percentile}"] = self.cumulative_savings_pct[t, p, s]
+                rows.append(row)
+        return pd.DataFrame(rows)
+
+
+class Streaming_Percentiles:
+    """
+    Percentiles of many batches of draws from fixed-bin histograms, one per output cell.
+
+    The bin range is set from the first batch, widened by `margin` of its span on each side;
+    later draws outside it land in the edge bins. Batches are identically distributed, so
+    interior percentiles (P10-P90) stay inside the range, and their error is at most one bin
+    width, `(1 + 2 * margin) * span / bins`. Memory is `bins` counters per cell, whatever
+    the number of draws.
+    """
+
+    def __init__(self, bins: int = 8_192, margin: float = 0.25):
+        self.bins = bins
+        self.margin = margin
+        self.shape: Optional[tuple] = None
+        self.low: Optional[np.ndarray] = None
+        self.width: Optional[np.ndarray] = None
+        self.counts: Optional[np.ndarray] = None
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch shaped [draw, *cell]."""
+        flat = values.reshape(len(values), -1).astype(np.float64)
+        if self.counts is None:
+            self.shape = values.shape[1:]
+            low, high = flat.min(axis=0), flat.max(axis=0)
+            pad = self.margin * (high - low) + 1e-9 * np.maximum(1.0, np.abs(low))
+            self.low = low - pad
+            self.width = (high - low + 2 * pad) / self.bins
+            self.counts = np.zeros((flat.shape[1], self.bins), dtype=np.int64)
+        index = np.clip(((flat - self.low) / self.width).astype(np.int64), 0, self.bins - 1)
+        index += np.arange(flat.shape[1]) * self.bins
+        self.counts += np.bincount(index.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+
+    def percentiles(self, q) -> np.ndarray:
+        """Linearly interpolated within the bin; shaped [percentile, *cell]."""
+        cumulative = self.counts.cumsum(axis=1)
+        total = cumulative[:, -1]
+        cells = np.arange(len(total))
+        out = []
+        for percentile in np.atleast_1d(q):
+            target = percentile / 100.0 * total
+            bin_index = np.minimum((cumulative < target[:, None]).sum(axis=1), self.bins - 1)
+            before = np.where(bin_index > 0, cumulative[cells, bin_index - 1], 0)
+            in_bin = np.maximum(self.counts[cells, bin_index], 1)
+            fraction = np.clip((target - before) / in_bin, 0.0, 1.0)
+            out.append((self.low + (bin_index + fraction) * self.width).reshape(self.shape))
+        return np.stack(out)
+
+
+def _simulate_team(
+    team: Team_Baseline,
+    seed_sequence: np.random.SeedSequence,
+    config: Monte_Carlo_Config,
+    assumptions: Dict[str, Scenario_Assumptions],
+) -> Dict[str, np.ndarray]:
+    """
+    All draws for one team, in batches; returns percentile arrays.
+
+    A single batch keeps its draws and gets exact percentiles; with more batches only
+    streaming histograms survive each batch, so memory stays bounded by `batch_draws`.
+    """
+    fte_loc, rate, non_labor, susceptibility = baseline_arrays([team])
+    params = assumption_arrays(assumptions)
+    n_batches = -(-config.draws // config.batch_draws)
+    metrics = ("fte", "cumulative_pct_change", "run_rate_cost", "cumulative_savings", "cumulative_savings_pct")
+    q = np.asarray(PERCENTILES)
+    streams = {metric: Streaming_Percentiles(config.histogram_bins) for metric in metrics}
+
+    # One child stream per batch: results depend only on (seed, team position, batch_draws).
+    for b, child in enumerate(seed_sequence.spawn(n_batches)):
+        rng = np.random.default_rng(child)
+        start = b * config.batch_draws
+        n = min(config.batch_draws, config.draws - start)
+        uptake = config.automation_uptake.sample(rng, (n, 1))
+        wage = config.offshore_wage_ratio.sample(rng, n)
+        draw_rate = np.repeat(rate, n, axis=0)
+        draw_rate[:, 1:] *= wage[:, None]
+        projection = project_scenarios(
+            np.repeat(fte_loc, n, axis=0),
+            draw_rate,
+            np.repeat(non_labor, n),
+            np.repeat(susceptibility, n),
+            max_reduction=np.clip(uptake * params["max_reduction"][None, :], 0.0, 1.0),
+            location_shift=params["location_shift"],
+            near_share=params["near_share"],
+            transition_ratio=config.transition_cost_ratio.sample(rng, (n, 1)) * np.ones(len(SCENARIOS)),
+            tooling=params["tooling"],
+            curve=params["curve"],
+            attrition=config.annual_attrition.sample(rng, n),
+        )
+        if n_batches == 1:
+            result = {metric: np.percentile(projection[metric], q, axis=0) for metric in metrics}
+            break
+        for metric in metrics:
+            streams[metric].update(projection[metric])
+    else:
+        result = {metric: streams[metric].percentiles(q) for metric in metrics}
+
+    result["cumulative_pct_change"] = np.minimum(result["cumulative_pct_change"], 0.0)
+    return result
+
+
+def simulate_portfolio(
+    teams: List[Team_Baseline],
+    config: Optional[Monte_Carlo_Config] = None,
+    assumptions: Optional[Dict[str, Scenario_Assumptions]] = None,
+) -> Monte_Carlo_Results:
+    """
+    Monte Carlo P10/P50/P90 trajectories for every team and scenario.
+
+    Each team gets its own child of `SeedSequence(config.seed)`, so results are identical
+    whatever the number of workers. Teams are sharded across a process pool when
+    `config.workers > 1`.
+
+    Args:
+        teams: Team baselines, as for `run_scenarios`.
+        config: Draw count, batch size, seed, worker count and input distributions.
+        assumptions: Deterministic scenario parameters the sampled multipliers apply to.
+
+    Returns:
+        A `Monte_Carlo_Results` with percentile arrays and table helpers.
+    """
+    config = config or Monte_Carlo_Config()
+    assumptions = assumptions or DEFAULT_ASSUMPTIONS
+    started = time.perf_counter()
+    seeds = np.random.SeedSequence(config.seed).spawn(len(teams))
+
+    if config.workers > 1 and len(teams) > 1:
+        with ProcessPoolExecutor(max_workers=config.workers) as pool:
+            per_team = list(pool.map(_simulate_team, teams, seeds, [config] * len(teams), [assumptions] * len(teams)))
+    else:
+        per_team = [_simulate_team(team, seed, config, assumptions) for team, seed in zip(teams, seeds)]
+
+    stacked = {key: np.stack([r[key] for r in per_team]) for key in per_team[0]} if per_team else {}
+    return Monte_Carlo_Results(
+        teams=[t.team for t in teams],
+        percentiles=list(PERCENTILES),
+        draws=config.draws,
+        elapsed_s=time.perf_counter() - started,
+        **stacked,
+    )
+
+
+def benchmark_scaling(
+    n_teams: int = 32,
+    draws: int = 200_000,
+    worker_counts: Optional[List[int]] = None,
+) -> pd.DataFrame:
+    """
+    Time `simulate_portfolio` on a synthetic portfolio at increasing worker counts.
+
+    Returns:
+        One row per worker count with elapsed seconds, draws/sec and speed-up vs. one worker.
+    """
+    worker_counts = worker_counts or sorted({1, 2, 4, os.cpu_count() or 1})
+    rng = np.random.default_rng(0)
+    teams = [
+        Team_Baseline(
+            team=f"Team_{i:03d}",
+            calculator_score=float(rng.uniform(1.5, 5.0)),
+            annual_non_labor_cost=float(rng.uniform(0, 500_000)),
+            roles=[
+                Role_Baseline(role="Analyst", fte=float(rng.integers(5, 60)), annual_cost_per_fte=110_000, location="onshore"),
+                Role_Baseline(role="Associate", fte=float(rng.integers(0, 40)), annual_cost_per_fte=45_000, location="offshore"),
+            ],
+        )
+        for i in range(n_teams)
+    ]
+    rows = []
+    for workers in worker_counts:
+        config = Monte_Carlo_Config(draws=draws, workers=workers)
+        started = time.perf_counter()
+        simulate_portfolio(teams, config)
+        elapsed = time.perf_counter() - started
+        rows.append({"workers": workers, "elapsed_s": elapsed, "draws_per_s": n_teams * draws / elapsed})
+    frame = pd.DataFrame(rows)
+    frame["speedup"] = frame["elapsed_s"].iloc[0] / frame["elapsed_s"]
+    return frame
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Monte Carlo workforce simulation scaling across cores.")
+    parser.add_argument("--teams", type=int, default=32)
+    parser.add_argument("--draws", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="*", default=None)
+    args = parser.parse_args(argv)
+    print(benchmark_scaling(args.teams, args.draws, args.workers).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+from typing import Dict, List, Literal, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field
+
+SCENARIOS = ("Low", "Medium", "High")
+LOCATIONS = ("onshore", "nearshore", "offshore")
+MONTHS = (6, 12, 18, 24)
+
+# Fallback cost of a near/offshore FTE relative to onshore when a team has nobody in that location yet.
+DEFAULT_LOCATION_COST_RATIO = {"onshore": 1.0, "nearshore": 0.7, "offshore": 0.4}
+
+
+class Role_Baseline(BaseModel):
+    role: str
+    "Role family, e.g. 'AP Analyst'"
+    fte: float = Field(ge=0)
+    annual_cost_per_fte: float = Field(ge=0)
+    "Fully loaded annual cost of one FTE in this role and location"
+    location: Literal["onshore", "nearshore", "offshore"]
+
+
+class Team_Baseline(BaseModel):
+    team: str
+    calculator_score: float
+    "Overall appropriateness score from Agentic_Calculator_Tool (1 = unsuitable, 5 = highly suitable)"
+    roles: List[Role_Baseline]
+    annual_non_labor_cost: float = 0.0
+    "Vendor and technology run-rate that GenAI does not change"
+
+
+class Scenario_Assumptions(BaseModel):
+    max_reduction: float
+    "Share of FTE removed at 24 months for a team with calculator score 5"
+    adoption_curve: List[float]
+    "Cumulative share of the 24-month effect realized at 6, 12, 18 and 24 months (non-decreasing, ends at 1)"
+    location_shift: float
+    "Share of remaining onshore FTE moved to near/offshore by 24 months for a score-5 team"
+    nearshore_share_of_shift: float = 0.5
+    "Part of the location shift that lands nearshore; the rest goes offshore"
+    transition_cost_ratio: float = 0.35
+    "One-time cost (severance, change, knowledge transfer) per removed or relocated FTE, as a share of its annual cost"
+    tooling_cost_per_fte: float = 0.0
+    "Annual GenAI tooling cost per remaining FTE"
+
+
+DEFAULT_ASSUMPTIONS: Dict[str, Scenario_Assumptions] = {
+    "Low": Scenario_Assumptions(
+        max_reduction=0.10, adoption_curve=[0.15, 0.40, 0.70, 1.00], location_shift=0.00, tooling_cost_per_fte=1_500
+    ),
+    "Medium": Scenario_Assumptions(
+        max_reduction=0.25, adoption_curve=[0.20, 0.50, 0.80, 1.00], location_shift=0.10, tooling_cost_per_fte=2_500
+    ),
+    "High": Scenario_Assumptions(
+        max_reduction=0.40, adoption_curve=[0.25, 0.60, 0.85, 1.00], location_shift=0.20, tooling_cost_per_fte=4_000
+    ),
+}
+
+
+class Scenario_Results(BaseModel):
+    """Arrays are indexed [team, scenario, month] (and [..., location] where noted)."""
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    teams: List[str]
+    baseline_fte: np.ndarray
+    baseline_annual_cost: np.ndarray
+    fte: np.ndarray
+    fte_by_location: np.ndarray
+    "[team, scenario, month, location]"
+    cumulative_pct_change: np.ndarray
+    "FTE change vs. baseline in percent; every element is <= 0"
+    run_rate_cost: np.ndarray
+    "Annualized total cost at each checkpoint"
+    transition_cost: np.ndarray
+    "[team, scenario] one-time cost incurred over the 24 months"
+    cumulative_savings: np.ndarray
+    "[team, scenario] 24-month savings net of transition and tooling costs"
+    cumulative_savings_pct: np.ndarray
+    "[team, scenario] savings as a share of 24 months of baseline cost, in percent"
+    assumptions: Dict[str, Scenario_Assumptions]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long table: one row per team, scenario and month."""
+        index = pd.MultiIndex.from_product([self.teams, SCENARIOS, MONTHS], names=["team", "scenario", "month"])
+        frame = pd.DataFrame(
+            {
+                "fte": self.fte.reshape(-1),
+                "cumulative_pct_change": self.cumulative_pct_change.reshape(-1),
+                "run_rate_cost": self.run_rate_cost.reshape(-1),
+            },
+            index=index,
+        )
+        for i, location in enumerate(LOCATIONS):
+            frame[f"fte_{location}"] = self.fte_by_location[..., i].reshape(-1)
+        return frame.reset_index()
+
+    def summary(self) -> pd.DataFrame:
+        """One row per team and scenario with the 24-month figures the report quotes."""
+        rows = []
+        for t, team in enumerate(self.teams):
+            for s, scenario in enumerate(SCENARIOS):
+                rows.append(
+                    {
+                        "team": team,
+                        "scenario": scenario,
+                        "baseline_fte": self.baseline_fte[t],
+                        "fte_6m": self.fte[t, s, 0],
+                        "fte_12m": self.fte[t, s, 1],
+                        "fte_18m": self.fte[t, s, 2],
+                        "fte_24m": self.fte[t, s, 3],
+                        "pct_change_vector": [round(float(v), 1) for v in self.cumulative_pct_change[t, s]],
+                        "baseline_annual_cost": self.baseline_annual_cost[t],
+                        "run_rate_cost_24m": self.run_rate_cost[t, s, 3],
+                        "transition_cost": self.transition_cost[t, s],
+                        "cumulative_savings": self.cumulative_savings[t, s],
+                        "cumulative_savings_pct": self.cumulative_savings_pct[t, s],
+                    }
+                )
+        return pd.DataFrame(rows)
+
+
+def _role_arrays(teams: List[Team_Baseline]):
+    team_index, fte, cost, location = [], [], [], []
+    for t, team in enumerate(teams):
+        for role in team.roles:
+            team_index.append(t)
+            fte.append(role.fte)
+            cost.append(role.annual_cost_per_fte)
+            location.append(LOCATIONS.index(role.location))
+    return (
+        np.asarray(team_index, dtype=np.int64),
+        np.asarray(fte, dtype=np.float64),
+        np.asarray(cost, dtype=np.float64),
+        np.asarray(location, dtype=np.int64),
+    )
+
+
+def baseline_arrays(teams: List[Team_Baseline]):
+    """
+    Aggregate role baselines into per-team arrays.
+
+    Returns:
+        (fte_loc, rate, non_labor, susceptibility): FTE and average cost per FTE by
+        [team, location], non-labor run-rate per team, and the calculator score mapped to 0-1.
+    """
+    n_teams, n_loc = len(teams), len(LOCATIONS)
+    team_index, role_fte, role_cost, role_location = _role_arrays(teams)
+
+    flat = team_index * n_loc + role_location
+    fte_loc = np.bincount(flat, weights=role_fte, minlength=n_teams * n_loc).reshape(n_teams, n_loc)
+    cost_loc = np.bincount(flat, weights=role_fte * role_cost, minlength=n_teams * n_loc).reshape(n_teams, n_loc)
+
+    # Average cost per FTE by location, falling back to a ratio of the team's onshore (or blended) rate.
+    blended = cost_loc.sum(axis=1) / np.maximum(fte_loc.sum(axis=1), 1e-9)
+    onshore_rate = np.where(fte_loc[:, 0] > 0, cost_loc[:, 0] / np.maximum(fte_loc[:, 0], 1e-9), blended)
+    fallback = onshore_rate[:, None] * np.asarray([DEFAULT_LOCATION_COST_RATIO[l] for l in LOCATIONS])
+    rate = np.where(fte_loc > 0, cost_loc / np.maximum(fte_loc, 1e-9), fallback)
+
+    non_labor = np.asarray([t.annual_non_labor_cost for t in teams], dtype=np.float64)
+    susceptibility = np.clip((np.asarray([t.calculator_score for t in teams], dtype=np.float64) - 1.0) / 4.0, 0.0, 1.0)
+    return fte_loc, rate, non_labor, susceptibility
+
+
+def assumption_arrays(assumptions: Dict[str, Scenario_Assumptions]) -> Dict[str, np.ndarray]:
+    """Per-scenario parameters as [scenario] arrays, plus the [scenario, month] adoption curve."""
+    return {
+        "max_reduction": np.asarray([assumptions[s].max_reduction for s in SCENARIOS]),
+        "location_shift": np.asarray([assumptions[s].location_shift for s in SCENARIOS]),
+        "near_share": np.asarray([assumptions[s].nearshore_share_of_shift for s in SCENARIOS]),
+        "transition_ratio": np.asarray([assumptions[s].transition_cost_ratio for s in SCENARIOS]),
+        "tooling": np.asarray([assumptions[s].tooling_cost_per_fte for s in SCENARIOS]),
+        "curve": np.maximum.accumulate(
+            np.clip(np.asarray([assumptions[s].adoption_curve for s in SCENARIOS], dtype=np.float64), 0.0, 1.0), axis=1
+        ),
+    }
+
+
+def project_scenarios(
+    fte_loc: np.ndarray,
+    rate: np.ndarray,
+    non_labor: np.ndarray,
+    susceptibility: np.ndarray,
+    max_reduction: np.ndarray,
+    location_shift: np.ndarray,
+    near_share: np.ndarray,
+    transition_ratio: np.ndarray,
+    tooling: np.ndarray,
+    curve: np.ndarray,
+    attrition: np.ndarray = 0.0,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized scenario core shared by `run_scenarios` and the Monte Carlo simulation.
+
+    Rows are independent: a row is a team in `run_scenarios` and a (team, draw) pair in the
+    simulation. Per-scenario parameters may be [scenario] or [row, scenario]; `attrition` is an
+    annual rate, scalar or [row], and reductions it absorbs carry no transition cost.
+
+    Returns:
+        Dict of arrays: fte, fte_by_location, cumulative_pct_change, run_rate_cost ([row, scenario, month]
+        and [..., location]), and transition_cost, cumulative_savings, cumulative_savings_pct ([row, scenario]),
+        plus baseline_fte and baseline_annual_cost ([row]).
+    """
+    n_rows, n_scenarios = fte_loc.shape[0], len(SCENARIOS)
+
+    def per_row(values) -> np.ndarray:
+        return np.broadcast_to(np.asarray(values, dtype=np.float64), (n_rows, n_scenarios))
+
+    max_reduction, location_shift = per_row(max_reduction), per_row(location_shift)
+    near_share, transition_ratio, tooling = per_row(near_share), per_row(transition_ratio), per_row(tooling)
+    attrition = np.broadcast_to(np.asarray(attrition, dtype=np.float64), (n_rows,))
+
+    baseline_fte = fte_loc.sum(axis=1)
+    baseline_cost = (fte_loc * rate).sum(axis=1) + non_labor
+
+    # [row, scenario, month] share of each location's FTE that is automated away.
+    reduction = np.clip(susceptibility[:, None, None] * max_reduction[..., None] * curve[None, :, :], 0.0, 1.0)
+    remaining = fte_loc[:, None, None, :] * (1.0 - reduction[..., None])
+
+    # Move part of the remaining onshore FTE to near/offshore.
+    moved = remaining[..., 0] * susceptibility[:, None, None] * location_shift[..., None] * curve[None, :, :]
+    fte_by_location = remaining.copy()
+    fte_by_location[..., 0] -= moved
+    fte_by_location[..., 1] += moved * near_share[..., None]
+    fte_by_location[..., 2] += moved * (1.0 - near_share[..., None])
+
+    fte = fte_by_location.sum(axis=-1)
+    # Headcount never grows: clamp to baseline and to the previous checkpoint.
+    fte = np.minimum.accumulate(np.minimum(fte, baseline_fte[:, None, None]), axis=2)
+    # A team with no baseline FTE has nothing to reduce: 0% rather than -100%.
+    has_baseline = baseline_fte[:, None, None] > 0
+    pct_change = np.where(
+        has_baseline,
+        np.minimum(100.0 * (fte / np.maximum(baseline_fte[:, None, None], 1e-9) - 1.0), 0.0),
+        0.0,
+    )
+
+    labor = (fte_by_location * rate[:, None, None, :]).sum(axis=-1)
+    run_rate = labor + non_labor[:, None, None] + tooling[..., None] * fte
+
+    # Half-year cost per period by trapezoid between checkpoints, starting from baseline.
+    path = np.concatenate([np.broadcast_to(baseline_cost[:, None, None], (n_rows, n_scenarios, 1)), run_rate], axis=2)
+    spend_24m = (0.5 * (path[..., 1:] + path[..., :-1]) * 0.5).sum(axis=2)
+
+    # Two years of natural attrition absorb part of the reduction without severance.
+    removed = fte_loc[:, None, :] - remaining[:, :, -1, :]
+    absorbed = fte_loc * np.minimum(2.0 * attrition, 1.0)[:, None]
+    severed = np.maximum(removed - absorbed[:, None, :], 0.0)
+    removed_cost = (severed * rate[:, None, :]).sum(axis=-1)
+    moved_cost = moved[:, :, -1] * rate[:, None, 0]
+    transition = transition_ratio * (removed_cost + moved_cost)
+
+    savings = 2.0 * baseline_cost[:, None] - spend_24m - transition
+    savings_pct = 100.0 * savings / np.maximum(2.0 * baseline_cost[:, None], 1e-9)
+
+    return {
+        "baseline_fte": baseline_fte,
+        "baseline_annual_cost": baseline_cost,
+        "fte": fte,
+        "fte_by_location": fte_by_location,
+        "cumulative_pct_change": pct_change,
+        "run_rate_cost": run_rate,
+        "transition_cost": transition,
+        "cumulative_savings": savings,
+        "cumulative_savings_pct": savings_pct,
+    }
+
+
+def run_scenarios(
+    teams: List[Team_Baseline],
+    assumptions: Optional[Dict[str, Scenario_Assumptions]] = None,
+) -> Scenario_Results:
+    """
+    Compute Low/Medium/High FTE trajectories and cost outcomes for N teams in one vectorized pass.
+
+    The calculator score (1-5) scales each scenario's maximum reduction and location shift
+    linearly from 0 (score 1) to the full assumption (score 5). FTE never rises above
+    baseline, so every cumulative percent change is <= 0 by construction.
+
+    Args:
+        teams: Team baselines (roles with FTE, cost and location) and calculator scores.
+        assumptions: Per-scenario parameters. Defaults to `DEFAULT_ASSUMPTIONS`.
+
+    Returns:
+        A `Scenario_Results` with [team, scenario, month] arrays and table helpers.
+    """
+    assumptions = assumptions or DEFAULT_ASSUMPTIONS
+    fte_loc, rate, non_labor, susceptibility = baseline_arrays(teams)
+    projection = project_scenarios(fte_loc, rate, non_labor, susceptibility, **assumption_arrays(assumptions))
+    return Scenario_Results(teams=[t.team for t in teams], assumptions=assumptions, **projection)
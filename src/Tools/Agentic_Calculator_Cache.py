@@ -0,0 +1,287 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+from agents import Agent, Runner, function_tool
+from pydantic import BaseModel
+
+# Import Necessary Libraries
+from src.Tools.Agentic_Calculator_Tool import Agentic_Calculator_Tool, Agentic_Calculator_Tool_Output
+
+DEFAULT_CACHE_PATH = os.getenv("AGENTIC_CALCULATOR_CACHE_PATH", "Data/Intermediate/agentic_calculator_cache.sqlite")
+DEFAULT_TTL_S = float(os.getenv("AGENTIC_CALCULATOR_CACHE_TTL_S", 30 * 24 * 3600))
+DEFAULT_MAX_BYTES = int(os.getenv("AGENTIC_CALCULATOR_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+CALCULATOR_MODE = os.getenv("AGENTIC_CALCULATOR_MODE", "high")
+"'high' runs every miss at high reasoning effort; 'cascade' uses Agentic_Calculator_Cascade"
+
+# Result handed to coalesced followers when the leader's caller was cancelled mid-computation.
+_LEADER_CANCELLED = object()
+
+
+class Cache_Stats(BaseModel):
+    hits: int = 0
+    "Requests answered from the SQLite store"
+    misses: int = 0
+    "Requests that paid for an upstream calculator run"
+    coalesced: int = 0
+    "Requests that waited on an identical in-flight upstream run instead of starting their own"
+    saved_latency_s: float = 0.0
+    "Sum of the original upstream latency of every hit and coalesced request"
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+
+def normalize_activity(text: str) -> str:
+    """Normalize an activity description so trivially different spellings share a cache key."""
+    text = unicodedata.normalize("NFKC", text)
+    return " ".join(text.split()).casefold()
+
+
+def cache_key(activity: str, agent: Agent, variant: str = "") -> str:
+    """
+    Content address of a calculator request.
+
+    The key covers everything that changes the answer: the normalized activity text, the
+    rubric prompt, the model and its reasoning settings, and the evaluation `variant`
+    (e.g. `Agentic_Calculator_Cascade.cache_variant`, which also covers the cascade's thresholds).
+    """
+    reasoning = agent.model_settings.reasoning
+    payload = {
+        "activity": normalize_activity(activity),
+        "instructions": agent.instructions if isinstance(agent.instructions, str) else repr(agent.instructions),
+        "model": str(agent.model),
+        "reasoning": reasoning.model_dump(exclude_none=True) if reasoning is not None else None,
+    }
+    if variant:
+        payload["variant"] = variant
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class Agentic_Calculator_Cache:
+    """
+    Persistent, content-addressed cache of `Agentic_Calculator_Tool_Output` results.
+
+    Entries live in a local SQLite file and are evicted once they are older than `ttl_s`
+    or, least-recently-used first, once the store grows past `max_bytes`. Identical
+    concurrent requests are coalesced: the first caller runs the upstream model and every
+    other caller, in any thread or event loop, waits on the same result.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_s: float = DEFAULT_TTL_S,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        agent: Agent = Agentic_Calculator_Tool,
+    ):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.agent = agent
+        self.stats = Cache_Stats()
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, concurrent.futures.Future] = {}
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS calculator_cache (
+                key TEXT PRIMARY KEY,
+                output TEXT NOT NULL,
+                latency_s REAL NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS calculator_cache_accessed ON calculator_cache(accessed_at)")
+
+    def get(self, key: str) -> Optional[tuple[Agentic_Calculator_Tool_Output, float]]:
+        """Return (output, original latency) for a fresh entry, or None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output, latency_s, created_at FROM calculator_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            output, latency_s, created_at = row
+            if now - created_at > self.ttl_s:
+                self._conn.execute("DELETE FROM calculator_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE calculator_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return Agentic_Calculator_Tool_Output.model_validate_json(output), latency_s
+
+    def put(self, key: str, output: Agentic_Calculator_Tool_Output, latency_s: float) -> None:
+        payload = output.model_dump_json()
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO calculator_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, latency_s, now, now, len(payload.encode("utf-8"))),
+            )
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then least-recently-used entries until the store fits `max_bytes`."""
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM calculator_cache WHERE created_at < ?", (time.time() - self.ttl_s,)
+            ).rowcount
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM calculator_cache").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                victims = []
+                for key, size in self._conn.execute("SELECT key, size FROM calculator_cache ORDER BY accessed_at"):
+                    victims.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                self._conn.executemany("DELETE FROM calculator_cache WHERE key = ?", victims)
+                removed += len(victims)
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM calculator_cache")
+
+    def snapshot(self) -> Cache_Stats:
+        """Current counters together with the on-disk entry count and size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM calculator_cache"
+            ).fetchone()
+        return self.stats.model_copy(update={"entries": entries, "bytes": size})
+
+    async def get_or_compute(
+        self,
+        activity: str,
+        compute: Optional[Callable[[str], Awaitable[Agentic_Calculator_Tool_Output]]] = None,
+        variant: str = "",
+    ) -> Agentic_Calculator_Tool_Output:
+        """
+        Return the cached result for an activity, running the calculator at most once per key.
+
+        Args:
+            activity: Business activity description.
+            compute: Coroutine producing the result on a miss. Defaults to a `Runner.run` of `self.agent`.
+            variant: Keeps results of a different evaluation mode (e.g. a cascade's `cache_variant`) under separate keys.
+
+        Returns:
+            The typed calculator output.
+        """
+        key = cache_key(activity, self.agent, variant)
+        cached = self.get(key)
+        if cached is not None:
+            output, latency_s = cached
+            with self._lock:
+                self.stats.hits += 1
+                self.stats.saved_latency_s += latency_s
+            return output
+
+        with self._lock:
+            leader = key not in self._in_flight
+            if leader:
+                future: concurrent.futures.Future = concurrent.futures.Future()
+                self._in_flight[key] = future
+            else:
+                future = self._in_flight[key]
+
+        if not leader:
+            # concurrent.futures.Future (not asyncio.Future) so followers may live on other event loops.
+            # Each follower waits on its own wrapper, shielded so cancelling it leaves the shared future alone.
+            shared = await asyncio.shield(asyncio.wrap_future(future))
+            if shared is _LEADER_CANCELLED:
+                # The leader's caller was cancelled, not this one: run (or join) the computation again.
+                return await self.get_or_compute(activity, compute, variant)
+            output, latency_s = shared
+            with self._lock:
+                self.stats.coalesced += 1
+                self.stats.saved_latency_s += latency_s
+            return output
+
+        compute = compute or self._run_agent
+        started = time.perf_counter()
+        try:
+            output = await compute(activity)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            raise
+        except BaseException:
+            # Cancelled (or interrupted): followers did not ask for that, so let them retry.
+            # The entry is dropped first so a retrying follower becomes the new leader.
+            with self._lock:
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
+            if not future.done():
+                future.set_result(_LEADER_CANCELLED)
+            raise
+        else:
+            latency_s = time.perf_counter() - started
+            self.put(key, output, latency_s)
+            if not future.done():
+                future.set_result((output, latency_s))
+            with self._lock:
+                self.stats.misses += 1
+            return output
+        finally:
+            with self._lock:
+                # A follower may already lead a retry under the same key; leave its entry alone.
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
+
+    async def _run_agent(self, activity: str) -> Agentic_Calculator_Tool_Output:
+        result = await Runner.run(self.agent, activity)
+        return result.final_output_as(Agentic_Calculator_Tool_Output)
+
+
+_default_cache: Optional[Agentic_Calculator_Cache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Agentic_Calculator_Cache:
+    """Process-wide cache shared by every agent and Streamlit session."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = Agentic_Calculator_Cache()
+        return _default_cache
+
+
+@function_tool(
+    name_override="Agentic_Calculator_Tool",
+    description_override="Tool for evaluating the appropriateness of Generative AI for a specific business activity",
+)
+async def Cached_Agentic_Calculator_Tool(input: str) -> str:
+    """
+    Evaluate the appropriateness of Generative AI for a specific business activity.
+
+    Args:
+        input: Description of the business activity to evaluate.
+    """
+    if CALCULATOR_MODE == "cascade":
+        from src.Tools.Agentic_Calculator_Cascade import get_default_cascade
+        cascade = get_default_cascade()
+        output = await get_default_cache().get_or_compute(input, compute=cascade.compute, variant=cascade.cache_variant)
+    else:
+        output = await get_default_cache().get_or_compute(input)
+    return output.model_dump_json()
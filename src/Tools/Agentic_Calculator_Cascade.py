@@ -0,0 +1,323 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from agents import Agent, Runner
+from agents.model_settings import ModelSettings
+from pydantic import BaseModel
+
+# Import Necessary Libraries
+from src.Tools.Agentic_Calculator_Tool import Agentic_Calculator_Tool, Agentic_Calculator_Tool_Output
+
+# Classification bands of AGENTIC_CALCULATOR_TOOL_PROMPT, keyed by their lower bound.
+BANDS = [
+    (4.0, "Highly suitable"),
+    (3.0, "Moderately suitable"),
+    (2.0, "Low suitability"),
+    (float("-inf"), "Unsuitable"),
+]
+
+# Small hand-labelled set spanning the four bands; pass a CSV to `benchmark_cascade` for a larger one.
+BENCHMARK_ACTIVITIES = [
+    ("Summarize internal meeting notes into action items for the team wiki", "Highly suitable"),
+    ("Draft first-pass responses to routine employee HR policy questions from the handbook", "Highly suitable"),
+    ("Classify incoming vendor emails by topic and route them to the right AP queue", "Highly suitable"),
+    ("Extract line items from scanned supplier invoices into the ERP for clerk review", "Moderately suitable"),
+    ("Prepare monthly variance commentary for the FP&A pack from GL and budget data", "Moderately suitable"),
+    ("Screen expense reports for policy exceptions and flag them to approvers", "Moderately suitable"),
+    ("Reconcile intercompany balances between two ERPs using fixed matching rules", "Low suitability"),
+    ("Run the nightly bank-file upload from treasury to the payments platform", "Low suitability"),
+    ("Calculate statutory payroll tax withholdings for employees in 14 states", "Low suitability"),
+    ("Decide final credit approval for a USD 2bn syndicated loan", "Unsuitable"),
+    ("Make AML suspicious-activity filing decisions to the regulator", "Unsuitable"),
+    ("Set the company's long-term capital allocation strategy with the board", "Unsuitable"),
+]
+
+
+def classify(score: float) -> str:
+    """Suitability band for an overall appropriateness score."""
+    return next(label for bound, label in BANDS if score >= bound)
+
+
+class Cascade_Config(BaseModel):
+    low_effort: str = "low"
+    "Reasoning effort of the cheap tier"
+    high_effort: str = "high"
+    "Reasoning effort of the escalation tier (the current default for the calculator)"
+    cheap_samples: int = 2
+    "Independent cheap passes run concurrently; with >= 2 they must agree to avoid escalation"
+    boundary_margin: float = 0.15
+    "Escalate when the score is within this distance of a band boundary (2.0, 3.0, 4.0)"
+    disagreement_tolerance: float = 0.5
+    "Escalate when cheap samples differ by more than this, or land in different bands"
+
+
+class Tier_Usage(BaseModel):
+    runs: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_s: float = 0.0
+
+
+class Cascade_Result(BaseModel):
+    output: Agentic_Calculator_Tool_Output
+    escalated: bool
+    reasons: List[str]
+    "Why the high-effort tier ran: 'hallucination', 'boundary', 'disagreement'"
+    cheap_scores: List[float]
+    latency_s: float
+    cheap: Tier_Usage
+    high: Tier_Usage
+
+
+class Cascade_Stats(BaseModel):
+    evaluations: int = 0
+    escalations: int = 0
+    reasons: Dict[str, int] = {}
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalations / self.evaluations if self.evaluations else 0.0
+
+
+async def _run_tier(agent: Agent, activity: str) -> Tuple[Agentic_Calculator_Tool_Output, Tier_Usage]:
+    started = time.perf_counter()
+    result = await Runner.run(agent, activity)
+    usage = result.context_wrapper.usage
+    return result.final_output_as(Agentic_Calculator_Tool_Output), Tier_Usage(
+        runs=1,
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+        latency_s=time.perf_counter() - started,
+    )
+
+
+class Agentic_Calculator_Cascade:
+    """
+    Two-tier calculator: low-effort passes first, high effort only when they look unreliable.
+
+    The cheap tier is escalated when any sample reports a hallucination_score other than
+    "Low", when a score lands within `boundary_margin` of a band boundary, or when the
+    samples disagree. The calculator output only carries the overall score (the mean of
+    the five dimensions), so the boundary test is applied to that score.
+
+    Example:
+        cascade = Agentic_Calculator_Cascade()
+        result = await cascade.evaluate("Summarize internal meeting notes")
+    """
+
+    def __init__(self, agent: Agent = Agentic_Calculator_Tool, config: Optional[Cascade_Config] = None):
+        self.config = config or Cascade_Config()
+        # Overlay the effort so the tiers keep the agent's other settings (e.g. its prompt cache key).
+        self.cheap_agent = agent.clone(model_settings=agent.model_settings.resolve(ModelSettings(reasoning={"effort": self.config.low_effort})))
+        self.high_agent = agent.clone(model_settings=agent.model_settings.resolve(ModelSettings(reasoning={"effort": self.config.high_effort})))
+        self.stats = Cascade_Stats()
+        self._lock = threading.Lock()
+
+    def escalation_reasons(self, outputs: List[Agentic_Calculator_Tool_Output]) -> List[str]:
+        reasons = []
+        if any(o.hallucination_score != "Low" for o in outputs):
+            reasons.append("hallucination")
+        boundaries = [bound for bound, _ in BANDS if np.isfinite(bound)]
+        if any(abs(o.score - bound) <= self.config.boundary_margin for o in outputs for bound in boundaries):
+            reasons.append("boundary")
+        scores = [o.score for o in outputs]
+        if len(outputs) > 1 and (
+            max(scores) - min(scores) > self.config.disagreement_tolerance or len({classify(s) for s in scores}) > 1
+        ):
+            reasons.append("disagreement")
+        return reasons
+
+    async def evaluate(self, activity: str) -> Cascade_Result:
+        started = time.perf_counter()
+        cheap_runs = await asyncio.gather(*(_run_tier(self.cheap_agent, activity) for _ in range(max(1, self.config.cheap_samples))))
+        outputs = [output for output, _ in cheap_runs]
+        cheap = Tier_Usage(
+            runs=len(cheap_runs),
+            input_tokens=sum(u.input_tokens for _, u in cheap_runs),
+            output_tokens=sum(u.output_tokens for _, u in cheap_runs),
+            latency_s=max(u.latency_s for _, u in cheap_runs),
+        )
+        reasons = self.escalation_reasons(outputs)
+        high = Tier_Usage()
+        output = min(outputs, key=lambda o: abs(o.score - float(np.median([x.score for x in outputs]))))
+        if reasons:
+            output, high = await _run_tier(self.high_agent, activity)
+
+        with self._lock:
+            self.stats.evaluations += 1
+            self.stats.escalations += int(bool(reasons))
+            for reason in reasons:
+                self.stats.reasons[reason] = self.stats.reasons.get(reason, 0) + 1
+        return Cascade_Result(
+            output=output,
+            escalated=bool(reasons),
+            reasons=reasons,
+            cheap_scores=[o.score for o in outputs],
+            latency_s=time.perf_counter() - started,
+            cheap=cheap,
+            high=high,
+        )
+
+    @property
+    def cache_variant(self) -> str:
+        """`Agentic_Calculator_Cache` variant for results of this cascade; changes with its thresholds."""
+        config = json.dumps(self.config.model_dump(), sort_keys=True)
+        return "cascade:" + hashlib.sha256(config.encode("utf-8")).hexdigest()[:16]
+
+    async def compute(self, activity: str) -> Agentic_Calculator_Tool_Output:
+        """`Agentic_Calculator_Cache.get_or_compute` compatible entry point."""
+        return (await self.evaluate(activity)).output
+
+
+_default_cascade: Optional[Agentic_Calculator_Cascade] = None
+_default_cascade_lock = threading.Lock()
+
+
+def get_default_cascade() -> Agentic_Calculator_Cascade:
+    """Process-wide cascade used by the calculator tool when `AGENTIC_CALCULATOR_MODE=cascade`."""
+    global _default_cascade
+    with _default_cascade_lock:
+        if _default_cascade is None:
+            _default_cascade = Agentic_Calculator_Cascade()
+        return _default_cascade
+
+
+class Cascade_Benchmark_Report(BaseModel):
+    activities: int
+    escalation_rate: float
+    escalation_reasons: Dict[str, int]
+    baseline_latency_mean_s: float
+    cascade_latency_mean_s: float
+    latency_saved_pct: float
+    baseline_tokens: int
+    cascade_tokens: int
+    tokens_saved_pct: float
+    baseline_cost: Optional[float] = None
+    cascade_cost: Optional[float] = None
+    cost_saved_pct: Optional[float] = None
+    "Only when token prices are given"
+    baseline_band_accuracy: Optional[float] = None
+    cascade_band_accuracy: Optional[float] = None
+    "Share of activities whose band matches the label (None without labels)"
+    cascade_baseline_agreement: float
+    "Share of activities where the cascade lands in the same band as high effort alone"
+
+
+async def benchmark_cascade(
+    labelled: Optional[pd.DataFrame] = None,
+    config: Optional[Cascade_Config] = None,
+    concurrency: int = 4,
+    input_price_per_1m: Optional[float] = None,
+    output_price_per_1m: Optional[float] = None,
+) -> Tuple[pd.DataFrame, Cascade_Benchmark_Report]:
+    """
+    Run high effort alone and the cascade on every activity and compare them.
+
+    Args:
+        labelled: Columns `activity` and, optionally, `label` (a band name from `BANDS`).
+            Defaults to `BENCHMARK_ACTIVITIES`.
+        config: Cascade thresholds.
+        concurrency: Activities evaluated at the same time.
+        input_price_per_1m: Price per million input tokens, for the cost comparison.
+        output_price_per_1m: Price per million output (incl. reasoning) tokens.
+
+    Returns:
+        (per-activity rows, summary report)
+    """
+    if labelled is None:
+        labelled = pd.DataFrame(BENCHMARK_ACTIVITIES, columns=["activity", "label"])
+    cascade = Agentic_Calculator_Cascade(config=config)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def evaluate(activity: str) -> Dict:
+        async with semaphore:
+            (baseline, baseline_usage), result = await asyncio.gather(
+                _run_tier(cascade.high_agent, activity), cascade.evaluate(activity)
+            )
+        return {
+            "activity": activity,
+            "baseline_score": baseline.score,
+            "baseline_band": classify(baseline.score),
+            "baseline_latency_s": baseline_usage.latency_s,
+            "baseline_input_tokens": baseline_usage.input_tokens,
+            "baseline_output_tokens": baseline_usage.output_tokens,
+            "cascade_score": result.output.score,
+            "cascade_band": classify(result.output.score),
+            "cascade_latency_s": result.latency_s,
+            "cascade_input_tokens": result.cheap.input_tokens + result.high.input_tokens,
+            "cascade_output_tokens": result.cheap.output_tokens + result.high.output_tokens,
+            "cheap_scores": result.cheap_scores,
+            "escalated": result.escalated,
+            "reasons": ",".join(result.reasons),
+        }
+
+    rows = pd.DataFrame(await asyncio.gather(*(evaluate(a) for a in labelled["activity"])))
+    if "label" in labelled:
+        rows["label"] = labelled["label"].values
+
+    def cost(prefix: str) -> Optional[float]:
+        if input_price_per_1m is None or output_price_per_1m is None:
+            return None
+        return float(
+            rows[f"{prefix}_input_tokens"].sum() * input_price_per_1m / 1e6
+            + rows[f"{prefix}_output_tokens"].sum() * output_price_per_1m / 1e6
+        )
+
+    def saved(before: Optional[float], after: Optional[float]) -> Optional[float]:
+        return None if before is None or after is None or before == 0 else 100 * (1 - after / before)
+
+    baseline_tokens = int(rows["baseline_input_tokens"].sum() + rows["baseline_output_tokens"].sum())
+    cascade_tokens = int(rows["cascade_input_tokens"].sum() + rows["cascade_output_tokens"].sum())
+    baseline_cost, cascade_cost = cost("baseline"), cost("cascade")
+    has_labels = "label" in rows and rows["label"].notna().any()
+    report = Cascade_Benchmark_Report(
+        activities=len(rows),
+        escalation_rate=float(rows["escalated"].mean()),
+        escalation_reasons=dict(cascade.stats.reasons),
+        baseline_latency_mean_s=float(rows["baseline_latency_s"].mean()),
+        cascade_latency_mean_s=float(rows["cascade_latency_s"].mean()),
+        latency_saved_pct=saved(rows["baseline_latency_s"].mean(), rows["cascade_latency_s"].mean()) or 0.0,
+        baseline_tokens=baseline_tokens,
+        cascade_tokens=cascade_tokens,
+        tokens_saved_pct=saved(baseline_tokens, cascade_tokens) or 0.0,
+        baseline_cost=baseline_cost,
+        cascade_cost=cascade_cost,
+        cost_saved_pct=saved(baseline_cost, cascade_cost),
+        baseline_band_accuracy=float((rows["baseline_band"] == rows["label"]).mean()) if has_labels else None,
+        cascade_band_accuracy=float((rows["cascade_band"] == rows["label"]).mean()) if has_labels else None,
+        cascade_baseline_agreement=float((rows["cascade_band"] == rows["baseline_band"]).mean()),
+    )
+    return rows, report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare the Agentic_Calculator_Tool cascade with high effort alone.")
+    parser.add_argument("--labels", help="CSV with `activity` and optional `label` columns (defaults to the built-in set)")
+    parser.add_argument("--output", help="Write per-activity rows to this CSV")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--cheap-samples", type=int, default=2)
+    parser.add_argument("--boundary-margin", type=float, default=0.15)
+    parser.add_argument("--input-price-per-1m", type=float)
+    parser.add_argument("--output-price-per-1m", type=float)
+    args = parser.parse_args(argv)
+
+    labelled = pd.read_csv(args.labels) if args.labels else None
+    config = Cascade_Config(cheap_samples=args.cheap_samples, boundary_margin=args.boundary_margin)
+    rows, report = asyncio.run(
+        benchmark_cascade(labelled, config, args.concurrency, args.input_price_per_1m, args.output_price_per_1m)
+    )
+    if args.output:
+        rows.to_csv(args.output, index=False)
+    print(rows[["activity", "baseline_score", "cascade_score", "escalated", "reasons"]].to_string(index=False))
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
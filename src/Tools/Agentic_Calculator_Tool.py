@@ -4,6 +4,9 @@ from agents import Agent
 from agents.model_settings import ModelSettings
 from pydantic import BaseModel
 
+# Import Necessary Libraries
+from src.Runtime.Prompt_Cache import cached_model_settings, static_prompt
+
 AGENTIC_CALCULATOR_TOOL_PROMPT = '''
 # 📊 Generative-AI Appropriateness Assessor  
 You are a **domain-agnostic evaluator** whose sole task is to judge *how suitable Generative AI is for a specific business activity* and to explain your reasoning.  
@@ -48,8 +51,8 @@ class Agentic_Calculator_Tool_Output(BaseModel):
 
 Agentic_Calculator_Tool = Agent(
     name="Agentic_Calculator_Tool",
-    instructions=AGENTIC_CALCULATOR_TOOL_PROMPT,
+    instructions=static_prompt(AGENTIC_CALCULATOR_TOOL_PROMPT),
     output_type=Agentic_Calculator_Tool_Output,
     model=os.getenv("LLM_MODEL"),
-    model_settings=ModelSettings(reasoning={"effort": "high"}),
+    model_settings=cached_model_settings("Agentic_Calculator_Tool", ModelSettings(reasoning={"effort": "high"})),
 )
\ No newline at end of file
@@ -1,8 +1,9 @@
-import asyncio
 import os
-from openai import OpenAI
-from agents import Agent, FileSearchTool, Runner, trace
-from IPython.display import display, Markdown
+from agents import Agent, FileSearchTool
+
+# Import Necessary Libraries
+from src.Runtime.Prompt_Cache import cached_model_settings, static_prompt
+from src.Tools.Local_Knowledge_Base_Index import make_local_search_tool
 
 GenAI_Process_Knowledge_Base_Tool_Prompt = '''
 You are **GenAI_Process_Knowledge_Base_Tool**, a helpful agent that provides responses **only based on the information in the vector store**.  
@@ -34,15 +35,25 @@ You are **GenAI_Process_Knowledge_Base_Tool**, a helpful agent that provides res
 '''
 
 
+# KNOWLEDGE_BASE_BACKEND=local searches an offline index built with
+# `python -m src.Tools.Local_Knowledge_Base_Index build Data/GenAI_Process_Knowledge_Base <index_dir>`
+if os.getenv("KNOWLEDGE_BASE_BACKEND", "hosted") == "local":
+    Knowledge_Base_Search = make_local_search_tool(
+        index_dir=os.getenv("GENAI_PROCESS_KNOWLEDGE_BASE_LOCAL_INDEX", "Data/Intermediate/GenAI_Process_Knowledge_Base_Index"),
+        tool_name="Knowledge_Base_Search",
+        tool_description="Searches the GenAI process knowledge base and returns the best matching excerpts with their source file and page",
+    )
+else:
+    Knowledge_Base_Search = FileSearchTool(
+        max_num_results=20,
+        vector_store_ids=[os.getenv("GENAI_PROCESS_KNOWLEDGE_BASE_ASSISTANT_KEY")],
+        include_search_results=True,
+    )
+
 GenAI_Process_Knowledge_Base_Tool = Agent(
         name="GenAI_Process_Knowledge_Base_Tool",
-        instructions=GenAI_Process_Knowledge_Base_Tool_Prompt,
+        instructions=static_prompt(GenAI_Process_Knowledge_Base_Tool_Prompt),
         model=os.getenv("LLM_MODEL"),
-        tools=[
-            FileSearchTool(
-                max_num_results=20,
-                vector_store_ids=[os.getenv("GENAI_PROCESS_KNOWLEDGE_BASE_ASSISTANT_KEY")],
-                include_search_results=True,
-            )
-        ],
+        model_settings=cached_model_settings("GenAI_Process_Knowledge_Base_Tool"),
+        tools=[Knowledge_Base_Search],
     )
\ No newline at end of file
@@ -0,0 +1,365 @@
+import argparse
+import hashlib
+import json
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Protocol, Union
+
+import numpy as np
+from agents import FunctionTool, function_tool
+from pydantic import BaseModel
+
+INDEX_EXTENSIONS = {".pdf", ".txt", ".md", ".json"}
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class Encoder(Protocol):
+    """Pluggable local text encoder: maps N texts to an (N, dim) float32 matrix."""
+
+    name: str
+    dim: int
+
+    def __call__(self, texts: List[str]) -> np.ndarray: ...
+
+
+class Hashing_Encoder:
+    """
+    Dependency-free encoder: signed feature hashing of word unigrams, bigrams and
+    character trigrams, L2-normalized. Deterministic and fully offline.
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> List[str]:
+        words = tokenize(text)
+        features = words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                matrix[row, digest % self.dim] += 1.0 if (digest >> 63) else -1.0
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+
+class Sentence_Transformer_Encoder:
+    """Local neural encoder backed by `sentence-transformers` (optional dependency)."""
+
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError("Sentence_Transformer_Encoder requires `pip install sentence-transformers`") from e
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"st-{model_name}"
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+def get_encoder(name: str) -> Encoder:
+    """Resolve an encoder from the name stored in the index manifest."""
+    if name.startswith("hashing-"):
+        return Hashing_Encoder(int(name.split("-", 1)[1]))
+    if name.startswith("st-"):
+        return Sentence_Transformer_Encoder(name[3:])
+    raise ValueError(f"Unknown encoder: {name}")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class Chunk(BaseModel):
+    file_id: str
+    "Stable identifier of the source file (sha256 of its bytes, truncated)"
+    filename: str
+    page: Optional[int] = None
+    chunk_id: int
+    text: str
+
+
+class Search_Result(BaseModel):
+    file_id: str
+    filename: str
+    page: Optional[int] = None
+    score: float
+    text: str
+
+
+def _read_pages(path: Path) -> List[tuple[Optional[int], str]]:
+    if path.suffix.lower() == ".pdf":
+        try:
+            from pypdf import PdfReader
+        except ImportError as e:
+            raise ImportError("Indexing PDFs requires `pip install pypdf`") from e
+        reader = PdfReader(str(path))
+        return [(i + 1, page.extract_text() or "") for i, page in enumerate(reader.pages)]
+    return [(None, path.read_text(encoding="utf-8", errors="ignore"))]
+
+
+def chunk_document(path: Path, chunk_words: int = 220, overlap_words: int = 40) -> List[Chunk]:
+    """Split a document into overlapping word windows, keeping page numbers for citations."""
+    file_id = "file-" + hashlib.sha256(path.read_bytes()).hexdigest()[:24]
+    chunks: List[Chunk] = []
+    step = max(1, chunk_words - overlap_words)
+    for page, text in _read_pages(path):
+        words = text.split()
+        for start in range(0, len(words), step):
+            window = words[start:start + chunk_words]
+            if not window:
+                break
+            chunks.append(Chunk(file_id=file_id, filename=path.name, page=page, chunk_id=len(chunks), text=" ".join(window)))
+            if start + chunk_words >= len(words):
+                break
+    return chunks
+
+
+def build_index(
+    corpus_dir: Union[str, Path],
+    index_dir: Union[str, Path],
+    encoder: Optional[Encoder] = None,
+    chunk_words: int = 220,
+    overlap_words: int = 40,
+    batch_size: int = 256,
+) -> Path:
+    """
+    Build a local hybrid retrieval index from a document folder.
+
+    Writes to `index_dir`:
+        - `embeddings.npy`: (n_chunks, dim) float32 matrix, loaded memory-mapped at query time
+        - `bm25.npz`: CSR inverted index (term -> chunk postings with term frequencies)
+        - `chunks.jsonl`: chunk text and citation metadata
+        - `vocabulary.json`: term -> row of the inverted index
+        - `manifest.json`: encoder name and corpus statistics
+
+    Args:
+        corpus_dir: Folder with .pdf/.txt/.md/.json documents (searched recursively).
+        index_dir: Output folder (created if missing).
+        encoder: Local encoder. Defaults to `Hashing_Encoder`.
+        chunk_words: Words per chunk.
+        overlap_words: Words shared between consecutive chunks.
+        batch_size: Chunks encoded per encoder call.
+
+    Returns:
+        Path to the index folder.
+    """
+    encoder = encoder or Hashing_Encoder()
+    corpus_dir, index_dir = Path(corpus_dir), Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+
+    chunks: List[Chunk] = []
+    for path in sorted(p for p in corpus_dir.rglob("*") if p.is_file() and p.suffix.lower() in INDEX_EXTENSIONS):
+        for chunk in chunk_document(path, chunk_words, overlap_words):
+            chunks.append(chunk.model_copy(update={"chunk_id": len(chunks)}))
+    if not chunks:
+        raise ValueError(f"No indexable documents found in {corpus_dir}")
+
+    embeddings = np.lib.format.open_memmap(
+        index_dir / "embeddings.npy", mode="w+", dtype=np.float32, shape=(len(chunks), encoder.dim)
+    )
+    for start in range(0, len(chunks), batch_size):
+        batch = chunks[start:start + batch_size]
+        embeddings[start:start + len(batch)] = encoder([c.text for c in batch])
+    embeddings.flush()
+    del embeddings
+
+    vocabulary: Dict[str, int] = {}
+    postings: Dict[int, Dict[int, int]] = {}
+    lengths = np.zeros(len(chunks), dtype=np.float32)
+    for chunk in chunks:
+        tokens = tokenize(chunk.text)
+        lengths[chunk.chunk_id] = len(tokens)
+        for token in tokens:
+            term = vocabulary.setdefault(token, len(vocabulary))
+            counts = postings.setdefault(term, {})
+            counts[chunk.chunk_id] = counts.get(chunk.chunk_id, 0) + 1
+
+    indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    doc_ids: List[int] = []
+    term_freqs: List[int] = []
+    for term in range(len(vocabulary)):
+        counts = postings[term]
+        doc_ids.extend(counts.keys())
+        term_freqs.extend(counts.values())
+        indptr[term + 1] = len(doc_ids)
+    doc_freq = np.diff(indptr).astype(np.float32)
+    idf = np.log1p((len(chunks) - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+    np.savez(
+        index_dir / "bm25.npz",
+        indptr=indptr,
+        doc_ids=np.asarray(doc_ids, dtype=np.int32),
+        term_freqs=np.asarray(term_freqs, dtype=np.float32),
+        idf=idf,
+        lengths=lengths,
+    )
+
+    with open(index_dir / "vocabulary.json", "w", encoding="utf-8") as f:
+        json.dump(vocabulary, f)
+    with open(index_dir / "chunks.jsonl", "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.write(chunk.model_dump_json() + "\n")
+    with open(index_dir / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "encoder": encoder.name,
+                "dim": encoder.dim,
+                "chunks": len(chunks),
+                "files": len({c.file_id for c in chunks}),
+                "avg_length": float(lengths.mean()),
+                "built_at": time.time(),
+            },
+            f,
+            indent=2,
+        )
+    return index_dir
+
+
+class Local_Knowledge_Base_Index:
+    """
+    Read side of a local hybrid index.
+
+    Lexical (BM25) and dense (cosine) candidates are pooled, min-max normalized,
+    blended with weight `alpha` on the dense side, and the top candidates are
+    reranked before the final `k` are returned.
+    """
+
+    def __init__(
+        self,
+        index_dir: Union[str, Path],
+        encoder: Optional[Encoder] = None,
+        alpha: float = 0.5,
+        k1: float = 1.2,
+        b: float = 0.75,
+        reranker: Optional[Callable[[str, List[Search_Result]], List[Search_Result]]] = None,
+    ):
+        index_dir = Path(index_dir)
+        with open(index_dir / "manifest.json", "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.encoder = encoder or get_encoder(self.manifest["encoder"])
+        if self.encoder.dim != self.manifest["dim"]:
+            raise ValueError(f"Encoder dim {self.encoder.dim} does not match index dim {self.manifest['dim']}")
+        self.embeddings = np.load(index_dir / "embeddings.npy", mmap_mode="r")
+        bm25 = np.load(index_dir / "bm25.npz")
+        self.indptr, self.doc_ids, self.term_freqs = bm25["indptr"], bm25["doc_ids"], bm25["term_freqs"]
+        self.idf, self.lengths = bm25["idf"], bm25["lengths"]
+        with open(index_dir / "vocabulary.json", "r", encoding="utf-8") as f:
+            self.vocabulary: Dict[str, int] = json.load(f)
+        with open(index_dir / "chunks.jsonl", "r", encoding="utf-8") as f:
+            self.chunks = [Chunk.model_validate_json(line) for line in f if line.strip()]
+        self.alpha, self.k1, self.b = alpha, k1, b
+        self.reranker = reranker or lexical_coverage_reranker
+        self.avg_length = float(self.lengths.mean()) if len(self.lengths) else 0.0
+
+    def bm25_scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self.chunks), dtype=np.float32)
+        norm = self.k1 * (1 - self.b + self.b * self.lengths / max(self.avg_length, 1e-6))
+        for token in set(tokenize(query)):
+            term = self.vocabulary.get(token)
+            if term is None:
+                continue
+            start, end = self.indptr[term], self.indptr[term + 1]
+            docs, tf = self.doc_ids[start:end], self.term_freqs[start:end]
+            scores[docs] += self.idf[term] * tf * (self.k1 + 1) / (tf + norm[docs])
+        return scores
+
+    def dense_scores(self, query: str) -> np.ndarray:
+        return np.asarray(self.embeddings @ self.encoder([query])[0], dtype=np.float32)
+
+    def search(self, query: str, k: int = 5, candidates: int = 50) -> List[Search_Result]:
+        """Return the top-`k` chunks for a query, best first."""
+        lexical, dense = self.bm25_scores(query), self.dense_scores(query)
+        n = min(candidates, len(self.chunks))
+        pool = np.union1d(np.argpartition(-lexical, n - 1)[:n], np.argpartition(-dense, n - 1)[:n])
+
+        def _normalize(values: np.ndarray) -> np.ndarray:
+            spread = values.max() - values.min()
+            return (values - values.min()) / spread if spread > 0 else np.zeros_like(values)
+
+        blended = self.alpha * _normalize(dense[pool]) + (1 - self.alpha) * _normalize(lexical[pool])
+        order = pool[np.argsort(-blended)][: max(k * 4, k)]
+        scores = dict(zip(pool.tolist(), blended.tolist()))
+        shortlist = [
+            Search_Result(**self.chunks[i].model_dump(exclude={"chunk_id"}), score=scores[int(i)]) for i in order
+        ]
+        return self.reranker(query, shortlist)[:k]
+
+
+def lexical_coverage_reranker(query: str, results: List[Search_Result]) -> List[Search_Result]:
+    """Rerank the shortlist by hybrid score boosted by the share of query terms each chunk contains."""
+    terms = set(tokenize(query))
+    if not terms:
+        return results
+    rescored = []
+    for result in results:
+        coverage = len(terms & set(tokenize(result.text))) / len(terms)
+        rescored.append(result.model_copy(update={"score": 0.8 * result.score + 0.2 * coverage}))
+    return sorted(rescored, key=lambda r: r.score, reverse=True)
+
+
+@lru_cache(maxsize=None)
+def load_index(index_dir: str) -> Local_Knowledge_Base_Index:
+    """Open an index once per process."""
+    return Local_Knowledge_Base_Index(index_dir)
+
+
+def make_local_search_tool(index_dir: str, tool_name: str, tool_description: str, max_num_results: int = 5) -> FunctionTool:
+    """
+    Wrap a local index as a function tool returning the same citation metadata as `FileSearchTool`
+    (file id, filename, score and text), plus the page number when known.
+    """
+
+    @function_tool(name_override=tool_name, description_override=tool_description)
+    def search_knowledge_base(query: str) -> str:
+        """
+        Search the local knowledge base.
+
+        Args:
+            query: Natural-language search query.
+        """
+        results = load_index(index_dir).search(query, k=max_num_results)
+        return json.dumps([r.model_dump() for r in results], ensure_ascii=False)
+
+    return search_knowledge_base
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build or query a local knowledge base index.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build")
+    build.add_argument("corpus_dir")
+    build.add_argument("index_dir")
+    build.add_argument("--encoder", default="hashing-1024", help="hashing-<dim> or st-<sentence-transformers model>")
+    query = subparsers.add_parser("query")
+    query.add_argument("index_dir")
+    query.add_argument("query")
+    query.add_argument("-k", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        started = time.perf_counter()
+        build_index(args.corpus_dir, args.index_dir, encoder=get_encoder(args.encoder))
+        print(f"Built {args.index_dir} in {time.perf_counter() - started:.1f}s")
+    else:
+        index = Local_Knowledge_Base_Index(args.index_dir)
+        started = time.perf_counter()
+        results = index.search(args.query, k=args.k)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for result in results:
+            print(f"{result.score:.3f}  {result.filename} p.{result.page}  {result.text[:120]}")
+        print(f"{elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
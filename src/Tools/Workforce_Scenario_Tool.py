@@ -0,0 +1,34 @@
+import json
+from typing import List
+
+from agents import function_tool
+
+# Import Necessary Libraries
+from src.Scenarios.Workforce_Scenario_Engine import DEFAULT_ASSUMPTIONS, Team_Baseline, run_scenarios
+
+
+@function_tool(
+    name_override="Workforce_Scenario_Tool",
+    description_override=(
+        "Deterministic calculator for Low/Medium/High GenAI workforce scenarios. Given team baselines "
+        "(roles with FTE, annual cost per FTE and on/near/offshore location) and Agentic_Calculator_Tool "
+        "scores, returns FTE at 6/12/18/24 months, the four <=0 cumulative % change vectors, 24-month "
+        "run-rate cost, transition cost and cumulative savings (absolute and %), plus the assumptions used."
+    ),
+)
+def Workforce_Scenario_Tool(teams: List[Team_Baseline]) -> str:
+    """
+    Compute workforce scenarios for one or more teams.
+
+    Args:
+        teams: One entry per team or work cluster, with its calculator score and role baseline.
+    """
+    results = run_scenarios(teams)
+    summary = results.summary().round(2)
+    return json.dumps(
+        {
+            "scenarios": summary.to_dict(orient="records"),
+            "assumptions": {name: a.model_dump() for name, a in DEFAULT_ASSUMPTIONS.items()},
+        },
+        default=float,
+    )